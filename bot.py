@@ -2,8 +2,6 @@
 
 BACKUP_CHANNEL_ID = 1389706195102728322
 
-print("🟡 Booting WARLAB Bot...")
-
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
@@ -11,7 +9,20 @@ import json, os, asyncio
 from datetime import datetime
 import pytz
 
-from utils.fileIO import load_file, save_file
+# Logging goes through the background writer before any utils module logs at import time
+from utils.logPipeline import setup_logging, shutdown_logging, get_logger
+setup_logging()
+log = get_logger("bot")
+log.info("🟡 Booting WARLAB Bot...")
+
+from utils.fileIO import close_cache, cache_stats, replay_journal
+from utils.storageClient import storage_available, CircuitOpen
+from utils.storageGuard import STORAGE_DOWN_MESSAGE, send_storage_down
+from utils.catalog import load_catalog
+from utils.renderService import RENDERER
+from utils.profileManager import (
+    get_profile, create_profile, load_all_profiles, migrate_legacy_profiles
+)
 
 # Optional: allow graceful close of shared aiohttp session if present
 try:
@@ -23,9 +34,9 @@ except Exception:
 try:
     with open("config.json", "r") as f:
         config = json.load(f)
-    print("✅ Config loaded.")
+    log.info("✅ Config loaded.")
 except Exception as e:
-    print(f"❌ Failed to load config.json: {e}")
+    log.error("❌ Failed to load config.json: %s", e)
     config = {}
 
 config["token"]    = os.getenv("token", config.get("token"))
@@ -39,13 +50,36 @@ PREFIX    = "/"
 WARLAB_CHANNEL_ID = 1382187883590455296
 WARLAB_BOT_ID = "1382188850671255612"
 
+# ── Degraded mode while storage is down ──────────────────────────────────────
+# These only read (and fall back to the last cached copy); everything else
+# is refused up front instead of hanging on a dead backend. Buttons and selects
+# are covered by utils/storageGuard.WarlabView.
+READ_ONLY_COMMANDS = {"stash", "rank", "leaderboard", "fortify", "help", "cachestats", "replication"}
+
+class WarlabTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        command = interaction.command
+        if storage_available() or command is None or command.name in READ_ONLY_COMMANDS:
+            return True
+        log.warning("🔌 Refused /%s for %s — storage circuit open", command.name, interaction.user)
+        await interaction.response.send_message(STORAGE_DOWN_MESSAGE, ephemeral=True)
+        return False
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(getattr(error, "original", error), CircuitOpen):
+            log.warning("🔌 /%s hit the open storage circuit", getattr(interaction.command, "name", "?"))
+            await send_storage_down(interaction)
+            return
+        log.error("❌ Error in /%s: %r", getattr(interaction.command, "name", "?"), error,
+                  exc_info=(type(error), error, error.__traceback__))
+
 # ── Discord bot setup ────────────────────────────────────────────────────────
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-bot = commands.Bot(command_prefix=PREFIX, intents=intents)
+bot = commands.Bot(command_prefix=PREFIX, intents=intents, tree_cls=WarlabTree)
 bot.config = config
 guild_obj = discord.Object(id=GUILD_ID)
 
@@ -68,9 +102,8 @@ async def check_weekend_boosts():
 
 # ── Ensure @Warlab is registered ─────────────────────────────────────────────
 async def ensure_bot_profile():
-    profiles = await load_file("data/user_profiles.json") or {}
-    if WARLAB_BOT_ID not in profiles:
-        profiles[WARLAB_BOT_ID] = {
+    if not await get_profile(WARLAB_BOT_ID):
+        await create_profile(WARLAB_BOT_ID, "Warlab", profile={
             "labskins": ["Rust Bucket"],
             "baseImage": "assets/stash_layers/base_house_prestige1.PNG",
             "reinforcements": {
@@ -80,59 +113,88 @@ async def ensure_bot_profile():
                 "Reinforced Gate": 2,
                 "Locked Container": 2
             },
-            "stash": ["Scrap", "Nails", "Hammer"],
+            "stash": {"Scrap": 1, "Nails": 1, "Hammer": 1},
             "coins": 25,
             "prestige_points": 0,
-            "raids_successful": 0
-        }
-        await save_file("data/user_profiles.json", profiles)
-        print("✅ Auto-registered @Warlab profile.")
+            "successful_raids": 0
+        })
+        log.info("✅ Auto-registered @Warlab profile.")
 
 # ── Auto-load cogs *then* sync commands ──────────────────────────────────────
+# ── Catalog hot-reload poll ─────────────────────────────────────────────────
+@tasks.loop(minutes=15)
+async def catalog_refresh_loop():
+    if catalog_refresh_loop.current_loop == 0:
+        return  # on_ready already loaded it
+    try:
+        await load_catalog()
+    except Exception as e:
+        log.warning("⚠️ Catalog refresh failed: %s", e)
+
 @bot.event
 async def on_ready():
-    print("✅ Bot connected.")
-    print("🧩 Loading cogs from /cogs…")
+    log.info("✅ Bot connected.")
+
+    # Writes a crash left in the local journal go back out before anything reads storage
+    try:
+        await replay_journal()
+    except Exception as exc:
+        log.error("❌ Journal replay failed: %s", exc)
+
+    # Static game data is loaded once and shared by every command
+    try:
+        await load_catalog()
+    except Exception as exc:
+        log.error("❌ Catalog load failed: %s", exc)
+
+    log.info("🧩 Loading cogs from /cogs…")
 
     for fn in os.listdir("./cogs"):
         if fn.endswith(".py") and fn != "__init__.py":
             path = f"cogs.{fn[:-3]}"
             try:
                 await bot.load_extension(path)
-                print(f"   ✔️  {path}")
+                log.info("   ✔️  %s", path)
             except Exception as exc:
-                print(f"   ❌ {path} -> {exc}")
+                log.error("   ❌ %s -> %s", path, exc)
+
+    try:
+        await migrate_legacy_profiles()
+    except Exception as exc:
+        log.error("❌ Profile migration failed: %s", exc)
 
     await ensure_bot_profile()
 
     bot.tree.copy_global_to(guild=guild_obj)
     try:
         synced = await bot.tree.sync(guild=guild_obj)
-        print(f"✅ Synced {len(synced)} slash commands to guild {GUILD_ID}")
+        log.info("✅ Synced %d slash commands to guild %s", len(synced), GUILD_ID)
     except Exception as exc:
-        print(f"❌ Slash-sync error: {exc}")
+        log.error("❌ Slash-sync error: %s", exc)
 
     # Start loops only once to avoid duplicates after reconnects
     if not weekly_backup_loop.is_running():
         weekly_backup_loop.start()
     if not check_weekend_boosts.is_running():
         check_weekend_boosts.start()
+    if not catalog_refresh_loop.is_running():
+        catalog_refresh_loop.start()
 
 @tasks.loop(minutes=60)
 async def weekly_backup_loop():
     now = datetime.now(pytz.timezone("US/Eastern"))
-    print(f"🕒 [weekly_backup] Tick: {now.strftime('%A %I:%M %p')} EST")
+    log.debug("🕒 [weekly_backup] Tick: %s EST", now.strftime("%A %I:%M %p"))
 
     if now.weekday() == 6 and now.hour == 12:
-        print("🗂️ [weekly_backup] Running automatic backup...")
+        log.info("🗂️ [weekly_backup] Running automatic backup...")
 
         try:
-            profiles = await load_file("data/user_profiles.json") or {}
+            profiles = await load_all_profiles()
             os.makedirs("/mnt/data", exist_ok=True)
 
             backup_path = "/mnt/data/user_profiles_weekly.json"
             with open(backup_path, "w", encoding="utf-8") as f:
-                json.dump(profiles, f, indent=2)
+                json.dump({uid: p.to_dict() for uid, p in profiles.items()}, f, indent=2)
 
             channel = bot.get_channel(BACKUP_CHANNEL_ID)
             if channel:
@@ -140,37 +202,48 @@ async def weekly_backup_loop():
                     content="🗃️ **Weekly Warlab Backup** — auto-export of `user_profiles.json` at Sunday 12 PM EST",
                     file=discord.File(backup_path)
                 )
-                print("✅ [weekly_backup] Sent weekly archive to backup channel.")
+                log.info("✅ [weekly_backup] Sent weekly archive to backup channel.")
             else:
-                print(f"❌ [weekly_backup] Backup channel ID {BACKUP_CHANNEL_ID} not found.")
+                log.error("❌ [weekly_backup] Backup channel ID %s not found.", BACKUP_CHANNEL_ID)
 
         except Exception as e:
-            print(f"❌ [weekly_backup] Failed to send backup: {e}")
+            log.error("❌ [weekly_backup] Failed to send backup: %s", e)
 
 # ── Log every slash invocation ───────────────────────────────────────────────
 @bot.listen("on_interaction")
 async def _log(inter):
     if inter.type == discord.InteractionType.application_command:
-        print(f"🟢 /{inter.data.get('name')} by {inter.user} ({inter.user.id})")
+        log.info("🟢 /%s by %s (%s)", inter.data.get("name"), inter.user, inter.user.id)
 
 # ── Run bot ──────────────────────────────────────────────────────────────────
 async def main():
-    print("🚀 Starting bot…")
+    log.info("🚀 Starting bot…")
     try:
         async with bot:
             await bot.start(TOKEN)
     finally:
+        # Push any cached writes to remote storage before the session goes away
+        try:
+            await close_cache()
+            log.info("💾 Final cache flush done: %s", cache_stats())
+        except Exception as e:
+            log.error("⚠️ Final cache flush failed: %s", e)
+
+        RENDERER.close()
+
         # Graceful shutdown of shared HTTP session (if implemented)
         try:
             if _storage_client_mod and getattr(_storage_client_mod, "SESSION", None):
                 if not _storage_client_mod.SESSION.closed:
                     await _storage_client_mod.SESSION.close()
-                print("🧹 Closed shared HTTP session.")
+                log.info("🧹 Closed shared HTTP session.")
         except Exception as e:
-            print(f"⚠️ Failed to close shared HTTP session: {e}")
+            log.error("⚠️ Failed to close shared HTTP session: %s", e)
+
+        shutdown_logging()
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except Exception as err:
-        print(f"💥 Fatal crash: {err}")
+        log.critical("💥 Fatal crash: %s", err, exc_info=True)
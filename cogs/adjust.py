@@ -5,7 +5,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Literal
 
-from utils.fileIO import load_file, save_file
+from utils.profileManager import profile_transaction
 from utils.prestigeUtils import (
     PRESTIGE_TIERS,
     get_prestige_rank,
@@ -13,7 +13,6 @@ from utils.prestigeUtils import (
     broadcast_prestige_announcement
 )
 
-USER_DATA = "data/user_profiles.json"
 RANK_TITLES = {
     0: "Unranked Survivor",
     1: "Field Engineer",
@@ -51,53 +50,47 @@ class AdjustPrestige(commands.Cog):
             return
 
         user_id = str(user.id)
-        profiles = await load_file(USER_DATA) or {}
-
-        if user_id not in profiles:
-            await interaction.response.send_message(
-                "❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                ephemeral=True
-            )
-            return
-
-        profile = profiles[user_id]
-        current_points = profile.get("prestige_points", 0)
-        current_rank = get_prestige_rank(current_points)
-
-        if action == "take":
-            if current_rank <= 0:
+        async with profile_transaction(user_id) as profile:
+            if profile is None:
                 await interaction.response.send_message(
-                    f"⚠️ {user.mention} is already at **0 prestige**.", ephemeral=True)
-                return
-            if amount > current_rank:
-                await interaction.response.send_message(
-                    f"❌ Cannot remove **{amount} prestige** — {user.mention} only has **{current_rank}**.",
-                    ephemeral=True)
+                    "❌ That player does not have a profile yet. Ask them to use `/register` first.",
+                    ephemeral=True
+                )
                 return
 
-            new_rank = current_rank - amount
-            new_points = PRESTIGE_TIERS.get(new_rank, 0)
+            current_points = profile.get("prestige_points", 0)
+            current_rank = get_prestige_rank(current_points)
+
+            if action == "take":
+                if current_rank <= 0:
+                    await interaction.response.send_message(
+                        f"⚠️ {user.mention} is already at **0 prestige**.", ephemeral=True)
+                    return
+                if amount > current_rank:
+                    await interaction.response.send_message(
+                        f"❌ Cannot remove **{amount} prestige** — {user.mention} only has **{current_rank}**.",
+                        ephemeral=True)
+                    return
 
-            profile["prestige_points"] = new_points
-            profile["prestige"] = get_prestige_rank(new_points)
+                new_rank = current_rank - amount
+                new_points = PRESTIGE_TIERS.get(new_rank, 0)
 
-            result = f"🗑 Removed **{amount} prestige** from {user.mention}."
+                profile["prestige_points"] = new_points
+                profile["prestige"] = get_prestige_rank(new_points)
 
-        elif action == "give":
-            new_rank = current_rank + amount
-            new_points = PRESTIGE_TIERS.get(new_rank, 0)
+                result = f"🗑 Removed **{amount} prestige** from {user.mention}."
 
-            xp_gain = new_points - current_points
-            profile, ranked_up, msg, old_rank, new_rank = apply_prestige_xp(profile, xp_gain)
+            elif action == "give":
+                new_rank = current_rank + amount
+                new_points = PRESTIGE_TIERS.get(new_rank, 0)
 
-            if ranked_up:
-                await broadcast_prestige_announcement(interaction.client, user, profile)
+                xp_gain = new_points - current_points
+                profile, ranked_up, msg, old_rank, new_rank = apply_prestige_xp(profile, xp_gain)
 
-            result = f"✅ Gave **{amount} prestige** to {user.mention}."
+                if ranked_up:
+                    await broadcast_prestige_announcement(interaction.client, user, profile)
 
-        # Save update
-        profiles[user_id] = profile
-        await save_file(USER_DATA, profiles)
+                result = f"✅ Gave **{amount} prestige** to {user.mention}."
 
         rank_title = RANK_TITLES.get(profile["prestige"], "Prestige Specialist")
         await interaction.response.send_message(
@@ -4,16 +4,19 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
+import asyncio
 from datetime import datetime, timedelta
 
 from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.inventory import Stash
+from utils.logPipeline import get_logger
+
+log = get_logger("blackmarket")
 
-USER_DATA   = "data/user_profiles.json"
-WEAPONS     = "data/item_recipes.json"
-ARMOR       = "data/armor_blueprints.json"
-EXPLOSIVES  = "data/explosive_blueprints.json"
 MARKET_FILE = "data/blackmarket_rotation.json"
-CAR_PARTS_FILE = "data/car_parts_master.json"  # ✅ NEW
 
 ITEM_COSTS = {
     "Common"   : 75,
@@ -31,8 +34,17 @@ RARITY_EMOJIS = {
     "Special"  : "🪤"
 }
 
+def purchased_this_rotation(user: dict, rotation: str) -> list:
+    """
+    Purchases are stamped with the rotation they were made in, so a new rotation
+    resets them lazily per player instead of rewriting every profile.
+    """
+    if user.get("purchasedRotation") != rotation:
+        return []
+    return user.get("purchasedToday", [])
+
 class BuyButton(discord.ui.Button):
-    def __init__(self, label, cost, item_name, rarity, disabled=False):
+    def __init__(self, label, cost, item_name, rarity, rotation, disabled=False):
         super().__init__(
             label=f"Buy {label} — {cost}🪙",
             style=discord.ButtonStyle.green,
@@ -41,39 +53,42 @@ class BuyButton(discord.ui.Button):
         self.item_name = item_name
         self.cost = cost
         self.rarity = rarity
+        self.rotation = rotation
 
     async def callback(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
-        print(f"🛒 [BlackMarket] {interaction.user.name} clicked Buy for: {self.item_name}")
-        profiles = await load_file(USER_DATA) or {}
-        user = profiles.get(user_id, {"coins": 0, "stash": [], "blueprints": [], "purchasedToday": []})
-
-        if self.item_name in user.get("purchasedToday", []):
-            await interaction.response.send_message("❌ You’ve already purchased this item during the current rotation.", ephemeral=True)
-            return
+        log.debug("🛒 [BlackMarket] %s clicked Buy for: %s", interaction.user.name, self.item_name)
+        async with profile_transaction(user_id) as user:
+            if user is None:
+                await interaction.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
+                return
 
-        if user.get("coins", 0) < self.cost:
-            await interaction.response.send_message("❌ You don’t have enough coins.", ephemeral=True)
-            return
+            purchased = purchased_this_rotation(user, self.rotation)
+            if self.item_name in purchased:
+                await interaction.response.send_message("❌ You’ve already purchased this item during the current rotation.", ephemeral=True)
+                return
 
-        # ✅ If it's a trap, stash it. If it's a car part, stash it. Otherwise, grant blueprint
-        if self.item_name in ["Guard Dog", "Claymore Trap"]:
-            user.setdefault("stash", []).append(self.item_name)
-        elif self.item_name in ["Glow Plug", "Battery", "Fuel Canister", "M1025 Wheel"]:
-            user.setdefault("stash", []).append(self.item_name)
-        else:
-            blueprint_name = f"{self.item_name} Blueprint"
-            if blueprint_name in user.get("blueprints", []):
-                await interaction.response.send_message("❌ You already own this blueprint.", ephemeral=True)
+            if user.get("coins", 0) < self.cost:
+                await interaction.response.send_message("❌ You don’t have enough coins.", ephemeral=True)
                 return
-            user.setdefault("blueprints", []).append(blueprint_name)
 
-        user["coins"] -= self.cost
-        user.setdefault("purchasedToday", []).append(self.item_name)
+            # ✅ If it's a trap, stash it. If it's a car part, stash it. Otherwise, grant blueprint
+            if self.item_name in ["Guard Dog", "Claymore Trap"]:
+                Stash(user).add(self.item_name)
+            elif self.item_name in ["Glow Plug", "Battery", "Fuel Canister", "M1025 Wheel"]:
+                Stash(user).add(self.item_name)
+            else:
+                blueprint_name = f"{self.item_name} Blueprint"
+                if blueprint_name in user.get("blueprints", []):
+                    await interaction.response.send_message("❌ You already own this blueprint.", ephemeral=True)
+                    return
+                user.blueprints.append(blueprint_name)
+
+            user["coins"] -= self.cost
+            user["purchasedToday"] = purchased + [self.item_name]
+            user["purchasedRotation"] = self.rotation
 
-        profiles[user_id] = user
-        await save_file(USER_DATA, profiles)
-        print(f"💾 [BlackMarket] Purchase saved for {interaction.user.name} — {self.item_name}")
+        log.debug("💾 [BlackMarket] Purchase saved for %s — %s", interaction.user.name, self.item_name)
 
         await interaction.response.send_message(
             f"✅ You purchased **{self.item_name}**!\n"
@@ -90,15 +105,15 @@ class CloseButton(discord.ui.Button):
             for msg in getattr(self.view, "stored_messages", []):
                 await msg.edit(content="❌ Black Market closed.", embed=None, view=None)
         except Exception as e:
-            print(f"❌ [BlackMarket] Failed to close UI: {e}")
+            log.error("❌ [BlackMarket] Failed to close UI: %s", e)
         await interaction.response.defer()
 
-class MarketView(discord.ui.View):
-    def __init__(self, user, offers, car_part=None):
+class MarketView(WarlabView):
+    def __init__(self, user, offers, rotation, car_part=None):
         super().__init__(timeout=300)
         self.stored_messages = []
         owned_blueprints = user.get("blueprints", [])
-        purchased = user.get("purchasedToday", [])
+        purchased = purchased_this_rotation(user, rotation)
 
         for item in offers:
             name = item["name"]
@@ -112,14 +127,14 @@ class MarketView(discord.ui.View):
                 if blueprint_name in owned_blueprints:
                     disabled = True
 
-            self.add_item(BuyButton(name, cost, name, rarity, disabled=disabled))
+            self.add_item(BuyButton(name, cost, name, rarity, rotation, disabled=disabled))
 
         if car_part:
             name = car_part["name"]
             rarity = car_part["rarity"]
             cost = ITEM_COSTS.get(rarity, 999)
             disabled = name in purchased
-            self.add_item(BuyButton(name, cost, name, rarity, disabled=disabled))
+            self.add_item(BuyButton(name, cost, name, rarity, rotation, disabled=disabled))
 
         self.add_item(CloseButton())
 
@@ -132,9 +147,9 @@ class BlackMarket(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         user_id = str(interaction.user.id)
-        print(f"📡 [BlackMarket] Loading profile for: {interaction.user.name}")
-        profiles = await load_file(USER_DATA) or {}
-        user = profiles.get(user_id)
+        log.debug("📡 [BlackMarket] Loading profile for: %s", interaction.user.name)
+        # Profile and rotation in one round trip
+        user, market = await asyncio.gather(get_profile(user_id), load_file(MARKET_FILE))
 
         if not user:
             await interaction.followup.send(
@@ -143,19 +158,13 @@ class BlackMarket(commands.Cog):
             )
             return
 
-        print("📦 [BlackMarket] Checking current rotation...")
-        market = await load_file(MARKET_FILE)
+        log.debug("📦 [BlackMarket] Checking current rotation...")
 
         if not market or not isinstance(market, dict) or market.get("expires", "") < datetime.utcnow().isoformat():
-            print("🔁 [BlackMarket] Generating new rotation...")
+            log.debug("🔁 [BlackMarket] Generating new rotation...")
             market = await self.generate_market()
             await save_file(MARKET_FILE, market)
 
-            for uid in profiles:
-                profiles[uid]["purchasedToday"] = []
-            await save_file(USER_DATA, profiles)
-            user = profiles.get(user_id)
-
         offers = market["offers"]
         car_part = market.get("car_part")
 
@@ -185,34 +194,26 @@ class BlackMarket(commands.Cog):
                 inline=False
             )
 
-        view = MarketView(user, offers, car_part=car_part)
+        view = MarketView(user, offers, market["expires"], car_part=car_part)
         embed_msg = await interaction.followup.send(embed=embed, view=view, ephemeral=True)
         view.stored_messages = [embed_msg]
 
     async def generate_market(self):
-        print("🎲 [BlackMarket] Building new item pool from recipes...")
-        all_items = []
-        for src in (WEAPONS, ARMOR, EXPLOSIVES):
-            pool = await load_file(src)
-            for bp in pool.values():
-                name = bp["produces"]
-                if name.lower() == "humvee":
-                    continue  # ⛔ Skip full Humvee from sale
-                all_items.append({
-                    "name": name,
-                    "rarity": bp.get("rarity", "Common")
-                })
-
-        rotation = random.sample(all_items, k=5)
+        log.debug("🎲 [BlackMarket] Drawing rotation from recipes...")
+        catalog = get_catalog()
+        pool = [offer for offer in catalog.crafted_offers if offer["name"].lower() != "humvee"]  # ⛔ Skip full Humvee from sale
+
+        # Five offers, every recipe equally likely; fewer only if the catalog has fewer
+        rotation = [dict(offer) for offer in random.sample(pool, k=min(5, len(pool)))]
         rotation += [
             {"name": "Guard Dog", "rarity": "Special"},
             {"name": "Claymore Trap", "rarity": "Special"}
         ]
 
         # ✅ FIXED: Proper random car part pull
-        car_parts_data = await load_file(CAR_PARTS_FILE) or {}
+        car_parts_data = catalog.car_parts
         car_part = None
-        if isinstance(car_parts_data, dict) and car_parts_data:
+        if car_parts_data:
             name, data = random.choice(list(car_parts_data.items()))
             car_part = {
                 "name": name,
@@ -220,7 +221,7 @@ class BlackMarket(commands.Cog):
             }
 
         expires_at = (datetime.utcnow() + timedelta(hours=24)).isoformat()
-        print(f"📅 [BlackMarket] Rotation expires at: {expires_at}")
+        log.debug("📅 [BlackMarket] Rotation expires at: %s", expires_at)
         return {
             "offers": rotation,
             "expires": expires_at,
@@ -4,29 +4,19 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import profile_transaction
+from utils.logPipeline import get_logger
+
+log = get_logger("blueprint")
 
-USER_DATA = "data/user_profiles.json"
-RECIPE_FILES = [
-    "data/item_recipes.json",
-    "data/armor_blueprints.json",
-    "data/explosive_blueprints.json"
-]
 
 class BlueprintManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     async def get_all_blueprints(self):
-        print("📦 [BlueprintManager] Fetching all blueprint names from recipe files...")
-        blueprints = set()
-        for path in RECIPE_FILES:
-            data = await load_file(path) or {}
-            for entry in data.values():
-                produced = entry.get("produces")
-                if produced:
-                    blueprints.add(produced)
-        return sorted(blueprints)
+        return list(get_catalog().blueprint_names)
 
     @app_commands.checks.has_permissions(administrator=True)
     @app_commands.command(
@@ -56,7 +46,7 @@ class BlueprintManager(commands.Cog):
         item = item.replace(" Blueprint", "").strip()
         full_item = f"{item} Blueprint"
 
-        print(f"📋 [BlueprintManager] Validating blueprint: {full_item}")
+        log.debug("📋 [BlueprintManager] Validating blueprint: %s", full_item)
         valid_blueprints = await self.get_all_blueprints()
         if item not in valid_blueprints:
             await interaction.followup.send(
@@ -65,63 +55,59 @@ class BlueprintManager(commands.Cog):
             )
             return
 
-        print(f"📡 [BlueprintManager] Loading user profiles from: {USER_DATA}")
-        profiles = await load_file(USER_DATA) or {}
         user_id = str(user.id)
-
-        if user_id not in profiles:
-            await interaction.followup.send(
-                f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                ephemeral=True
-            )
-            print(f"❌ [BlueprintManager] Profile not found for UID: {user_id}")
-            return
-
-        profile = profiles.get(user_id)
-        blueprints = profile.get("blueprints", [])
-        if not isinstance(blueprints, list):
-            blueprints = []
-
-        if action == "give":
-            if full_item in blueprints:
+        log.debug("📡 [BlueprintManager] Loading profile for UID: %s", user_id)
+        async with profile_transaction(user_id) as profile:
+            if profile is None:
                 await interaction.followup.send(
-                    f"⚠️ {user.mention} already has blueprint **{full_item}**.",
+                    f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
                     ephemeral=True
                 )
-                print(f"⚠️ [BlueprintManager] Duplicate blueprint not added for UID: {user_id}")
-            else:
-                blueprints.append(full_item)
-                await interaction.followup.send(
-                    f"✅ Blueprint **{full_item}** unlocked for {user.mention}.",
-                    ephemeral=True
-                )
-                print(f"✅ [BlueprintManager] Added blueprint '{full_item}' to UID: {user_id}")
+                log.debug("❌ [BlueprintManager] Profile not found for UID: %s", user_id)
+                return
 
-        elif action == "remove":
-            if full_item not in blueprints:
+            blueprints = profile.get("blueprints", [])
+            if not isinstance(blueprints, list):
+                blueprints = []
+
+            if action == "give":
+                if full_item in blueprints:
+                    await interaction.followup.send(
+                        f"⚠️ {user.mention} already has blueprint **{full_item}**.",
+                        ephemeral=True
+                    )
+                    log.debug("⚠️ [BlueprintManager] Duplicate blueprint not added for UID: %s", user_id)
+                else:
+                    blueprints.append(full_item)
+                    await interaction.followup.send(
+                        f"✅ Blueprint **{full_item}** unlocked for {user.mention}.",
+                        ephemeral=True
+                    )
+                    log.debug("✅ [BlueprintManager] Added blueprint '%s' to UID: %s", full_item, user_id)
+
+            elif action == "remove":
+                if full_item not in blueprints:
+                    await interaction.followup.send(
+                        f"⚠️ {user.mention} does not have blueprint **{full_item}**.",
+                        ephemeral=True
+                    )
+                    log.debug("⚠️ [BlueprintManager] Tried to remove non-existent blueprint for UID: %s", user_id)
+                    return
+                blueprints.remove(full_item)
                 await interaction.followup.send(
-                    f"⚠️ {user.mention} does not have blueprint **{full_item}**.",
+                    f"🗑 Blueprint **{full_item}** removed from {user.mention}.",
                     ephemeral=True
                 )
-                print(f"⚠️ [BlueprintManager] Tried to remove non-existent blueprint for UID: {user_id}")
-                return
-            blueprints.remove(full_item)
-            await interaction.followup.send(
-                f"🗑 Blueprint **{full_item}** removed from {user.mention}.",
-                ephemeral=True
-            )
-            print(f"🗑 [BlueprintManager] Removed blueprint '{full_item}' from UID: {user_id}")
+                log.debug("🗑 [BlueprintManager] Removed blueprint '%s' from UID: %s", full_item, user_id)
 
-        profile["blueprints"] = blueprints
-        profiles[user_id] = profile
+            profile["blueprints"] = blueprints
 
-        print(f"📤 [BlueprintManager] Saving updated profile for UID: {user_id}")
-        await save_file(USER_DATA, profiles)
+            log.debug("📤 [BlueprintManager] Saving updated profile for UID: %s", user_id)
 
     @blueprint.autocomplete("item")
     async def autocomplete_item(self, interaction: discord.Interaction, current: str):
         all_items = await self.get_all_blueprints()
-        print(f"🔍 [BlueprintManager] Autocomplete lookup for: {current}")
+        log.debug("🔍 [BlueprintManager] Autocomplete lookup for: %s", current)
         return [
             app_commands.Choice(name=bp + " Blueprint", value=bp + " Blueprint")
             for bp in all_items if current.lower() in bp.lower()
@@ -0,0 +1,74 @@
+# cogs/cachestats.py — Admin: Show storage cache and stash render cache counters
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from utils.fileIO import cache_stats
+from utils.storageClient import upload_stats, load_stats, breaker_stats
+from utils.jsonCodec import codec_stats
+from stash_image_generator import render_cache_stats
+from utils.renderService import render_stats
+from utils.logPipeline import get_logger
+
+log = get_logger("cachestats")
+
+class CacheStats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="cachestats", description="Admin: Show cache hit rates and pending writes.")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def cachestats(self, interaction: discord.Interaction):
+        log.debug("📊 [cachestats] Called by %s (%s)", interaction.user, interaction.user.id)
+        files = cache_stats()
+        uploads = upload_stats()
+        loads = load_stats()
+        breaker = breaker_stats()
+        codec = codec_stats()
+        renders = render_cache_stats()
+        workers = render_stats()
+
+        embed = discord.Embed(title="📊 Warlab Cache Stats", color=0x3498db)
+        embed.add_field(
+            name="💾 Storage Cache",
+            value=(f"Hit rate: **{files['hit_rate']:.1%}** ({files['hits']} hits / {files['misses']} misses)\n"
+                   f"Cached files: **{files['cached']}** • Dirty: **{files['dirty']}**\n"
+                   f"Flushes: **{files['flushes']}** • Errors: **{files['flush_errors']}** • Conflicts merged: **{files['conflicts']}**\n"
+                   f"Remote loads: **{loads['gets']}** ({loads['batches']} batches) • Coalesced: **{loads['coalesced']}** • 304s: **{loads['not_modified']}**\n"
+                   f"Uploads: **{uploads['saves']}** ({uploads['batches']} batches) • {uploads['json_bytes'] / (1024 * 1024):.1f} MB JSON → "
+                   f"**{uploads['sent_bytes'] / (1024 * 1024):.1f} MB** sent\n"
+                   f"JSON ({codec['codec']}): **{codec['decodes']}** decoded ({codec['offloaded']} off-loop) • "
+                   f"**{codec['encodes']}** encoded • "
+                   f"loop time **{codec['avg_stall_ms']:.2f} ms**/call, worst **{codec['max_stall_ms']:.1f} ms**"),
+            inline=False
+        )
+        recent = "\n".join(
+            f"<t:{int(at)}:R> {before} → **{after}**" for at, before, after in breaker["transitions"][-3:]
+        ) or "No transitions yet"
+        embed.add_field(
+            name="🔌 Storage Circuit",
+            value=(f"State: **{breaker['state']}** • Opened: **{breaker['opened']}×** • "
+                   f"Fast-failed: **{breaker['rejected']}** • Stale reads served: **{files['stale_served']}**\n"
+                   f"{recent}"),
+            inline=False
+        )
+        embed.add_field(
+            name="🖼️ Stash Render Cache",
+            value=(f"Hit rate: **{renders['hit_rate']:.1%}** ({renders['hits']} hits / {renders['misses']} misses)\n"
+                   f"Files: **{renders['files']}** • Size: **{renders['bytes'] / (1024 * 1024):.1f} MB** • "
+                   f"Evictions: **{renders['evictions']}**"),
+            inline=False
+        )
+        embed.add_field(
+            name="🏭 Render Workers",
+            value=(f"Jobs: **{workers['jobs']}** • Queued: **{workers['queued']}** • Coalesced: **{workers['coalesced']}**\n"
+                   f"Rejected: **{workers['rejected']}** • Timeouts: **{workers['timeouts']}** • "
+                   f"Failures: **{workers['failures']}** • Pool resets: **{workers['pool_resets']}**"),
+            inline=False
+        )
+        embed.set_footer(text="WARLAB | SV13 Bot")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(CacheStats(bot))
@@ -1,7 +1,9 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import traceback
+from utils.logPipeline import get_logger
+
+log = get_logger("cleanchannel")
 
 ADMIN_ROLE_ID = 1173049392371085392
 WARLAB_CHANNEL_ID = 1382187883590455296
@@ -13,7 +15,7 @@ class ConfirmView(discord.ui.View):
         self.author = author
 
     async def interaction_check(self, i: discord.Interaction) -> bool:
-        print(f"🔁 [Interaction Check] Pressed by {i.user}")
+        log.debug("🔁 [Interaction Check] Pressed by %s", i.user)
         if i.user.id != self.author.id:
             await i.response.send_message("❌ Only the original user may confirm/cancel.", ephemeral=True)
             return False
@@ -21,42 +23,41 @@ class ConfirmView(discord.ui.View):
 
     @discord.ui.button(label="✅ Confirm", style=discord.ButtonStyle.danger)
     async def confirm(self, interaction: discord.Interaction, _):
-        print(f"⚠️ Confirm button pressed by {interaction.user}")
+        log.debug("⚠️ Confirm button pressed by %s", interaction.user)
         await interaction.response.defer(ephemeral=True)
         try:
             deleted = await interaction.channel.purge(limit=100)
             await interaction.followup.send(f"🧹 Deleted {len(deleted)} messages.", ephemeral=True)
-            print(f"✅ Channel cleaned. {len(deleted)} messages removed.")
+            log.debug("✅ Channel cleaned. %s messages removed.", len(deleted))
         except Exception as e:
-            print(f"❌ Purge failed: {e}")
-            traceback.print_exc()
+            log.error("❌ Purge failed: %s", e, exc_info=True)
             await interaction.followup.send("❌ Failed to purge messages.", ephemeral=True)
         self.stop()
 
     @discord.ui.button(label="❌ Cancel", style=discord.ButtonStyle.secondary)
     async def cancel(self, interaction: discord.Interaction, _):
-        print(f"🚫 Cancel button pressed by {interaction.user}")
+        log.debug("🚫 Cancel button pressed by %s", interaction.user)
         await interaction.response.send_message("❌ Channel cleanup cancelled.", ephemeral=True)
         self.stop()
 
 class CleanChannel(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        print("✅ [COG LOADED] CleanChannel")
+        log.debug("✅ [COG LOADED] CleanChannel")
 
     def is_admin():
         async def predicate(interaction: discord.Interaction):
-            print(f"🔐 [Check] is_admin called by {interaction.user}")
+            log.debug("🔐 [Check] is_admin called by %s", interaction.user)
             return any(role.id == ADMIN_ROLE_ID for role in interaction.user.roles)
         return app_commands.check(predicate)
 
     @app_commands.command(name="cleanchannel", description="Admin: Wipe WARLAB channel after confirmation.")
     @is_admin()
     async def cleanchannel(self, interaction: discord.Interaction):
-        print(f"🟢 /cleanchannel by {interaction.user} ({interaction.user.id})")
+        log.debug("🟢 /cleanchannel by %s (%s)", interaction.user, interaction.user.id)
 
         if interaction.channel.id != WARLAB_CHANNEL_ID:
-            print("❌ Not in WARLAB channel")
+            log.debug("❌ Not in WARLAB channel")
             await interaction.response.send_message("❌ This command can only be used in the WARLAB channel.", ephemeral=True)
             return
 
@@ -66,15 +67,13 @@ class CleanChannel(commands.Cog):
                 view=ConfirmView(interaction.user),
                 ephemeral=True
             )
-            print("✅ Confirmation view sent.")
+            log.debug("✅ Confirmation view sent.")
         except Exception as e:
-            print(f"❌ Failed to send confirmation view: {e}")
-            traceback.print_exc()
+            log.error("❌ Failed to send confirmation view: %s", e, exc_info=True)
 
 async def setup(bot):
     try:
         await bot.add_cog(CleanChannel(bot))
-        print("✅ [SETUP] CleanChannel loaded.")
+        log.debug("✅ [SETUP] CleanChannel loaded.")
     except Exception as e:
-        print(f"❌ [SETUP FAILED] CleanChannel: {e}")
-        traceback.print_exc()
+        log.error("❌ [SETUP FAILED] CleanChannel: %s", e, exc_info=True)
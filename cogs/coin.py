@@ -4,9 +4,10 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.fileIO import load_file, save_file
+from utils.profileManager import profile_transaction
+from utils.logPipeline import get_logger
 
-USER_DATA = "data/user_profiles.json"
+log = get_logger("coin")
 
 class CoinManager(commands.Cog):
     def __init__(self, bot):
@@ -34,41 +35,37 @@ class CoinManager(commands.Cog):
             return
 
         user_id = str(user.id)
-        print(f"📥 [CoinManager] Loading profiles for coin update: {user_id}")
-        profiles = await load_file(USER_DATA) or {}
-
-        if user_id not in profiles:
-            print(f"❌ [CoinManager] No profile found for {user_id}")
-            await interaction.response.send_message(
-                f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                ephemeral=True
-            )
-            return
-
-        profile = profiles[user_id]
-        current_coins = profile.get("coins", 0)
-        print(f"💰 [CoinManager] Current coins: {current_coins}")
-
-        if action == "take":
-            new_total = current_coins - amount
-            if new_total < -100:
+        log.debug("📥 [CoinManager] Loading profile for coin update: %s", user_id)
+        async with profile_transaction(user_id) as profile:
+            if profile is None:
+                log.debug("❌ [CoinManager] No profile found for %s", user_id)
                 await interaction.response.send_message(
-                    f"❌ Cannot reduce coins below **-100**.\nCurrent: **{current_coins}**, Requested: **-{amount}**",
+                    f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
                     ephemeral=True
                 )
                 return
-            profile["coins"] = new_total
-            result = f"🗑 Removed **{amount} coins** from {user.mention}."
-            print(f"🧾 [CoinManager] Removed {amount} coins from UID: {user_id}, New Total: {new_total}")
 
-        elif action == "give":
-            profile["coins"] = current_coins + amount
-            result = f"✅ Gave **{amount} coins** to {user.mention}."
-            print(f"🧾 [CoinManager] Gave {amount} coins to UID: {user_id}, New Total: {profile['coins']}")
+            current_coins = profile.get("coins", 0)
+            log.debug("💰 [CoinManager] Current coins: %s", current_coins)
+
+            if action == "take":
+                new_total = current_coins - amount
+                if new_total < -100:
+                    await interaction.response.send_message(
+                        f"❌ Cannot reduce coins below **-100**.\nCurrent: **{current_coins}**, Requested: **-{amount}**",
+                        ephemeral=True
+                    )
+                    return
+                profile["coins"] = new_total
+                result = f"🗑 Removed **{amount} coins** from {user.mention}."
+                log.debug("🧾 [CoinManager] Removed %s coins from UID: %s, New Total: %s", amount, user_id, new_total)
+
+            elif action == "give":
+                profile["coins"] = current_coins + amount
+                result = f"✅ Gave **{amount} coins** to {user.mention}."
+                log.debug("🧾 [CoinManager] Gave %s coins to UID: %s, New Total: %s", amount, user_id, profile['coins'])
 
-        profiles[user_id] = profile
-        print(f"📤 [CoinManager] Saving profile update for UID: {user_id}")
-        await save_file(USER_DATA, profiles)
+            log.debug("📤 [CoinManager] Saving profile update for UID: %s", user_id)
 
         await interaction.response.send_message(
             f"{result}\n💰 New Balance: **{profile['coins']} coins**",
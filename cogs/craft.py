@@ -3,17 +3,18 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from collections import Counter
+from collections.abc import Mapping
 
-from utils.fileIO import load_file, save_file
-from utils.inventory import has_required_parts, remove_parts
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.inventory import Stash
 from utils.prestigeBonusHandler import can_craft_tactical, can_craft_explosives
 from utils.prestigeUtils import apply_prestige_xp, broadcast_prestige_announcement, PRESTIGE_TIERS
+from utils.logPipeline import get_logger
+
+log = get_logger("craft")
 
-USER_DATA       = "data/user_profiles.json"
-RECIPE_DATA     = "data/item_recipes.json"
-ARMOR_DATA      = "data/armor_blueprints.json"
-EXPLOSIVE_DATA  = "data/explosive_blueprints.json"
 
 TURNIN_ELIGIBLE = [
     "Mlock", "M4", "Mosin", "USG45", "BK-133",
@@ -33,78 +34,63 @@ class CraftButton(discord.ui.Button):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        print(f"🔘 [CraftButton] Clicked for {self.blueprint} by {interaction.user.id}")
+        log.debug("🔘 [CraftButton] Clicked for %s by %s", self.blueprint, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
         if str(interaction.user.id) != self.user_id:
             await interaction.followup.send("⚠️ This isn’t your crafting menu.", ephemeral=True)
             return
 
-        try:
-            profiles   = await load_file(USER_DATA) or {}
-            recipes    = await load_file(RECIPE_DATA) or {}
-            armor      = await load_file(ARMOR_DATA) or {}
-            explosives = await load_file(EXPLOSIVE_DATA) or {}
-        except Exception as e:
-            print(f"❌ [CraftButton] Failed to load data: {e}")
-            await interaction.followup.send("❌ Error loading crafting data.", ephemeral=True)
-            return
-
-        all_recipes = {**recipes, **armor, **explosives}
-        user = profiles.get(self.user_id)
-
-        if not user:
-            await interaction.followup.send("❌ User profile not found.", ephemeral=True)
-            print(f"❌ [CraftButton] Profile not found: {self.user_id}")
-            return
-
-        blueprint_name = f"{self.blueprint} Blueprint"
-        if blueprint_name not in user.get("blueprints", []):
-            await interaction.followup.send(f"🔒 You must unlock **{blueprint_name}** first.", ephemeral=True)
-            return
-
-        item_key = self.blueprint.lower()
-        recipe = all_recipes.get(item_key)
-        if not recipe or not isinstance(recipe, dict):
-            await interaction.followup.send("❌ Invalid blueprint data.", ephemeral=True)
-            return
-
-        prestige = user.get("prestige", 0)
-        if item_key in armor and not can_craft_tactical(prestige):
-            await interaction.followup.send("🔒 Requires Prestige II for tactical gear.", ephemeral=True)
-            return
-        if item_key in explosives and not can_craft_explosives(prestige):
-            await interaction.followup.send("🔒 Requires Prestige III for explosives.", ephemeral=True)
-            return
-
-        stash = Counter(user.get("stash", []))
-        if not has_required_parts(stash, recipe["requirements"]):
-            missing = [
-                f"{qty - stash.get(p, 0)}× {p}"
-                for p, qty in recipe["requirements"].items()
-                if stash.get(p, 0) < qty
-            ]
-            await interaction.followup.send("❌ Missing parts:\n• " + "\n• ".join(missing), ephemeral=True)
-            return
-
-        try:
-            remove_parts(stash, recipe["requirements"])
+        async with profile_transaction(self.user_id) as user:
+            catalog     = get_catalog()
+            armor       = catalog.armor
+            explosives  = catalog.explosives
+            all_recipes = catalog.all_recipes
+
+            if not user:
+                await interaction.followup.send("❌ User profile not found.", ephemeral=True)
+                log.debug("❌ [CraftButton] Profile not found: %s", self.user_id)
+                return
+
+            blueprint_name = f"{self.blueprint} Blueprint"
+            if blueprint_name not in user.get("blueprints", []):
+                await interaction.followup.send(f"🔒 You must unlock **{blueprint_name}** first.", ephemeral=True)
+                return
+
+            item_key = self.blueprint.lower()
+            recipe = all_recipes.get(item_key)
+            if not recipe or not isinstance(recipe, Mapping):
+                await interaction.followup.send("❌ Invalid blueprint data.", ephemeral=True)
+                return
+
+            prestige = user.get("prestige", 0)
+            if item_key in armor and not can_craft_tactical(prestige):
+                await interaction.followup.send("🔒 Requires Prestige II for tactical gear.", ephemeral=True)
+                return
+            if item_key in explosives and not can_craft_explosives(prestige):
+                await interaction.followup.send("🔒 Requires Prestige III for explosives.", ephemeral=True)
+                return
+
+            stash = Stash(user)
+            if not stash.take_all(recipe["requirements"]):
+                missing = [
+                    f"{qty - stash.count(p)}× {p}"
+                    for p, qty in recipe["requirements"].items()
+                    if stash.count(p) < qty
+                ]
+                await interaction.followup.send("❌ Missing parts:\n• " + "\n• ".join(missing), ephemeral=True)
+                return
 
             optional_parts = recipe.get("optional", {})
             optional_used = []
             for part, qty in optional_parts.items():
-                if stash.get(part, 0) >= qty:
-                    stash[part] -= qty
-                    if stash[part] <= 0:
-                        del stash[part]
+                if stash.take(part, qty):
                     optional_used.append(f"{qty}× {part}")
 
-            user["stash"] = list(stash.elements())
-
             crafted = recipe["produces"]
-            user["stash"].append(crafted)
+            stash.add(crafted)
             if crafted in TURNIN_ELIGIBLE:
-                user.setdefault("crafted", []).append({
+                user.crafted.append({
                     "item": crafted,
                     "optional": optional_used
                 })
@@ -112,13 +98,11 @@ class CraftButton(discord.ui.Button):
             user["builds_completed"] = user.get("builds_completed", 0) + 1
             user, ranked_up, rank_up_msg, old_rank, new_rank = apply_prestige_xp(user, xp_gain=25)
 
-            profiles[self.user_id] = user
-            await save_file(USER_DATA, profiles)
-
+        try:
             if ranked_up:
                 await broadcast_prestige_announcement(interaction.client, interaction.user, user)
 
-            print(f"🧪 [CraftButton] Crafted: {crafted} — XP applied — Saved profile: {self.user_id}")
+            log.debug("🧪 [CraftButton] Crafted: %s — XP applied — Saved profile: %s", crafted, self.user_id)
 
             embed = discord.Embed(
                 title="✅ Crafting Successful",
@@ -153,7 +137,7 @@ class CraftButton(discord.ui.Button):
                     self.view.stored_messages.append(msg)
 
             # 🔁 Update main blueprint view
-            updated_stash = Counter(user["stash"])
+            updated_stash = Stash(user)
             updated_view = CraftView(self.user_id, user.get("blueprints", []), updated_stash, all_recipes)
             updated_view.stored_messages = self.view.stored_messages
 
@@ -164,13 +148,13 @@ class CraftButton(discord.ui.Button):
                 r = all_recipes.get(key)
                 if not r: continue
                 reqs = r.get("requirements", {})
-                if all(updated_stash.get(p, 0) >= q for p, q in reqs.items()):
+                if updated_stash.has_all(reqs):
                     line = f"{r['produces']} — ✅ Build Ready"
                 else:
                     missing = [
-                        f"{q - updated_stash.get(p, 0)}× {p}"
+                        f"{q - updated_stash.count(p)}× {p}"
                         for p, q in reqs.items()
-                        if updated_stash.get(p, 0) < q
+                        if updated_stash.count(p) < q
                     ]
                     line = f"{r['produces']} — ❌ Missing Parts:\n• " + "\n• ".join(missing)
                 if key in explosives:
@@ -194,7 +178,7 @@ class CraftButton(discord.ui.Button):
             await self.view.stored_messages[0].edit(embed=updated_embed, view=updated_view)
 
         except Exception as e:
-            print(f"❌ [CraftButton] Exception occurred: {e}")
+            log.error("❌ [CraftButton] Exception occurred: %s", e)
             try:
                 await interaction.user.send("✅ Crafting succeeded, but view update failed.")
             except:
@@ -205,7 +189,7 @@ class CloseButton(discord.ui.Button):
         super().__init__(label="Close", style=discord.ButtonStyle.danger, row=4)
 
     async def callback(self, interaction: discord.Interaction):
-        print(f"❌ [CloseButton] Triggered by {interaction.user.id}")
+        log.debug("❌ [CloseButton] Triggered by %s", interaction.user.id)
         try:
             for child in self.view.children:
                 child.disabled = True
@@ -215,11 +199,11 @@ class CloseButton(discord.ui.Button):
                 view=None
             )
         except Exception as e:
-            print(f"❌ [CloseButton] Failed to edit message: {e}")
+            log.error("❌ [CloseButton] Failed to edit message: %s", e)
             await interaction.followup.send("❌ Failed to close view. Try again or refresh.", ephemeral=True)
 
-class CraftView(discord.ui.View):
-    def __init__(self, user_id, blueprints, stash_counter, all_recipes):
+class CraftView(WarlabView):
+    def __init__(self, user_id, blueprints, stash, all_recipes):
         super().__init__(timeout=90)
         self.stored_messages = []
         count = 0
@@ -230,7 +214,7 @@ class CraftView(discord.ui.View):
             if not recipe:
                 continue
             reqs = recipe.get("requirements", {})
-            can_build = all(stash_counter.get(p, 0) >= q for p, q in reqs.items())
+            can_build = stash.has_all(reqs)
             self.add_item(CraftButton(user_id, core_name, enabled=can_build))
             count += 1
             if count >= 20:
@@ -245,12 +229,11 @@ class Craft(commands.Cog):
     async def craft(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         uid = str(interaction.user.id)
-        print(f"🛠️ [Craft] Opening workshop for UID: {uid}")
-        profiles = await load_file(USER_DATA) or {}
-        recipes = await load_file(RECIPE_DATA) or {}
-        armor = await load_file(ARMOR_DATA) or {}
-        explosives = await load_file(EXPLOSIVE_DATA) or {}
-        user = profiles.get(uid)
+        log.debug("🛠️ [Craft] Opening workshop for UID: %s", uid)
+        user = await get_profile(uid)
+        catalog = get_catalog()
+        armor = catalog.armor
+        explosives = catalog.explosives
 
         if not user:
             await interaction.followup.send("❌ You don't have a profile yet. Use `/register` first.", ephemeral=True)
@@ -261,8 +244,8 @@ class Craft(commands.Cog):
             await interaction.followup.send("🔒 You don’t own any blueprints. Visit `/blackmarket`.", ephemeral=True)
             return
 
-        stash = Counter(user.get("stash", []))
-        all_recipes = {**recipes, **armor, **explosives}
+        stash = Stash(user)
+        all_recipes = catalog.all_recipes
         grouped_buildables = {"🔫 Weapons": [], "🪖 Armor": [], "💣 Explosives": []}
 
         for bp in blueprints:
@@ -272,14 +255,14 @@ class Craft(commands.Cog):
             if not recipe:
                 continue
             reqs = recipe.get("requirements", {})
-            can_build = all(stash.get(p, 0) >= q for p, q in reqs.items())
+            can_build = stash.has_all(reqs)
             if can_build:
                 line = f"{recipe['produces']} — ✅ Build Ready"
             else:
                 missing = [
-                    f"{q - stash.get(p, 0)}× {p}" 
-                    for p, q in reqs.items() 
-                    if stash.get(p, 0) < q
+                    f"{q - stash.count(p)}× {p}"
+                    for p, q in reqs.items()
+                    if stash.count(p) < q
                 ]
                 line = f"{recipe['produces']} — ❌ Missing Parts:\n• " + "\n• ".join(missing)
 
@@ -2,6 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from utils.profileManager import create_profile, get_profile  # ✅ Use proper profile functions
+from utils.logPipeline import get_logger
+
+log = get_logger("forceregister")
 
 ADMIN_ROLE_ID = 1173049392371085392
 
@@ -18,11 +21,11 @@ class ForceRegister(commands.Cog):
     @is_admin()
     async def forceregister(self, interaction: discord.Interaction, target: discord.Member):
         user_id = str(target.id)
-        print(f"📥 [/forceregister] Called by {interaction.user} for target {target} ({user_id})")
+        log.debug("📥 [/forceregister] Called by %s for target %s (%s)", interaction.user, target, user_id)
 
         existing = await get_profile(user_id)
         if existing:
-            print(f"🟡 [forceregister] {target.display_name} already registered.")
+            log.debug("🟡 [forceregister] %s already registered.", target.display_name)
             await interaction.response.send_message(
                 f"🟡 `{target.display_name}` is already registered.",
                 ephemeral=True
@@ -30,7 +33,7 @@ class ForceRegister(commands.Cog):
             return
 
         await create_profile(user_id, target.display_name)
-        print(f"✅ [forceregister] {target.display_name} successfully registered.")
+        log.debug("✅ [forceregister] %s successfully registered.", target.display_name)
         await interaction.response.send_message(
             f"✅ `{target.display_name}` has been force-registered.",
             ephemeral=True
@@ -1,10 +1,11 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.storageClient import load_file, save_file
-from utils.profileManager import get_profile  # ✅ Consistent with registration logic
+from utils.profileManager import delete_profile  # ✅ Consistent with registration logic
+from utils.logPipeline import get_logger
+
+log = get_logger("forceunregister")
 
-USER_DATA = "data/user_profiles.json"
 ADMIN_ROLE_ID = 1173049392371085392
 
 class ForceUnregister(commands.Cog):
@@ -20,22 +21,19 @@ class ForceUnregister(commands.Cog):
     @is_admin()
     async def forceunregister(self, interaction: discord.Interaction, target: discord.Member):
         user_id = str(target.id)
-        print(f"📥 [/forceunregister] Called by {interaction.user} to remove {target} ({user_id})")
+        log.debug("📥 [/forceunregister] Called by %s to remove %s (%s)", interaction.user, target, user_id)
 
-        profiles = await load_file(USER_DATA) or {}
-        existing = await get_profile(user_id)
+        removed = await delete_profile(user_id)
 
-        if not existing:
-            print(f"⚠️ [forceunregister] {target.display_name} has no profile.")
+        if not removed:
+            log.debug("⚠️ [forceunregister] %s has no profile.", target.display_name)
             await interaction.response.send_message(
                 f"⚠️ `{target.display_name}` is not registered.",
                 ephemeral=True
             )
             return
 
-        del profiles[user_id]
-        await save_file(USER_DATA, profiles)
-        print(f"🗑️ [forceunregister] Removed profile for {target.display_name}")
+        log.debug("🗑️ [forceunregister] Removed profile for %s", target.display_name)
         await interaction.response.send_message(
             f"🗑️ `{target.display_name}` has been unregistered.",
             ephemeral=True
@@ -6,11 +6,15 @@ from discord import app_commands
 import json
 import os
 
-from utils.storageClient import load_file, save_file
-from stash_image_generator import generate_stash_image
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.inventory import Stash
+from utils.renderService import render_stash_image
+from utils.logPipeline import get_logger
+
+log = get_logger("fortify")
 
-USER_DATA = "data/user_profiles.json"
-CATALOG_PATH = "data/labskins_catalog.json"
 
 MAX_REINFORCEMENTS = {
     "Barbed Fence": 9,
@@ -32,6 +36,10 @@ TOOL_NAMES = ["Hammer", "Saw", "Nails", "Pliers"]
 SPECIAL_NAMES = ["Guard Dog", "Claymore Trap"]
 DEFENCE_TYPES = ["Guard Dog", "Claymore Trap", "Barbed Fence", "Reinforced Gate", "Locked Container"]
 
+def _cost_parts(cost) -> list:
+    """The stash items one reinforcement consumes (one of each)."""
+    return cost.get("tools", []) + cost.get("special", [])
+
 def render_stash_visual(reinforcements):
     bf = reinforcements.get("Barbed Fence", 0)
     lc = reinforcements.get("Locked Container", 0)
@@ -85,44 +93,27 @@ class ReinforceButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         user_id = str(interaction.user.id)
-        profiles = await load_file(USER_DATA) or {}
-        profile = profiles.get(user_id)
-        catalog = await load_file(CATALOG_PATH) or {}
-
-        if not profile:
-            await interaction.followup.send("❌ Profile not found.", ephemeral=True)
-            return
-
-        stash = profile.get("stash", [])
-        reinforcements = profile.setdefault("reinforcements", {})
-        profile.setdefault("stash_hp", 0)
+        async with profile_transaction(user_id) as profile:
+            catalog = get_catalog().labskins
 
-        cost = REINFORCEMENT_COSTS[self.rtype]
-        missing = []
-
-        for tool in cost.get("tools", []):
-            if stash.count(tool) < 1:
-                missing.append(tool)
-        for item in cost.get("special", []):
-            if stash.count(item) < 1:
-                missing.append(item)
+            if not profile:
+                await interaction.followup.send("❌ Profile not found.", ephemeral=True)
+                return
 
-        if missing:
-            await interaction.followup.send(f"🔧 You’re missing: {', '.join(set(missing))}", ephemeral=True)
-            return
+            stash = Stash(profile)
+            reinforcements = profile.reinforcements
 
-        for tool in cost.get("tools", []):
-            stash.remove(tool)
-        for item in cost.get("special", []):
-            stash.remove(item)
+            cost = REINFORCEMENT_COSTS[self.rtype]
+            needed = _cost_parts(cost)
 
-        reinforcements[self.rtype] = reinforcements.get(self.rtype, 0) + 1
-        if "stash_hp" in cost:
-            profile["stash_hp"] += cost["stash_hp"]
+            if not stash.take_all(needed):
+                missing = [item for item in needed if item not in stash]
+                await interaction.followup.send(f"🔧 You’re missing: {', '.join(missing)}", ephemeral=True)
+                return
 
-        profile["stash"] = stash
-        profiles[user_id] = profile
-        await save_file(USER_DATA, profiles)
+            reinforcements[self.rtype] = reinforcements.get(self.rtype, 0) + 1
+            if "stash_hp" in cost:
+                profile.stash_hp += cost["stash_hp"]
 
         visuals = get_skin_visuals(profile, catalog)
         visual_text = render_stash_visual(reinforcements)
@@ -135,7 +126,7 @@ class ReinforceButton(discord.ui.Button):
         specials_string = "\n".join(f"{item} x{count}" for item, count in remaining_specials.items()) or "None"
 
         try:
-            stash_img_path = generate_stash_image(
+            stash_img_path = await render_stash_image(
                 user_id,
                 reinforcements,
                 base_path="assets/stash_layers",
@@ -160,7 +151,7 @@ class ReinforceButton(discord.ui.Button):
             await self.view.main_msg.edit(embed=embed, attachments=[file], view=new_view)
 
         except Exception as e:
-            print(f"❌ Error generating stash image: {e}")
+            log.error("❌ Error generating stash image: %s", e)
             await self.view.main_msg.edit(content="⚠️ Reinforcement saved, but image failed to render.")
 
 class CloseButton(discord.ui.Button):
@@ -172,21 +163,20 @@ class CloseButton(discord.ui.Button):
             # Properly clear embed and attached image
             await self.view.main_msg.edit(content="❌ Fortification UI closed.", embed=None, attachments=[], view=None)
         except Exception as e:
-            print(f"❌ Failed to close fortify UI: {e}")
+            log.error("❌ Failed to close fortify UI: %s", e)
         await interaction.response.defer()
 
-class ReinforcementView(discord.ui.View):
+class ReinforcementView(WarlabView):
     def __init__(self, profile):
         super().__init__(timeout=300)
         self.main_msg = None
-        stash = profile.get("stash", [])
+        stash = Stash(profile)
         reinforcements = profile.get("reinforcements", {})
 
         for rtype in REINFORCEMENT_COSTS:
             current = reinforcements.get(rtype, 0)
             max_count = MAX_REINFORCEMENTS.get(rtype, 0)
-            cost = REINFORCEMENT_COSTS[rtype]
-            has_all = all(stash.count(t) > 0 for t in cost.get("tools", [])) and all(stash.count(s) > 0 for s in cost.get("special", []))
+            has_all = stash.has_all(_cost_parts(REINFORCEMENT_COSTS[rtype]))
 
             if current < max_count and has_all:
                 self.add_item(ReinforceButton(rtype))
@@ -199,30 +189,24 @@ class Fortify(commands.Cog):
 
     @app_commands.command(name="fortify", description="Open fortification UI and choose reinforcement")
     async def fortify(self, interaction: discord.Interaction):
-        print(f"📥 /fortify triggered by {interaction.user} ({interaction.user.id})")
+        log.debug("📥 /fortify triggered by %s (%s)", interaction.user, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
         try:
             user_id = str(interaction.user.id)
-            profiles = await load_file(USER_DATA) or {}
-            profile = profiles.get(user_id)
-            catalog = await load_file(CATALOG_PATH) or {}
+            # Read-only until a button is pressed: no transaction, so it works while storage is down
+            profile = await get_profile(user_id)
+            catalog = get_catalog().labskins
 
             if profile is None:
                 await interaction.followup.send("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
                 return
 
-            profile.setdefault("stash", [])
-            profile.setdefault("reinforcements", {})
-            profile.setdefault("stash_hp", 0)
-            profiles[user_id] = profile
-            await save_file(USER_DATA, profiles)
-
             visuals = get_skin_visuals(profile, catalog)
             visual_text = render_stash_visual(profile["reinforcements"])
             defense_status = format_defense_status(profile["reinforcements"])
 
-            stash_img_path = generate_stash_image(
+            stash_img_path = await render_stash_image(
                 user_id,
                 profile["reinforcements"],
                 base_path="assets/stash_layers",
@@ -243,7 +227,7 @@ class Fortify(commands.Cog):
             view.main_msg = msg
 
         except Exception as e:
-            print(f"❌ /fortify crashed: {e}")
+            log.error("❌ /fortify crashed: %s", e)
             await interaction.followup.send("❌ Something went wrong while opening the fortification menu.", ephemeral=True)
 
 async def setup(bot):
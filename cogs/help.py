@@ -58,11 +58,15 @@ FALLBACK_DESCRIPTIONS = {
     "cleanchannel":    "Admin: Wipe WARLAB channel after confirmation.",
     "warlabbackup":    "Admin: Back up all Warlab data to archive channel.",
     "warlabnuke":      "Admin: Reset all Warlab player data (IRREVERSIBLE).",
+    "reloadcatalog":   "Admin: Reload items, recipes and skins from storage.",
+    "cachestats":      "Admin: Show cache hit rates and pending writes.",
+    "replication":     "Admin: Show replication lag to remote storage.",
 }
 
 ADMIN_COMMANDS = {
     "adjust","coin","blueprint","part","tool","skin",
-    "forceregister","forceunregister","cleanchannel","warlabbackup","warlabnuke"
+    "forceregister","forceunregister","cleanchannel","warlabbackup","warlabnuke",
+    "reloadcatalog","cachestats","replication"
 }
 
 GETTING_STARTED = [
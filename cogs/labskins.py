@@ -3,10 +3,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.logPipeline import get_logger
+
+log = get_logger("labskins")
 
-USER_DATA = "data/user_profiles.json"
-CATALOG_PATH = "data/labskins_catalog.json"
 
 SKIN_IMAGE_PATHS = {
     "Rust Bucket": "assets/stash_layers/base_house_prestige1.PNG",
@@ -63,9 +66,9 @@ class LabSkinSelect(discord.ui.Select):
         if skin in self.unlocked:
             return True
 
-        prestige = self.profile.get("prestige", 0)
-        raids = self.profile.get("raids_successful", 0)
-        scavenges = self.profile.get("scavenges_completed", 0)
+        prestige = self.profile.prestige
+        raids = self.profile.successful_raids
+        scavenges = self.profile.scavenges
         blueprints = self.profile.get("blueprints_unlocked", [])
 
         return (
@@ -86,23 +89,22 @@ class LabSkinSelect(discord.ui.Select):
 
         selected = self.values[0]
         if not self.meets_unlock_conditions(selected):
-            print(f"🔒 [labskins.py] Skin not unlocked: {selected}")
+            log.debug("🔒 [labskins.py] Skin not unlocked: %s", selected)
             await interaction.response.send_message("🔒 You haven't unlocked that skin yet.", ephemeral=True)
             return
 
-        profiles = await load_file(USER_DATA) or {}
-        profile = profiles.get(self.user_id, {})
-
-        profile["activeSkin"] = selected
-        profile["baseImage"] = SKIN_IMAGE_PATHS.get(selected, "assets/stash_layers/base_house_prestige1.PNG")
+        async with profile_transaction(self.user_id) as profile:
+            if profile is None:
+                await interaction.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
+                return
+            profile["activeSkin"] = selected
+            profile["baseImage"] = SKIN_IMAGE_PATHS.get(selected, "assets/stash_layers/base_house_prestige1.PNG")
 
-        profiles[self.user_id] = profile
-        await save_file(USER_DATA, profiles)
-        print(f"✅ [labskins.py] {self.user_id} set active skin to {selected}")
+        log.debug("✅ [labskins.py] %s set active skin to %s", self.user_id, selected)
 
         await interaction.response.send_message(f"✅ Lab skin set to **{selected}**.", ephemeral=True)
 
-class LabSkinView(discord.ui.View):
+class LabSkinView(WarlabView):
     def __init__(self, user_id, skins, catalog, profile):
         super().__init__(timeout=300)
         self.add_item(LabSkinSelect(user_id, skins, catalog, profile))
@@ -113,29 +115,28 @@ class LabSkins(commands.Cog):
 
     @app_commands.command(name="labskins", description="Equip a visual theme for your lab (Prestige I required)")
     async def labskins(self, interaction: discord.Interaction):
-        print(f"📥 [labskins.py] /labskins triggered by {interaction.user} ({interaction.user.id})")
+        log.debug("📥 [labskins.py] /labskins triggered by %s (%s)", interaction.user, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
         user_id = str(interaction.user.id)
-        profiles = await load_file(USER_DATA) or {}
-        profile = profiles.get(user_id)
+        profile = await get_profile(user_id)
 
         if not profile:
-            print(f"❌ [labskins.py] Profile not found for {user_id}")
+            log.debug("❌ [labskins.py] Profile not found for %s", user_id)
             await interaction.followup.send("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
             return
 
         if profile.get("prestige", 0) < 1:
-            print(f"🔒 [labskins.py] User {user_id} has insufficient prestige.")
+            log.debug("🔒 [labskins.py] User %s has insufficient prestige.", user_id)
             await interaction.followup.send("🔒 Prestige I required to use lab skins.", ephemeral=True)
             return
 
-        catalog = await load_file(CATALOG_PATH) or {}
+        catalog = get_catalog().labskins
         unlocked_skins = []
 
-        prestige = profile.get("prestige", 0)
-        raids = profile.get("raids_successful", 0)
-        scavenges = profile.get("scavenges_completed", 0)
+        prestige = profile.prestige
+        raids = profile.successful_raids
+        scavenges = profile.scavenges
         blueprints = profile.get("blueprints_unlocked", [])
 
         if prestige >= 1:
@@ -158,7 +159,7 @@ class LabSkins(commands.Cog):
         unlocked_skins += [s for s in profile.get("labskins", []) if s not in unlocked_skins]
 
         if not unlocked_skins:
-            print(f"⚠️ [labskins.py] No skins unlocked for {user_id}")
+            log.debug("⚠️ [labskins.py] No skins unlocked for %s", user_id)
             await interaction.followup.send("⚠️ You have not unlocked any lab skins yet.", ephemeral=True)
             return
 
@@ -174,7 +175,7 @@ class LabSkins(commands.Cog):
 
         view = LabSkinView(user_id, unlocked_skins, catalog, profile)
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-        print(f"📤 [labskins.py] Sent skin selection UI to {user_id}")
+        log.debug("📤 [labskins.py] Sent skin selection UI to %s", user_id)
 
 async def setup(bot):
     await bot.add_cog(LabSkins(bot))
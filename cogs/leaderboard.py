@@ -1,9 +1,10 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.storageClient import load_file
+from utils.profileManager import top_profiles_by
+from utils.logPipeline import get_logger
 
-USER_DATA_FILE = "data/user_profiles.json"
+log = get_logger("leaderboard")
 
 class CloseButton(discord.ui.Button):
     def __init__(self, ephemeral: bool):
@@ -17,7 +18,7 @@ class CloseButton(discord.ui.Button):
             else:
                 await interaction.message.delete()
         except Exception as e:
-            print(f"❌ Failed to close leaderboard view: {e}")
+            log.error("❌ Failed to close leaderboard view: %s", e)
 
 class LeaderboardView(discord.ui.View):
     def __init__(self, ephemeral: bool):
@@ -32,24 +33,21 @@ class Leaderboard(commands.Cog):
     async def leaderboard(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        profiles = await load_file(USER_DATA_FILE) or {}
-        if not profiles:
+        try:
+            # One load (or indexed query set) for all three boards
+            tops = await top_profiles_by(("successful_raids", "builds_completed", "coins"), limit=3)
+        except Exception as e:
+            log.error("❌ [leaderboard] Failed to load rankings: %s", e)
             await interaction.followup.send("❌ Failed to load player data.", ephemeral=True)
             return
 
-        raids = []
-        builds = []
-        coins = []
-
-        for uid, profile in profiles.items():
-            name = profile.get("name", f"<@{uid}>")  # fallback to mention
-            raids.append((name, profile.get("successful_raids", 0)))
-            builds.append((name, profile.get("builds_completed", 0)))
-            coins.append((name, profile.get("coins", 0)))
+        def ranked(field):
+            # fallback to mention
+            return [(profile.get("name", f"<@{uid}>"), profile.get(field, 0)) for uid, profile in tops[field]]
 
-        raids.sort(key=lambda x: x[1], reverse=True)
-        builds.sort(key=lambda x: x[1], reverse=True)
-        coins.sort(key=lambda x: x[1], reverse=True)
+        raids = ranked("successful_raids")
+        builds = ranked("builds_completed")
+        coins = ranked("coins")
 
         def format_top(title, data, emoji):
             if not data or all(v[1] == 0 for v in data):
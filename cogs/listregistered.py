@@ -1,11 +1,12 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from collections import Counter
 
-from utils.fileIO import load_file
+from utils.profileManager import load_all_profiles
+from utils.logPipeline import get_logger
+
+log = get_logger("listregistered")
 
-USER_DATA = "data/user_profiles.json"
 ENTRIES_PER_PAGE = 10
 
 PRESTIGE_TITLES = {
@@ -39,9 +40,9 @@ class CloseButton(discord.ui.Button):
                 )
             else:
                 await interaction.message.delete()
-            print(f"❎ [listregistered.py] Closed view successfully.")
+            log.debug("❎ [listregistered.py] Closed view successfully.")
         except Exception as e:
-            print(f"❌ [listregistered.py] Failed to close view: {e}")
+            log.error("❌ [listregistered.py] Failed to close view: %s", e)
         self.view.stop()
 
 class RegisteredListView(discord.ui.View):
@@ -66,7 +67,7 @@ class RegisteredListView(discord.ui.View):
         )
         embed.set_footer(text=f"Page {self.current_page + 1} of {len(self.pages)}")
         await interaction.response.edit_message(embed=embed, view=self)
-        print(f"🔁 [listregistered.py] Page changed to {self.current_page + 1}")
+        log.debug("🔁 [listregistered.py] Page changed to %s", self.current_page + 1)
 
     @discord.ui.button(label="⏪ Previous", style=discord.ButtonStyle.secondary)
     async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -94,11 +95,11 @@ class ListRegistered(commands.Cog):
 
     @app_commands.command(name="listregistered", description="Show all currently registered players and progress.")
     async def listregistered(self, interaction: discord.Interaction):
-        print(f"📥 [listregistered.py] /listregistered called by {interaction.user} ({interaction.user.id})")
+        log.debug("📥 [listregistered.py] /listregistered called by %s (%s)", interaction.user, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
-        profiles = await load_file(USER_DATA) or {}
-        print(f"📊 [listregistered.py] Loaded {len(profiles)} profiles from remote storage")
+        profiles = await load_all_profiles()
+        log.debug("📊 [listregistered.py] Loaded %s profiles from remote storage", len(profiles))
         guild = interaction.guild
         entries = []
 
@@ -109,12 +110,11 @@ class ListRegistered(commands.Cog):
                 name = member.display_name
             except:
                 name = "[Unknown User]"
-                print(f"⚠️ [listregistered.py] Could not fetch member name for ID: {uid}")
+                log.warning("⚠️ [listregistered.py] Could not fetch member name for ID: %s", uid)
 
             prestige = profile.get("prestige", 0)
             prestige_pts = profile.get("prestige_points", 0)
             rank = profile.get("rank_level", 0)
-            stash = Counter(profile.get("stash", []))
             reinforcements = profile.get("reinforcements", {})
             blueprints = profile.get("blueprints", [])
             scavenges = profile.get("scavenges", 0)
@@ -135,7 +135,7 @@ class ListRegistered(commands.Cog):
             )
 
         if not entries:
-            print("❌ [listregistered.py] No profiles found to display")
+            log.debug("❌ [listregistered.py] No profiles found to display")
             await interaction.followup.send("❌ No registered users found.", ephemeral=True)
             return
 
@@ -153,7 +153,7 @@ class ListRegistered(commands.Cog):
 
         view = RegisteredListView(pages, interaction.user, ephemeral=True)
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-        print(f"✅ [listregistered.py] Sent player list with {len(pages)} pages to {interaction.user}")
+        log.debug("✅ [listregistered.py] Sent player list with %s pages to %s", len(pages), interaction.user)
 
 async def setup(bot):
     await bot.add_cog(ListRegistered(bot))
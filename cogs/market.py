@@ -4,13 +4,20 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
+import asyncio
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 
 from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.inventory import Stash
+from utils.logPipeline import get_logger
+
+log = get_logger("market")
 
-USER_DATA      = "data/user_profiles.json"
 MARKET_FILE    = "data/market_rotation.json"
-ITEM_POOL_FILE = "data/market_items_master.json"
 
 ITEM_COSTS = {
     "tool"       : 50,
@@ -39,22 +46,22 @@ class BuyButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         user_id  = str(interaction.user.id)
-        print(f"🛒 [market.py] Purchase attempt by {user_id} for '{self.item_name}'")
+        log.debug("🛒 [market.py] Purchase attempt by %s for '%s'", user_id, self.item_name)
 
-        profiles = await load_file(USER_DATA) or {}
-        user     = profiles.get(user_id, {"coins": 0, "stash": []})
+        async with profile_transaction(user_id) as user:
+            if user is None:
+                await interaction.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
+                return
 
-        if user.get("coins", 0) < self.cost:
-            print(f"❌ [market.py] User {user_id} has insufficient funds ({user.get('coins', 0)} < {self.cost})")
-            await interaction.response.send_message("❌ You don’t have enough coins.", ephemeral=True)
-            return
+            if user.get("coins", 0) < self.cost:
+                log.debug("❌ [market.py] User %s has insufficient funds (%s < %s)", user_id, user.get('coins', 0), self.cost)
+                await interaction.response.send_message("❌ You don’t have enough coins.", ephemeral=True)
+                return
 
-        user["coins"] -= self.cost
-        user.setdefault("stash", []).append(self.item_name)
-        profiles[user_id] = user
-        await save_file(USER_DATA, profiles)
+            user["coins"] -= self.cost
+            Stash(user).add(self.item_name)
 
-        print(f"✅ [market.py] '{self.item_name}' purchased by {user_id}. New balance: {user['coins']} coins")
+        log.debug("✅ [market.py] '%s' purchased by %s. New balance: %s coins", self.item_name, user_id, user['coins'])
         await interaction.response.send_message(
             f"✅ You purchased **{self.item_name}**!\n"
             f"💰 New Balance: **{user['coins']} coins**",
@@ -68,7 +75,7 @@ class CloseButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.edit_message(content="❌ Market closed.", embed=None, view=None)
-        print(f"🛑 [market.py] Market view closed by {interaction.user.id}")
+        log.debug("🛑 [market.py] Market view closed by %s", interaction.user.id)
 
 # ──────────────────────────────────────────────────────────────────────────
 class Market(commands.Cog):
@@ -77,35 +84,34 @@ class Market(commands.Cog):
 
     @app_commands.command(name="market", description="Browse today’s rotating market")
     async def market(self, interaction: discord.Interaction):
-        print(f"📥 [market.py] /market command used by {interaction.user} ({interaction.user.id})")
+        log.debug("📥 [market.py] /market command used by %s (%s)", interaction.user, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
         user_id  = str(interaction.user.id)
-        profiles = await load_file(USER_DATA) or {}
-        user     = profiles.get(user_id)
+        # Profile and rotation in one round trip
+        user, market = await asyncio.gather(get_profile(user_id), load_file(MARKET_FILE))
 
         if not user:
-            print(f"❌ [market.py] No profile found for user {user_id}")
+            log.debug("❌ [market.py] No profile found for user %s", user_id)
             await interaction.followup.send("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
             return
 
-        market = await load_file(MARKET_FILE)
         if not market or market.get("expires", "") < datetime.utcnow().isoformat():
-            print("🔁 [market.py] Market expired or missing. Generating new rotation...")
+            log.debug("🔁 [market.py] Market expired or missing. Generating new rotation...")
             try:
                 market = await self.generate_market()
                 await save_file(MARKET_FILE, market)
-                print("✅ [market.py] New market rotation saved.")
+                log.debug("✅ [market.py] New market rotation saved.")
             except Exception as e:
-                print(f"❌ [market.py] Market generation failed: {e}")
+                log.error("❌ [market.py] Market generation failed: %s", e)
                 await interaction.followup.send(f"❌ Market generation failed: {str(e)}", ephemeral=True)
                 return
         else:
-            print("🟢 [market.py] Market is still valid. Using current offers.")
+            log.debug("🟢 [market.py] Market is still valid. Using current offers.")
 
         offers = market.get("offers", [])
         if not offers:
-            print("⚠️ [market.py] No offers found in market file.")
+            log.debug("⚠️ [market.py] No offers found in market file.")
             await interaction.followup.send("⚠️ No items available in the current market rotation.", ephemeral=True)
             return
 
@@ -115,7 +121,7 @@ class Market(commands.Cog):
             color=0x1abc9c
         ).set_footer(text=f"Stock rotates every {ROTATION_HOURS} h")
 
-        view = discord.ui.View(timeout=300)  # 🕒 Extended session timeout here
+        view = WarlabView(timeout=300)  # 🕒 Extended session timeout here
         for item in offers:
             name     = item["name"]
             category = item["category"]
@@ -131,20 +137,20 @@ class Market(commands.Cog):
 
         view.add_item(CloseButton())
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-        print(f"✅ [market.py] Market UI sent to user {user_id} with {len(offers)} items")
+        log.debug("✅ [market.py] Market UI sent to user %s with %s items", user_id, len(offers))
 
     # ──────────────────────────────────────────────────────────────────────
     async def generate_market(self):
-        full_pool = await load_file(ITEM_POOL_FILE) or {}
+        full_pool = get_catalog().market_items
 
-        if not isinstance(full_pool, dict):
+        if not full_pool:
             raise ValueError("Item pool file is invalid or not structured correctly.")
-        print("🎲 [market.py] Generating market from item pool...")
+        log.debug("🎲 [market.py] Generating market from item pool...")
 
         tools = [name for name, data in full_pool.items()
-                 if isinstance(data, dict) and data.get("type") == "tool"]
+                 if isinstance(data, Mapping) and data.get("type") == "tool"]
         parts = [name for name, data in full_pool.items()
-                 if isinstance(data, dict) and data.get("type") != "tool"]
+                 if isinstance(data, Mapping) and data.get("type") != "tool"]
 
         selected_tools = random.sample(tools, k=min(2, len(tools)))
         selected_parts = random.sample(parts, k=min(3, len(parts)))
@@ -158,7 +164,7 @@ class Market(commands.Cog):
             })
 
         random.shuffle(offers)
-        print(f"📦 [market.py] New rotation: {[o['name'] for o in offers]}")
+        log.debug("📦 [market.py] New rotation: %s", [o['name'] for o in offers])
 
         return {
             "offers": offers,
@@ -4,30 +4,23 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import profile_transaction
+from utils.inventory import Stash
+from utils.logPipeline import get_logger
+
+log = get_logger("part")
 
-USER_DATA = "data/user_profiles.json"
-PART_MASTER_REF = "data/part_master_reference.json"
-CAR_PARTS_FILE = "data/car_parts_master.json"
 
 class PartManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cached_parts = {}
 
     async def get_parts_by_category(self, category):
-        if category in self.cached_parts:
-            return self.cached_parts[category]
-
+        catalog = get_catalog()
         if category == "Car Parts":
-            ref = await load_file(CAR_PARTS_FILE) or {}
-            self.cached_parts[category] = list(ref.keys())
-        else:
-            ref = await load_file(PART_MASTER_REF) or {}
-            self.cached_parts[category] = ref.get(category, [])
-
-        print(f"📦 [part.py] Cached parts for {category}: {self.cached_parts[category]}")
-        return self.cached_parts[category]
+            return list(catalog.car_parts.keys())
+        return list(catalog.part_reference.get(category, ()))
 
     @app_commands.command(name="part", description="Admin: Give or remove parts from a player.")
     @app_commands.checks.has_permissions(administrator=True)
@@ -50,7 +43,7 @@ class PartManager(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         uid = str(user.id)
 
-        print(f"📥 [part.py] /part used by {interaction.user} — {action} {quantity}x {part} to {user} ({uid})")
+        log.debug("📥 [part.py] /part used by %s — %s %sx %s to %s (%s)", interaction.user, action, quantity, part, user, uid)
 
         if quantity <= 0:
             await interaction.followup.send("⚠️ Quantity must be greater than 0.", ephemeral=True)
@@ -58,56 +51,39 @@ class PartManager(commands.Cog):
 
         valid_parts = await self.get_parts_by_category(item)
         if part not in valid_parts:
-            print(f"❌ [part.py] Invalid part '{part}' for category '{item}'")
+            log.debug("❌ [part.py] Invalid part '%s' for category '%s'", part, item)
             await interaction.followup.send(
                 f"❌ Invalid part for {item}. Try auto-completing the field.",
                 ephemeral=True
             )
             return
 
-        profiles = await load_file(USER_DATA) or {}
-
-        if uid not in profiles:
-            print(f"❌ [part.py] No profile found for {uid}")
-            await interaction.followup.send(
-                f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                ephemeral=True
-            )
-            return
-
-        profile = profiles[uid]
-        stash = profile.get("stash", [])
-        if not isinstance(stash, list):
-            stash = []
-
-        if action == "give":
-            stash.extend([part] * quantity)
-            msg = f"✅ Gave **{quantity} × {part}** to {user.mention}."
-            print(f"🎁 [part.py] Gave {quantity}x {part} to {uid}")
-        else:
-            if stash.count(part) < quantity:
-                msg = f"⚠️ {user.mention} does not have **{quantity} × {part}** to remove."
-                print(f"❌ [part.py] Not enough {part} to remove from {user.display_name}")
-                await interaction.followup.send(msg, ephemeral=True)
+        async with profile_transaction(uid) as profile:
+            if profile is None:
+                log.debug("❌ [part.py] No profile found for %s", uid)
+                await interaction.followup.send(
+                    f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
+                    ephemeral=True
+                )
                 return
 
-            removed = 0
-            new_stash = []
-            for s in stash:
-                if s == part and removed < quantity:
-                    removed += 1
-                    continue
-                new_stash.append(s)
+            stash = Stash(profile)
 
-            stash = new_stash
-            msg = f"🗑 Removed **{removed} × {part}** from {user.mention}."
-            print(f"🧹 [part.py] Removed {removed}/{quantity}x {part} from {uid}")
+            if action == "give":
+                stash.add(part, quantity)
+                msg = f"✅ Gave **{quantity} × {part}** to {user.mention}."
+                log.debug("🎁 [part.py] Gave %sx %s to %s", quantity, part, uid)
+            else:
+                if not stash.take(part, quantity):
+                    msg = f"⚠️ {user.mention} does not have **{quantity} × {part}** to remove."
+                    log.debug("❌ [part.py] Not enough %s to remove from %s", part, user.display_name)
+                    await interaction.followup.send(msg, ephemeral=True)
+                    return
 
-        profile["stash"] = stash
-        profiles[uid] = profile
-        await save_file(USER_DATA, profiles)
+                msg = f"🗑 Removed **{quantity} × {part}** from {user.mention}."
+                log.debug("🧹 [part.py] Removed %sx %s from %s", quantity, part, uid)
 
-        print(f"💾 [part.py] Updated stash saved for user {uid}")
+        log.debug("💾 [part.py] Updated stash saved for user %s", uid)
         await interaction.followup.send(msg, ephemeral=True)
 
     @part.autocomplete("part")
@@ -2,46 +2,37 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import random, os, asyncio, gc
+import random, os, asyncio
 from datetime import datetime, timedelta
-from PIL import Image, ImageSequence, ImageFile
 
-from utils.storageClient import load_file, save_file
+from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.circuitBreaker import CircuitOpen
+from utils.inventory import Stash
 from utils.boosts import is_weekend_boost_active
 from utils.prestigeUtils import apply_prestige_xp, PRESTIGE_TIERS, broadcast_prestige_announcement
 from cogs.fortify import render_stash_visual, get_skin_visuals
-from stash_image_generator import generate_stash_image
+from utils.renderService import RENDERER, RenderError, render_stash_image, render_raid_overlay
+from utils.logPipeline import get_logger
 
-# PIL safety for partial/large files
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+log = get_logger("raid")
 
-USER_DATA       = "data/user_profiles.json"
 COOLDOWN_FILE   = "data/raid_cooldowns.json"
 RAID_LOG_FILE   = "data/raid_log.json"
-CATALOG_PATH    = "data/labskins_catalog.json"
 WARLAB_CHANNEL  = 1382187883590455296
-ITEMS_MASTER    = "data/items_master.json"
 
 FORCE_SAVE_TEST_RAID = True  # 🔧 Set to False later to disable test-mode persistence
 
 DEFENCE_TYPES = ["Guard Dog", "Claymore Trap", "Barbed Fence", "Reinforced Gate", "Locked Container"]
 
-WEAPON_PATH     = "data/item_recipes.json"
-ARMOR_PATH      = "data/armor_blueprints.json"
-EXPLOSIVE_PATH  = "data/explosive_blueprints.json"
-RARITY_WEIGHTS  = "data/rarity_weights.json"
-
 OVERLAY_GIFS = ["hit.gif", "hit2.gif", "victory.gif"]
 MISS_GIF     = "miss.gif"
 
 RAID_LIMIT = 3  # max raids
 RAID_WINDOW_HOURS = 12
 
-# --- memory-safe merge settings ---
-MAX_WORKING_WIDTH = 720   # cap working size; Discord downscales anyway
-FRAME_STEP        = 2     # sample every 2nd frame for animated overlays
-MAX_FRAMES        = 20    # hard cap frames to avoid huge RAM spikes
-
 # ---------------------- helper: non-blocking countdown ------------------- #
 async def countdown_ephemeral(base_msg: str, followup: discord.webhook.WebhookMessage):
     """
@@ -61,6 +52,14 @@ async def countdown_ephemeral(base_msg: str, followup: discord.webhook.WebhookMe
         pass
 
 # ---------------------------  Helper functions  -------------------------- #
+async def render_phase_overlay(stash_img_path: str, overlay: str, out_path: str) -> str:
+    """Overlay GIF on the stash picture; falls back to the still picture if the renderer is swamped."""
+    try:
+        return await render_raid_overlay(stash_img_path, f"assets/overlays/{overlay}", out_path)
+    except RenderError as e:
+        log.warning("⚠️ Overlay render skipped (%s): %s", overlay, e)
+        return stash_img_path
+
 def calculate_block_chance(reinforcements: dict, rtype: str, attacker: dict) -> int:
     count = reinforcements.get(rtype, 0)
     match rtype:
@@ -69,98 +68,10 @@ def calculate_block_chance(reinforcements: dict, rtype: str, attacker: dict) ->
         case "Reinforced Gate":   return count * 3
         case "Guard Dog":         return 50 if count else 0
         case "Claymore Trap":
-            has_pliers = any(item.lower() == "pliers" for item in attacker.get("stash", []))
+            has_pliers = any(item.lower() == "pliers" for item in Stash(attacker))
             return 25 if count and has_pliers else 0
         case _:                   return 0
 
-def _fit_to_width(img: Image.Image, max_w: int) -> Image.Image:
-    if img.width <= max_w:
-        return img
-    ratio = max_w / float(img.width)
-    new_size = (max_w, int(img.height * ratio))
-    return img.resize(new_size, Image.LANCZOS)
-
-def merge_overlay(base_path: str, overlay_path: str, out_path: str) -> str:
-    """
-    Memory-conscious compositor:
-    - Downscales base to MAX_WORKING_WIDTH
-    - Samples animated overlay frames (FRAME_STEP) and caps to MAX_FRAMES
-    - Ensures images are closed and memory freed after save
-    """
-    base = overlay = None
-    frames = None
-    try:
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        base = Image.open(base_path).convert("RGBA")
-        base = _fit_to_width(base, MAX_WORKING_WIDTH)
-
-        overlay = Image.open(overlay_path)
-
-        if getattr(overlay, "is_animated", False):
-            # Slightly larger overlay for effect
-            scale_factor = 1.10
-            new_size = (int(base.width * scale_factor), int(base.height * scale_factor))
-            pos = ((base.width - new_size[0]) // 2, (base.height - new_size[1]) // 2)
-
-            frames = []
-            for idx, frame in enumerate(ImageSequence.Iterator(overlay)):
-                if idx % FRAME_STEP != 0:
-                    continue
-                f = frame.convert("RGBA").resize(new_size, Image.LANCZOS)
-                combined = base.copy()
-                combined.paste(f, pos, f)
-                # Convert to palette per-frame to keep memory low
-                frames.append(combined.convert("P", palette=Image.ADAPTIVE))
-                # cap frames
-                if len(frames) >= MAX_FRAMES:
-                    break
-
-            if not frames:
-                # fallback single frame if overlay had too few frames
-                still = base.copy().convert("P", palette=Image.ADAPTIVE)
-                frames = [still]
-
-            duration = overlay.info.get("duration", 100)
-            frames[0].save(
-                out_path,
-                save_all=True,
-                append_images=frames[1:],
-                loop=0,
-                duration=duration,
-                optimize=True,
-                disposal=2
-            )
-
-            # explicit cleanup
-            for f in frames:
-                try: f.close()
-                except: pass
-            del frames
-        else:
-            ov = overlay.convert("RGBA").resize(base.size, Image.LANCZOS)
-            base.paste(ov, (0, 0), ov)
-            base.convert("RGB").save(out_path, "GIF", optimize=True)
-
-        return out_path
-    except Exception as e:
-        print(f"❌ merge_overlay failed: {e}")
-        # fall back to base image if something goes wrong
-        try:
-            if base_path != out_path:
-                # copy base to out_path to keep downstream happy
-                Image.open(base_path).save(out_path)
-            return out_path
-        except Exception:
-            return base_path
-    finally:
-        try:
-            if overlay: overlay.close()
-        except: pass
-        try:
-            if base: base.close()
-        except: pass
-        gc.collect()
-
 def format_defense_status(reinforcements: dict) -> str:
     emoji_map = {
         "Barbed Fence": "🧱",
@@ -186,30 +97,9 @@ def format_defense_status(reinforcements: dict) -> str:
     return "\n".join(lines)
 
 async def get_unowned_blueprint(user_profile):
-    weapon_pool     = await load_file(WEAPON_PATH)
-    armor_pool      = await load_file(ARMOR_PATH)
-    explosive_pool  = await load_file(EXPLOSIVE_PATH)
-    rarity_weights  = await load_file(RARITY_WEIGHTS)
-
-    all_items = []
-    current_blueprints = user_profile.get("blueprints", [])
-
-    for pool in (weapon_pool, armor_pool, explosive_pool):
-        for key, entry in pool.items():
-            produced = entry.get("produces")
-            blueprint_name = f"{produced} Blueprint"
-            if produced and blueprint_name not in current_blueprints:
-                all_items.append({
-                    "item": blueprint_name,
-                    "source_key": key,
-                    "rarity": entry.get("rarity", "Common")
-                })
-
-    if not all_items:
-        return None  # No new blueprint available
-
-    from utils.inventory import weighted_choice
-    return weighted_choice(all_items, rarity_weights)
+    sampler = get_catalog().blueprint_sampler
+    owned = sampler.mask(user_profile.get("blueprints", []))
+    return sampler.draw(exclude=owned)  # None when no new blueprint is available
     
 # ---------------------- Reinforcement Summary Tracker -------------------- #
 def summarize_destroyed(start, end, triggered):
@@ -226,12 +116,12 @@ def summarize_destroyed(start, end, triggered):
 # --------------------- Weekend Bonus Item Helper ------------------------ #
 async def get_random_bonus_item():
     try:
-        items = await load_file(ITEMS_MASTER)
+        items = get_catalog().items_master
         if not items:
             return None
         return random.choice(list(items.keys()))
     except Exception as e:
-        print(f"⚠️ Failed to load bonus item: {e}")
+        log.warning("⚠️ Failed to load bonus item: %s", e)
         return None
 
 # ---------------------------  UI Buttons  ------------------------------- #
@@ -244,7 +134,7 @@ class AttackButton(discord.ui.Button):
         try:
             await interaction.message.edit(view=self.view)
         except Exception as e:
-            print(f"❌ Failed to disable Attack button: {e}")
+            log.error("❌ Failed to disable Attack button: %s", e)
         await self.view.attack_phase(interaction)
 
 # 🛠️ Updated CloseButton (safe for ephemeral)
@@ -261,14 +151,14 @@ class CloseButton(discord.ui.Button):
                 view=None
             )
         except Exception as e:
-            print(f"❌ [CloseButton] Failed to edit message: {e}")
+            log.error("❌ [CloseButton] Failed to edit message: %s", e)
             try:
                 await interaction.followup.send("❌ The Raid UI was closed", ephemeral=True)
             except Exception as e2:
-                print(f"⛔ Fallback message also failed: {e2}")
+                log.error("⛔ Fallback message also failed: %s", e2)
 
 # ---------------------------  Main Raid View  ---------------------------- #
-class RaidView(discord.ui.View):
+class RaidView(WarlabView):
     def __init__(self, ctx, attacker, defender, visuals, reinforcements,
                  stash_visual, stash_img_path, is_test_mode, phase=0, target=None):
         super().__init__(timeout=300)
@@ -305,7 +195,7 @@ class RaidView(discord.ui.View):
             if self.message:
                 await self.message.edit(view=self)
         except Exception as e:
-            print(f"⚠️ button-disable edit failed: {e}")
+            log.warning("⚠️ button-disable edit failed: %s", e)
         await interaction.response.defer(thinking=True, ephemeral=True)
     
         phase_msgs = [
@@ -322,7 +212,7 @@ class RaidView(discord.ui.View):
                     await wait.edit(content=f"{msg} *({s}s)*")
                 await wait.delete()
             except Exception as e:
-                print(f"⛔ countdown error: {e}")
+                log.error("⛔ countdown error: %s", e)
     
         asyncio.create_task(countdown(phase_msgs[self.phase]))
     
@@ -348,21 +238,24 @@ class RaidView(discord.ui.View):
             dmg = random.choice(viable) if viable else None
             if dmg and random.random() < 0.8:
                 self.reinforcements[dmg] -= 1
-                print("🧱 damaged:", dmg)
+                log.debug("🧱 damaged: %s", dmg)
     
         if any(v < self.reinforcements_start.get(k, 0) for k, v in self.reinforcements.items()):
-            self.stash_img_path = generate_stash_image(
-                self.defender_id, self.reinforcements,
-                base_path="assets/stash_layers",
-                baseImagePath=self.defender.get("baseImage") if isinstance(self.defender, dict) else None
-            )
+            try:
+                self.stash_img_path = await render_stash_image(
+                    self.defender_id, self.reinforcements,
+                    base_path="assets/stash_layers",
+                    baseImagePath=self.defender.get("baseImage") if self.defender else None
+                ) or self.stash_img_path
+            except RenderError as e:
+                log.warning("⚠️ Keeping previous stash picture: %s", e)
     
         self.results.append(hit)
         self.stash_visual = render_stash_visual(self.reinforcements)
     
         overlay = OVERLAY_GIFS[i] if hit else MISS_GIF
         merged_path = f"temp/merged_phase{i+1}_{self.attacker_id}.gif"
-        await asyncio.to_thread(merge_overlay, self.stash_img_path, f"assets/overlays/{overlay}", merged_path)
+        merged_path = await render_phase_overlay(self.stash_img_path, overlay, merged_path)
         file = discord.File(merged_path, filename="merged.gif")
     
         phase_titles = ["🔸 Phase 1", "🔸 Phase 2", "🌟 Final Phase"]
@@ -380,7 +273,7 @@ class RaidView(discord.ui.View):
         embed.set_image(url="attachment://merged.gif")
     
         self.phase += 1
-        print(f"📊 Phase {i+1} done — Hit={hit}  Trigger={rtype}  Consumed={consumed}")
+        log.debug("📊 Phase %s done — Hit=%s  Trigger=%s  Consumed=%s", i + 1, hit, rtype, consumed)
     
         if self.phase < 3:
             next_view = RaidView(
@@ -395,10 +288,10 @@ class RaidView(discord.ui.View):
             try:
                 self.message = await self.message.edit(embed=embed, attachments=[file], view=next_view)
             except Exception as e:
-                print(f"❌ phase-{self.phase} edit failed: {e}")
+                log.error("❌ phase-%s edit failed: %s", self.phase, e)
             return
     
-        print("📊 Phase 3 starting")
+        log.debug("📊 Phase 3 starting")
         try:
             self.success = self.results.count(True) >= 2
             summary = []
@@ -412,56 +305,54 @@ class RaidView(discord.ui.View):
                 self.stolen_coins = random.randint(5, 25) * multiplier
         
                 uid = str(self.attacker_id)
-                profiles = await load_file(USER_DATA)
-                user = profiles.get(uid, self.attacker)
-        
-                if is_weekend_boost_active() and all(self.results):
-                    user["coins"] += 25
-                    bonus_item = await get_random_bonus_item()
-                    if bonus_item:
-                        user["stash"].append(bonus_item)
-                        summary.append(f"<a:bonus_item:1370091021958119445> Bonus item: {bonus_item}")
-                    summary.append("<a:bonus:1386436403000512694> Tripple Threat Weekend Boost Active! +25 coins")
+                async with profile_transaction(uid) as user:
+                    if user is None:
+                        raise LookupError(f"Attacker profile {uid} disappeared mid-raid")
+                    if is_weekend_boost_active() and all(self.results):
+                        user["coins"] += 25
+                        bonus_item = await get_random_bonus_item()
+                        if bonus_item:
+                            Stash(user).add(bonus_item)
+                            summary.append(f"<a:bonus_item:1370091021958119445> Bonus item: {bonus_item}")
+                        summary.append("<a:bonus:1386436403000512694> Tripple Threat Weekend Boost Active! +25 coins")
         
-                defender_stash = self.defender.get("stash", [])
-                stealable = [item for item in defender_stash if item not in DEFENCE_TYPES]
+                    defender_stash = Stash(self.defender)
+                    stealable = [item for item in defender_stash.units() if item not in DEFENCE_TYPES]
         
-                if stealable:
-                    stolen_count = min(3, len(stealable))
-                    self.stolen_items = random.sample(stealable, stolen_count)
-                    for item in self.stolen_items:
-                        defender_stash.remove(item)
+                    if stealable:
+                        stolen_count = min(3, len(stealable))
+                        self.stolen_items = random.sample(stealable, stolen_count)
+                        for item in self.stolen_items:
+                            defender_stash.take(item)
         
-                user.setdefault("stash", [])
-                print(f"📦 PRE-UPDATE STASH: {user['stash']}")
+                    stash = Stash(user)
+                    log.debug("📦 PRE-UPDATE STASH: %s", user['stash'])
         
-                user["coins"] += self.stolen_coins
-                user["stash"].extend(self.stolen_items)
-                user["successful_raids"] = user.get("successful_raids", 0) + 1
+                    user["coins"] += self.stolen_coins
+                    stash.add_all(self.stolen_items)
+                    user.successful_raids += 1
         
-                # ✅ FIXED UNPACKING LINE
-                user, ranked_up, rank_msg, _, _ = apply_prestige_xp(user, xp_gain=prestige_gain)
+                    # ✅ FIXED UNPACKING LINE
+                    user, ranked_up, rank_msg, _, _ = apply_prestige_xp(user, xp_gain=prestige_gain)
         
-                prestige_rank    = user.get("prestige", 0)
-                prestige_points  = user.get("prestige_points", 0)
-                next_threshold   = PRESTIGE_TIERS.get(prestige_rank + 1)
-                summary.append(
-                    f"🧬 Prestige: {prestige_rank} — "
-                    f"{prestige_points}/{next_threshold if next_threshold else 'MAX'}"
-                )
-                if ranked_up:
-                        try:
-                            await broadcast_prestige_announcement(self.ctx.client, self.ctx.user, user)
-                        except Exception as e:
-                            print(f"⚠️ Failed to broadcast prestige announcement: {e}")
+                    prestige_rank    = user.get("prestige", 0)
+                    prestige_points  = user.get("prestige_points", 0)
+                    next_threshold   = PRESTIGE_TIERS.get(prestige_rank + 1)
+                    summary.append(
+                        f"🧬 Prestige: {prestige_rank} — "
+                        f"{prestige_points}/{next_threshold if next_threshold else 'MAX'}"
+                    )
+                    if ranked_up:
+                            try:
+                                await broadcast_prestige_announcement(self.ctx.client, self.ctx.user, user)
+                            except Exception as e:
+                                log.warning("⚠️ Failed to broadcast prestige announcement: %s", e)
         
-                self.attacker = user
-                profiles[uid] = user
-                await save_file(USER_DATA, profiles)
+                    self.attacker = user
     
             final_overlay = "victory.gif" if self.success else "miss.gif"
             final_path = f"temp/final_{self.attacker_id}.gif"
-            await asyncio.to_thread(merge_overlay, self.stash_img_path, f"assets/overlays/{final_overlay}", final_path)
+            final_path = await render_phase_overlay(self.stash_img_path, final_overlay, final_path)
             fin_file = discord.File(final_path, filename="final.gif")
     
             fin_title = "🏆 Raid Concluded — Success!" if self.success else "❌ Raid Concluded — Failed"
@@ -481,7 +372,7 @@ class RaidView(discord.ui.View):
                 if current_coins > -100:
                     penalty = random.randint(1, 25)
                     self.attacker["coins"] = max(current_coins - penalty, -100)
-                    print(f"💸 Coin penalty applied: -{penalty}, New balance: {self.attacker['coins']}")
+                    log.debug("💸 Coin penalty applied: -%s, New balance: %s", penalty, self.attacker['coins'])
                     summary.append(f"💸 Lost {penalty} coins during the failed raid.")
                 else:
                     summary.append("💸 No further penalty — coin balance already at minimum.")
@@ -491,7 +382,7 @@ class RaidView(discord.ui.View):
                 if destroyed:
                     summary.append(f"🧱 Defenses destroyed: {destroyed}")
             except Exception as e:
-                print(f"⚠️ Failed to summarize destroyed defenses: {e}")
+                log.warning("⚠️ Failed to summarize destroyed defenses: %s", e)
     
             fin_embed.add_field(name="🏁 Raid Summary", value="\n".join(summary), inline=False)
             fin_embed.set_image(url="attachment://final.gif")
@@ -513,7 +404,7 @@ class RaidView(discord.ui.View):
                     else:
                         await warlab_channel.send(f"🛡️ <@{self.defender_id}> managed to keep <@{self.attacker_id}> away from their goods... maybe they won't be so lucky next time!")
             except Exception as e:
-                print(f"⚠️ Failed to broadcast raid result to warlab channel: {e}")
+                log.warning("⚠️ Failed to broadcast raid result to warlab channel: %s", e)
     
             try:
                 defender_user = await self.ctx.guild.fetch_member(int(self.defender_id))
@@ -532,28 +423,37 @@ class RaidView(discord.ui.View):
                         view=RetaliateButton(self.attacker_id, self.ctx.guild.id)
                     )
             except Exception as e:
-                print(f"⚠️ Failed to send retaliation DM: {e}")
+                log.warning("⚠️ Failed to send retaliation DM: %s", e)
     
-            print(
-                f"\n📒 RAID LOG DEBUG\n"
-                f"→ Attacker: {self.ctx.user.display_name} ({self.attacker_id})\n"
-                f"→ Defender: {self.target.display_name} ({self.defender_id})\n"
-                f"→ Result: {'✅ SUCCESS' if self.success else '❌ FAIL'}\n"
-                f"→ Triggered: {self.triggered}\n"
-                f"→ Reinforcements left: {self.reinforcements}\n"
-            )
+            log.debug("📒 Raid %s (%s) ➜ %s (%s): %s — triggered %s, reinforcements left %s",
+                      self.ctx.user.display_name, self.attacker_id,
+                      self.target.display_name, self.defender_id,
+                      "✅ SUCCESS" if self.success else "❌ FAIL",
+                      self.triggered, self.reinforcements)
     
+        except CircuitOpen:
+            raise  # the view tells the attacker storage is down
         except Exception as e:
-            print(f"🔥 Crash in Phase 3: {e}")
+            log.error("🔥 Crash in Phase 3: %s", e, exc_info=True)
 
 # --------------------------  /raid Command  ------------------------------ #
 class Raid(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Build overlay frames in the background so the first raid doesn't pay for it
+        self._warmup = asyncio.get_running_loop().create_task(self._warm_overlays())
+
+    async def _warm_overlays(self):
+        try:
+            await RENDERER.warm()
+        except Exception as e:
+            log.warning("⚠️ Overlay warm-up failed: %s", e)
+
     @app_commands.command(name="raid", description="Attempt to raid another player's stash.")
     async def raid(self, interaction: discord.Interaction, target: discord.Member):
-        print(f"🛠️ /raid — {interaction.user.display_name} ➜ {target.display_name}")
+        log.debug("🛠️ /raid — %s ➜ %s", interaction.user.display_name, target.display_name)
         await interaction.response.defer(ephemeral=True)
 
         attacker_id = str(interaction.user.id)
@@ -561,8 +461,11 @@ class Raid(commands.Cog):
         now = datetime.utcnow()
         is_test = target.display_name.lower() == "warlab"
 
-        users = await load_file(USER_DATA) or {}
-        attacker = users.get(attacker_id)
+        # Both profiles in one round trip; the test dummy needs no lookup
+        attacker, defender = await asyncio.gather(
+            get_profile(attacker_id),
+            get_profile(defender_id) if not is_test else asyncio.sleep(0),
+        )
         if not attacker:
             return await interaction.followup.send("❌ You don’t have a profile yet. Use `/register`.",
                                                    ephemeral=True)
@@ -579,7 +482,7 @@ class Raid(commands.Cog):
 
             if isinstance(raid_timestamps, dict):
                 # Legacy format — skip parsing and avoid crash
-                print(f"⚠️ Skipping legacy cooldown format for {attacker_id}")
+                log.debug("⚠️ Skipping legacy cooldown format for %s", attacker_id)
                 raid_timestamps = []
 
             recent_raids = []
@@ -589,7 +492,7 @@ class Raid(commands.Cog):
                     if now - parsed <= timedelta(hours=raid_window_hours):
                         recent_raids.append(parsed)
                 except ValueError:
-                    print(f"⚠️ Skipping malformed timestamp in cooldowns: {ts}")
+                    log.warning("⚠️ Skipping malformed timestamp in cooldowns: %s", ts)
 
             if len(recent_raids) >= raid_limit:
                 return await interaction.followup.send(
@@ -603,11 +506,11 @@ class Raid(commands.Cog):
             await save_file(COOLDOWN_FILE, cooldowns)
 
         except Exception as e:
-            print(f"⚠️ Failed raid cooldown check: {e}")
+            log.warning("⚠️ Failed raid cooldown check: %s", e)
 
         # Setup test or real defender
         if is_test:
-            catalog = await load_file(CATALOG_PATH) or {}
+            catalog = get_catalog().labskins
             skin = random.choice(list(catalog))
             defender = {
                 "labskins": [skin],
@@ -619,25 +522,28 @@ class Raid(commands.Cog):
                     "Reinforced Gate": 1,
                     "Locked Container": 1
                 },
-                "stash": ["Saw", "Red Dot", "NBC Suit"],
+                "stash": {"Saw": 1, "Red Dot": 1, "NBC Suit": 1},
                 "coins": 50
             }
-        else:
-            defender = users.get(defender_id)
-            if not defender:
-                return await interaction.followup.send(
-                    "❌ That player doesn’t have a profile yet.", ephemeral=True)
+        elif not defender:
+            return await interaction.followup.send(
+                "❌ That player doesn’t have a profile yet.", ephemeral=True)
 
         reinforcements = defender.get("reinforcements", {})
-        catalog = await load_file(CATALOG_PATH) or {}
+        catalog = get_catalog().labskins
         visuals = get_skin_visuals(defender, catalog)
         stash_visual = render_stash_visual(reinforcements)
 
-        stash_img_path = generate_stash_image(
-            defender_id, reinforcements,
-            base_path="assets/stash_layers",
-            baseImagePath=defender.get("baseImage")
-        )
+        try:
+            stash_img_path = await render_stash_image(
+                defender_id, reinforcements,
+                base_path="assets/stash_layers",
+                baseImagePath=defender.get("baseImage")
+            )
+        except RenderError as e:
+            log.warning("⚠️ Raid stash render failed: %s", e)
+            return await interaction.followup.send(
+                "⏳ The Warlab is busy drawing other raids — try again in a moment.", ephemeral=True)
 
         file = discord.File(stash_img_path, "raid_stash.png")
         embed = discord.Embed(
@@ -7,9 +7,13 @@ import random
 from datetime import datetime
 import pytz
 
-from utils.storageClient import load_file, save_file
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.storageClient import storage_available
+from utils.logPipeline import get_logger
+
+log = get_logger("rank")
 
-USER_DATA_FILE = "data/user_profiles.json"
 WARLAB_CHANNEL_ID = 1382187883590455296
 
 RANK_TITLES = {
@@ -46,14 +50,13 @@ class CloseButton(discord.ui.Button):
         try:
             await interaction.response.edit_message(content="❌ Rank view closed", embed=None, view=None)
         except Exception as e:
-            print(f"⚠️ [CloseButton] Failed to close ephemeral message: {e}")
+            log.warning("⚠️ [CloseButton] Failed to close ephemeral message: %s", e)
 
 class RankView(discord.ui.View):
-    def __init__(self, user_id: str, user_data: dict, update_callback):
+    def __init__(self, user_id: str, user_data: dict):
         super().__init__(timeout=300)
         self.user_id = user_id
         self.user_data = user_data
-        self.update_callback = update_callback
         self.add_item(CloseButton())
 
     @discord.ui.button(label="<a:bonus:1386436403000512694> Buy Boost", style=discord.ButtonStyle.primary, custom_id="buyboost_button")
@@ -78,16 +81,15 @@ class RankView(discord.ui.View):
 
         await itx.response.send_message(
             "Choose a boost to purchase:",
-            view=BoostDropdown(self.user_id, self.user_data, self.update_callback, opts),
+            view=BoostDropdown(self.user_id, self.user_data, opts),
             ephemeral=True
         )
 
-class BoostDropdown(discord.ui.View):
-    def __init__(self, uid, udata, update_cb, options):
+class BoostDropdown(WarlabView):
+    def __init__(self, uid, udata, options):
         super().__init__(timeout=300)
         self.uid = uid
         self.udata = udata
-        self.update_cb = update_cb
         self.select = discord.ui.Select(placeholder="Select a boost…", options=options, custom_id="boost_select")
         self.select.callback = self.process
         self.add_item(self.select)
@@ -100,16 +102,27 @@ class BoostDropdown(discord.ui.View):
         key = self.select.values[0]
         meta = BOOST_CATALOG[key]
         cost = meta["cost"]
-        coins = self.udata.get("coins", 0)
 
-        if coins < cost:
-            await itx.response.send_message(f"❌ You need {cost} coins for that boost.", ephemeral=True)
-            return
+        # Re-read the live profile: the view's copy may be minutes old
+        async with profile_transaction(self.uid) as user:
+            if user is None:
+                await itx.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
+                return
+
+            if user.get("boosts", {}).get(key):
+                await itx.response.send_message("✅ You already own that boost.", ephemeral=True)
+                return
+
+            if user.get("coins", 0) < cost:
+                await itx.response.send_message(f"❌ You need {cost} coins for that boost.", ephemeral=True)
+                return
 
-        self.udata["coins"] -= cost
-        self.udata.setdefault("boosts", {})[key] = True
-        print(f"⚡ [Boost] {self.uid} bought {key} for {cost} coins.")
-        await self.update_cb(self.uid, self.udata)
+            user["coins"] -= cost
+            user.boosts[key] = True
+            log.debug("⚡ [Boost] %s bought %s for %s coins.", self.uid, key, cost)
+
+        self.udata.clear()
+        self.udata.update(user)
 
         await itx.response.send_message(f"<a:bonus:1386436403000512694> Boost purchased: **{meta['label']}**", ephemeral=True)
 
@@ -117,18 +130,10 @@ class Rank(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def _update_user(self, uid, data):
-        print(f"💾 [Rank] Saving profile for UID {uid}")
-        all_profiles = await load_file(USER_DATA_FILE) or {}
-        all_profiles[uid] = data
-        await save_file(USER_DATA_FILE, all_profiles)
-
     @app_commands.command(name="rank", description="View rank, prestige & buy boosts.")
     async def rank(self, itx: discord.Interaction):
         uid = str(itx.user.id)
-        profiles = await load_file(USER_DATA_FILE) or {}
-        user = profiles.get(uid)
-
+        user = await get_profile(uid)
         if not user:
             await itx.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
             return
@@ -139,8 +144,12 @@ class Rank(commands.Cog):
         points = progress["points"]
         threshold = progress["next_threshold"]
 
+        # Keep the stored rank in sync — skipped while storage is down so /rank stays read-only
+        if user.get("prestige") != prestige and storage_available():
+            async with profile_transaction(uid) as live:
+                if live is not None:
+                    live["prestige"] = prestige
         user["prestige"] = prestige
-        await self._update_user(uid, user)
 
         class_id = user.get("special_class")
         reward = SPECIAL_REWARDS.get(class_id)
@@ -167,7 +176,7 @@ class Rank(commands.Cog):
             lines.append(f"{status} {meta['label']} — {meta['cost']} coins")
         emb.add_field(name="<a:bonus:1386436403000512694> Boosts", value="\n".join(lines), inline=False)
 
-        await itx.response.send_message(embed=emb, view=RankView(uid, user, self._update_user), ephemeral=True)
+        await itx.response.send_message(embed=emb, view=RankView(uid, user), ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Rank(bot))
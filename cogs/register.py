@@ -5,6 +5,9 @@ from discord.ext import commands
 from discord import app_commands, Interaction
 
 from utils.profileManager import create_profile, get_profile
+from utils.logPipeline import get_logger
+
+log = get_logger("register")
 
 class RegisterCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -15,10 +18,10 @@ class RegisterCog(commands.Cog):
         uid = str(interaction.user.id)
         existing = await get_profile(uid)
 
-        print(f"📥 [/register] Called by: {interaction.user} ({uid})")
+        log.debug("📥 [/register] Called by: %s (%s)", interaction.user, uid)
 
         if existing:
-            print(f"✅ [/register] Profile already exists for {uid}.")
+            log.debug("✅ [/register] Profile already exists for %s.", uid)
             await interaction.response.send_message(
                 "✅ You already have a profile — you can now try all other /warlab commands!",
                 ephemeral=True
@@ -26,7 +29,7 @@ class RegisterCog(commands.Cog):
             return
 
         await create_profile(uid, interaction.user.display_name)
-        print(f"🆕 [/register] Created new profile for {uid} — {interaction.user.display_name}")
+        log.debug("🆕 [/register] Created new profile for %s — %s", uid, interaction.user.display_name)
         await interaction.response.send_message(
             "🔗 Profile created! You can now use all other /warlab commands like /scavenge, /rank, etc.",
             ephemeral=True
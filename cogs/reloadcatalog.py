@@ -0,0 +1,36 @@
+# cogs/reloadcatalog.py — Admin: Hot-reload the static game data catalog from storage
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from utils.catalog import load_catalog
+from utils.logPipeline import get_logger
+
+log = get_logger("reloadcatalog")
+
+class ReloadCatalog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="reloadcatalog", description="Admin: Reload items, recipes and skins from storage.")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def reloadcatalog(self, interaction: discord.Interaction):
+        log.debug("📚 [reloadcatalog] Called by %s (%s)", interaction.user, interaction.user.id)
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            catalog = await load_catalog()
+        except Exception as e:
+            log.error("❌ [reloadcatalog] Reload failed: %s", e)
+            await interaction.followup.send("❌ Catalog reload failed — previous data is still active.", ephemeral=True)
+            return
+
+        await interaction.followup.send(
+            f"✅ Catalog reloaded — **{len(catalog.items_master)}** items, "
+            f"**{len(catalog.all_recipes)}** recipes, **{len(catalog.labskins)}** lab skins.",
+            ephemeral=True
+        )
+
+async def setup(bot):
+    await bot.add_cog(ReloadCatalog(bot))
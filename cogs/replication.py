@@ -0,0 +1,51 @@
+# cogs/replication.py — Admin: Show how far remote storage is behind the local journal
+
+import time
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from utils.fileIO import replication_stats, cache_stats
+from utils.logPipeline import get_logger
+
+log = get_logger("replication")
+
+class Replication(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="replication", description="Admin: Show replication lag to remote storage.")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def replication(self, interaction: discord.Interaction):
+        log.debug("🛰️ [replication] Called by %s (%s)", interaction.user, interaction.user.id)
+        journal = replication_stats()
+        files = cache_stats()
+
+        healthy = journal["pending"] == 0 or journal["lag_seconds"] < 60
+        last_ack = (f"{time.time() - journal['last_ack_at']:.0f}s ago"
+                    if journal["last_ack_at"] else "never (this boot)")
+
+        embed = discord.Embed(
+            title="🛰️ Warlab Replication",
+            color=0x2ecc71 if healthy else 0xe74c3c
+        )
+        embed.add_field(
+            name="⏱️ Lag",
+            value=(f"Unreplicated files: **{journal['pending']}**\n"
+                   f"Oldest unreplicated write: **{journal['lag_seconds']:.1f}s**\n"
+                   f"Last successful replication: **{last_ack}**"),
+            inline=False
+        )
+        embed.add_field(
+            name="📒 Journal",
+            value=(f"Writes: **{journal['appends']}** • Acked: **{journal['acks']}** • "
+                   f"Replayed at boot: **{journal['replayed']}**\n"
+                   f"Size: **{journal['bytes'] / 1024:.1f} KB** • Compactions: **{journal['compactions']}** • "
+                   f"Flush errors: **{files['flush_errors']}**"),
+            inline=False
+        )
+        embed.set_footer(text="WARLAB | SV13 Bot")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Replication(bot))
@@ -7,13 +7,14 @@ import json
 import random
 from datetime import datetime, timedelta
 
-from utils.fileIO import load_file, save_file
-from utils.inventory import weighted_choice
+from utils.catalog import get_catalog
+from utils.profileManager import profile_transaction
+from utils.inventory import Stash
 from utils.boosts import is_weekend_boost_active
+from utils.logPipeline import get_logger
+
+log = get_logger("scavange")
 
-USER_DATA = "data/user_profiles.json"
-RARITY_WEIGHTS = "data/rarity_weights.json"
-ITEMS_MASTER = "data/items_master.json"
 CONFIG_PATH = "config.json"
 
 SCAVENGE_MISSIONS = [
@@ -56,127 +57,98 @@ class Scavenge(commands.Cog):
     # Keep description generic so UI never drifts from config value.
     @app_commands.command(name="scavenge", description="Scavenge for random materials (cooldown applies)")
     async def scavenge(self, interaction: discord.Interaction):
-        print(f"🟢 /scavenge triggered by {interaction.user.display_name} ({interaction.user.id})")
+        log.debug("🟢 /scavenge triggered by %s (%s)", interaction.user.display_name, interaction.user.id)
         await interaction.response.defer(ephemeral=True)
 
         try:
             user_id = str(interaction.user.id)
             now = datetime.utcnow()
 
-            profiles = await load_file(USER_DATA) or {}
-            print(f"📁 Loaded user_profiles.json — {len(profiles)} profiles loaded")
-
-            if user_id not in profiles:
-                print(f"❌ User {user_id} not registered")
-                await interaction.followup.send("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
-                return
-
-            user = profiles.get(user_id, {})
-            user.setdefault("stash", [])
-            user.setdefault("coins", 0)
-            user.setdefault("last_scavenge", None)
-            user.setdefault("boosts", {})
-            user.setdefault("scavenges", 0)
-            user.setdefault("blueprints", [])
-
-            boosts = user["boosts"]
-            pulls = random.randint(2, 5)
-            boost_msgs = []
-            print(f"🔍 Base pulls: {pulls}")
-
-            if boosts.get("perm_loot_boost"):
-                pulls += 1
-                boost_msgs.append("💠 Permanent Loot Boost activated!")
-                print("✅ perm_loot_boost applied: +1 pull")
-
-            if boosts.get("daily_loot_boost"):
-                last_used = user.get("daily_loot_boost_used", "1970-01-01")
-                today = now.strftime("%Y-%m-%d")
-                if last_used != today:
-                    pulls += 1
-                    user["daily_loot_boost_used"] = today
-                    boost_msgs.append("🔄 Daily Loot Boost activated!")
-                    print("✅ daily_loot_boost applied: +1 pull")
-                else:
-                    print("❌ daily_loot_boost already used today")
-
-            cooldown_min = SCAVENGE_COOLDOWN_MIN
-            if user["last_scavenge"]:
-                last_time = datetime.fromisoformat(user["last_scavenge"])
-                if now < last_time + timedelta(minutes=cooldown_min):
-                    remaining = (last_time + timedelta(minutes=cooldown_min)) - now
-                    total_seconds = int(remaining.total_seconds())
-                    hrs, rem = divmod(total_seconds, 3600)
-                    mins = rem // 60
-                    formatted_time = f"**{hrs}h {mins}m**" if hrs else f"**{mins}m**"
-                    print(f"⏳ Cooldown active — {formatted_time} remaining")
-                    await interaction.followup.send(
-                        f"⏳ You must wait {formatted_time} more before scavenging again.",
-                        ephemeral=True
-                    )
+            async with profile_transaction(user_id) as user:
+                log.debug("📁 Loaded profile shard for %s", user_id)
+
+                if user is None:
+                    log.debug("❌ User %s not registered", user_id)
+                    await interaction.followup.send("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
                     return
 
-            item_catalog = await load_file(ITEMS_MASTER)
-            rarity_weights = await load_file(RARITY_WEIGHTS)
-            owned_blueprints = set(user["blueprints"])
-            print(f"📦 Loaded {len(item_catalog)} items")
-
-            loot_pool = []
-            for name, data in item_catalog.items():
-                if not isinstance(data, dict) or "rarity" not in data:
-                    continue
-                if data.get("type") == "crafted" and f"{name} Blueprint" in owned_blueprints:
-                    continue
-                loot_pool.append({"item": name, "rarity": data["rarity"]})
-
-            print(f"🎯 Final loot pool: {len(loot_pool)} entries")
-
-            found = []
-            crafted_found = []
-            attempts = 0
-            max_attempts = 15
-
-            while len(found) < pulls and attempts < max_attempts:
-                item = weighted_choice(loot_pool, rarity_weights)
-                if not item:
-                    print("⚠️ weighted_choice returned None")
-                    break
-                name = item["item"]
-                if name not in found:
-                    found.append(name)
-                    if item_catalog.get(name, {}).get("type") == "crafted":
-                        crafted_found.append(name)
-                attempts += 1
-
-            print(f"🎒 Items found: {found}")
-            print(f"🧰 Crafted items pulled: {crafted_found}")
-
-            if is_weekend_boost_active():
-                bonus = weighted_choice(loot_pool, rarity_weights)
-                if bonus:
-                    name = bonus["item"]
-                    if name not in found:
-                        found.append(name)
-                        boost_msgs.append("<a:bonus:1386436403000512694> Weekend Boost activated!")
-                        if item_catalog.get(name, {}).get("type") == "crafted":
-                            crafted_found.append(name)
-                        print(f"🎉 Weekend bonus pulled: {name}")
-
-            coins_found = random.randint(5, 25)
-            if boosts.get("coin_doubler"):
-                coins_found *= 2
-                boost_msgs.append("💸 Coin Doubler applied!")
-                print("💵 coin_doubler applied: coins doubled")
-
-            user["stash"].extend(found)
-            user["coins"] += coins_found
-            user["last_scavenge"] = now.isoformat()
-            user["scavenges"] += 1
-            profiles[user_id] = user
-            await save_file(USER_DATA, profiles)
-            print(f"✅ Saved updated profile for {user_id}")
-            print(f"🎒 Items found: {found}")
-            print(f"🧰 Crafted items pulled: {crafted_found}")
+                boosts = user.boosts
+                pulls = random.randint(2, 5)
+                boost_msgs = []
+                log.debug("🔍 Base pulls: %s", pulls)
+
+                if boosts.get("perm_loot_boost"):
+                    pulls += 1
+                    boost_msgs.append("💠 Permanent Loot Boost activated!")
+                    log.debug("✅ perm_loot_boost applied: +1 pull")
+
+                if boosts.get("daily_loot_boost"):
+                    last_used = user.get("daily_loot_boost_used", "1970-01-01")
+                    today = now.strftime("%Y-%m-%d")
+                    if last_used != today:
+                        pulls += 1
+                        user["daily_loot_boost_used"] = today
+                        boost_msgs.append("🔄 Daily Loot Boost activated!")
+                        log.debug("✅ daily_loot_boost applied: +1 pull")
+                    else:
+                        log.debug("❌ daily_loot_boost already used today")
+
+                cooldown_min = SCAVENGE_COOLDOWN_MIN
+                if user.last_scavenge:
+                    last_time = datetime.fromisoformat(user.last_scavenge)
+                    if now < last_time + timedelta(minutes=cooldown_min):
+                        remaining = (last_time + timedelta(minutes=cooldown_min)) - now
+                        total_seconds = int(remaining.total_seconds())
+                        hrs, rem = divmod(total_seconds, 3600)
+                        mins = rem // 60
+                        formatted_time = f"**{hrs}h {mins}m**" if hrs else f"**{mins}m**"
+                        log.debug("⏳ Cooldown active — %s remaining", formatted_time)
+                        await interaction.followup.send(
+                            f"⏳ You must wait {formatted_time} more before scavenging again.",
+                            ephemeral=True
+                        )
+                        return
+
+                catalog = get_catalog()
+                item_catalog = catalog.items_master
+                loot_sampler = catalog.loot_sampler
+                owned_blueprints = set(user.blueprints)
+                log.debug("📦 Loaded %s items", len(item_catalog))
+
+                # Crafted items whose blueprint the player owns stay out of the pool
+                owned = loot_sampler.mask(
+                    name for name in catalog.items_by_type.get("crafted", ())
+                    if f"{name} Blueprint" in owned_blueprints
+                )
+                log.debug("🎯 Final loot pool: %s entries", len(loot_sampler) - owned.bit_count())
+
+                # One pass, no replacement: exactly `pulls` distinct items (plus the weekend bonus)
+                weekend = is_weekend_boost_active()
+                draws = loot_sampler.sample_unique(pulls + (1 if weekend else 0), exclude=owned)
+                if not draws:
+                    log.debug("⚠️ Loot pool is empty")
+
+                found = [item["item"] for item in draws]
+                crafted_found = [name for name in found if item_catalog.get(name, {}).get("type") == "crafted"]
+
+                log.debug("🎒 Items found: %s", found)
+                log.debug("🧰 Crafted items pulled: %s", crafted_found)
+
+                if weekend and len(found) > pulls:
+                    boost_msgs.append("<a:bonus:1386436403000512694> Weekend Boost activated!")
+                    log.debug("🎉 Weekend bonus pulled: %s", found[-1])
+
+                coins_found = random.randint(5, 25)
+                if boosts.get("coin_doubler"):
+                    coins_found *= 2
+                    boost_msgs.append("💸 Coin Doubler applied!")
+                    log.debug("💵 coin_doubler applied: coins doubled")
+
+                Stash(user).add_all(found)
+                user.coins += coins_found
+                user.last_scavenge = now.isoformat()
+                user.scavenges += 1
+            log.debug("✅ Saved updated profile for %s", user_id)
             
             # Sort found items alphabetically for display
             found.sort()
@@ -186,7 +158,7 @@ class Scavenge(commands.Cog):
             embed.add_field(name="🧪 Mission", value=random.choice(SCAVENGE_MISSIONS), inline=False)
             embed.add_field(name="📦 Items Gained", value="\n".join(loot_display) if loot_display else "*Nothing this time…*", inline=False)
             embed.add_field(name="💰 Coins Found", value=str(coins_found), inline=True)
-            embed.add_field(name="✅ Scavenges Completed", value=str(user["scavenges"]), inline=True)
+            embed.add_field(name="✅ Scavenges Completed", value=str(user.scavenges), inline=True)
             
             if boost_msgs:
                 embed.add_field(name="<a:bonus:1386436403000512694> Active Boosts", value="\n".join(boost_msgs), inline=False)
@@ -202,7 +174,7 @@ class Scavenge(commands.Cog):
                 )
 
         except Exception as e:
-            print(f"❌ SCAVENGE EXCEPTION: {e}")
+            log.error("❌ SCAVENGE EXCEPTION: %s", e, exc_info=True)
             await interaction.followup.send("⚠️ Something went wrong during scavenging. Please contact staff if this persists.", ephemeral=True)
 
 async def setup(bot):
@@ -4,10 +4,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.fileIO import load_file, save_file
+from utils.catalog import get_catalog
+from utils.profileManager import profile_transaction
+from utils.logPipeline import get_logger
+
+log = get_logger("skin")
 
-USER_DATA = "data/user_profiles.json"
-CATALOG_PATH = "data/labskin_catalog.json"
 
 # ✅ Default fallback skin catalog if file missing or corrupted
 FALLBACK_CATALOG = {
@@ -50,10 +52,9 @@ class LabSkinManager(commands.Cog):
         self.bot = bot
 
     async def get_available_skins(self):
-        print(f"🔎 [skin.py] Loading skin catalog from {CATALOG_PATH}")
-        catalog = await load_file(CATALOG_PATH)
+        catalog = get_catalog().labskins
         if not catalog:
-            print("⚠️ Skin catalog missing or empty. Using fallback catalog.")
+            log.debug("⚠️ Skin catalog missing or empty. Using fallback catalog.")
         return list((catalog or FALLBACK_CATALOG).keys())
 
     @app_commands.checks.has_permissions(administrator=True)
@@ -73,63 +74,60 @@ class LabSkinManager(commands.Cog):
         user: discord.Member,
         skin: str
     ):
-        print(f"🛠️ /skin called by {interaction.user.display_name} ({interaction.user.id}) — {action} → {skin} for {user.id}")
+        log.debug("🛠️ /skin called by %s (%s) — %s → %s for %s", interaction.user.display_name, interaction.user.id, action, skin, user.id)
         available_skins = await self.get_available_skins()
 
         if skin not in available_skins:
-            print(f"❌ Invalid skin: {skin}")
+            log.debug("❌ Invalid skin: %s", skin)
             await interaction.response.send_message(
                 f"❌ Invalid skin. Choose from: {', '.join(available_skins)}",
                 ephemeral=True
             )
             return
 
-        profiles = await load_file(USER_DATA) or {}
         uid = str(user.id)
-        print(f"📁 Loaded user profile: {uid} {'✅ found' if uid in profiles else '❌ not found'}")
-
-        if uid not in profiles:
-            await interaction.response.send_message(
-                f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                ephemeral=True
-            )
-            return
-
-        profile = profiles[uid]
-        owned_skins = profile.get("labskins", [])
-        print(f"🎨 Current skins for {uid}: {owned_skins}")
-
-        if action == "give":
-            if skin not in owned_skins:
-                owned_skins.append(skin)
-                print(f"✅ Skin '{skin}' added to {uid}")
-            else:
-                print(f"⚠️ Skin '{skin}' already owned by {uid}")
-            await interaction.response.send_message(
-                f"✅ Skin **{skin}** unlocked for {user.mention}.",
-                ephemeral=True
-            )
+        async with profile_transaction(uid) as profile:
+            log.debug("📁 Loaded user profile: %s %s", uid, '✅ found' if profile else '❌ not found')
 
-        elif action == "remove":
-            if skin in owned_skins:
-                owned_skins.remove(skin)
-                print(f"🗑 Skin '{skin}' removed from {uid}")
+            if profile is None:
                 await interaction.response.send_message(
-                    f"🗑 Skin **{skin}** removed from {user.mention}.",
+                    f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
                     ephemeral=True
                 )
-            else:
-                print(f"⚠️ Skin '{skin}' not found in {uid}'s list")
+                return
+
+            owned_skins = profile.get("labskins", [])
+            log.debug("🎨 Current skins for %s: %s", uid, owned_skins)
+
+            if action == "give":
+                if skin not in owned_skins:
+                    owned_skins.append(skin)
+                    log.debug("✅ Skin '%s' added to %s", skin, uid)
+                else:
+                    log.debug("⚠️ Skin '%s' already owned by %s", skin, uid)
                 await interaction.response.send_message(
-                    f"⚠️ {user.mention} does not have that skin.",
+                    f"✅ Skin **{skin}** unlocked for {user.mention}.",
                     ephemeral=True
                 )
-                return
 
-        profile["labskins"] = owned_skins
-        profiles[uid] = profile
-        await save_file(USER_DATA, profiles)
-        print(f"💾 Saved updated skin list for {uid}")
+            elif action == "remove":
+                if skin in owned_skins:
+                    owned_skins.remove(skin)
+                    log.debug("🗑 Skin '%s' removed from %s", skin, uid)
+                    await interaction.response.send_message(
+                        f"🗑 Skin **{skin}** removed from {user.mention}.",
+                        ephemeral=True
+                    )
+                else:
+                    log.debug("⚠️ Skin '%s' not found in %s's list", skin, uid)
+                    await interaction.response.send_message(
+                        f"⚠️ {user.mention} does not have that skin.",
+                        ephemeral=True
+                    )
+                    return
+
+            profile["labskins"] = owned_skins
+        log.debug("💾 Saved updated skin list for %s", uid)
 
     @skin.autocomplete("skin")
     async def autocomplete_skin(self, interaction: discord.Interaction, current: str):
@@ -3,14 +3,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from collections import Counter
-from utils.fileIO import load_file
+from utils.catalog import get_catalog
+from utils.profileManager import get_profile
+from utils.inventory import Stash as PlayerStash  # the cog below is also called Stash
+from utils.logPipeline import get_logger
+
+log = get_logger("stash")
 
-USER_DATA_FILE = "data/user_profiles.json"
-ITEMS_MASTER_FILE = "data/items_master.json"
-ITEM_RECIPES_FILE = "data/item_recipes.json"
-ARMOR_RECIPES_FILE = "data/armor_blueprints.json"
-EXPLOSIVE_RECIPES_FILE = "data/explosive_blueprints.json"
 
 TURNIN_ELIGIBLE = [
     "Mlock", "M4", "Mosin", "USG45", "BK-133",
@@ -27,7 +26,7 @@ class CloseButton(discord.ui.Button):
             for msg in getattr(self.view, "stored_messages", []):
                 await msg.edit(content="❌ Stash view closed.", embed=None, view=None)
         except Exception as e:
-            print(f"❌ Failed to close stash UI: {e}")
+            log.error("❌ Failed to close stash UI: %s", e)
         await interaction.response.defer()
 
 class StashView(discord.ui.View):
@@ -44,31 +43,21 @@ class Stash(commands.Cog):
     async def stash(self, interaction: discord.Interaction):
         uid = str(interaction.user.id)
 
-        profiles = await load_file(USER_DATA_FILE)
-        items_master = await load_file(ITEMS_MASTER_FILE)
-        recipes = await load_file(ITEM_RECIPES_FILE)
-        armor_recipes = await load_file(ARMOR_RECIPES_FILE)
-        explosive_recipes = await load_file(EXPLOSIVE_RECIPES_FILE)
+        user = await get_profile(uid)
+        catalog = get_catalog()
+        items_master = catalog.items_master
 
-        if not profiles or uid not in profiles:
+        if not user:
             await interaction.response.send_message("❌ You don’t have a profile yet. Please use `/register` first.", ephemeral=True)
             return
 
-        user = profiles[uid]
-        stash_items = Counter(user.get("stash", []))
+        stash_items = PlayerStash(user)
         blueprints = user.get("blueprints", [])
         active_skin = user.get("activeSkin", "None")
         coins = user.get("coins", 0)
 
-        all_recipes = {}
-        produced_lookup = {}
-
-        for source in (recipes, armor_recipes, explosive_recipes):
-            for key, data in source.items():
-                all_recipes[key.lower()] = data
-                produced = data.get("produces")
-                if produced:
-                    produced_lookup[produced] = key
+        all_recipes = catalog.all_recipes
+        produced_lookup = catalog.produces
 
         grouped = {
             "🔫 Gun Parts"       : [],
@@ -110,7 +99,7 @@ class Stash(commands.Cog):
             if not recipe:
                 continue
             requirements = recipe.get("requirements", {})
-            can_build = all(stash_items.get(part, 0) >= qty for part, qty in requirements.items())
+            can_build = stash_items.has_all(requirements)
             if not can_build:
                 has_missing = True
             status = "✅ Build Ready" if can_build else "❌ Missing Parts"
@@ -4,9 +4,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.fileIO import load_file, save_file
+from utils.profileManager import profile_transaction
+from utils.inventory import Stash
+from utils.logPipeline import get_logger
+
+log = get_logger("tool")
 
-USER_DATA = "data/user_profiles.json"
 TOOLS = ["Saw", "Nails", "Pliers", "Hammer"]
 
 class ToolManager(commands.Cog):
@@ -34,63 +37,46 @@ class ToolManager(commands.Cog):
     ):
         try:
             await interaction.response.defer(ephemeral=True)
-            print(f"🛠️ /tool used by {interaction.user.display_name} → {action.upper()} {quantity} × {item} for {user.display_name}")
+            log.debug("🛠️ /tool used by %s → %s %s × %s for %s", interaction.user.display_name, action.upper(), quantity, item, user.display_name)
 
             if quantity <= 0:
                 await interaction.followup.send("⚠️ Quantity must be greater than **0**.", ephemeral=True)
                 return
 
-            profiles = await load_file(USER_DATA) or {}
             uid = str(user.id)
+            async with profile_transaction(uid) as profile:
+                if profile is None:
+                    log.debug("❌ Profile missing for UID %s — %s", uid, user.display_name)
+                    await interaction.followup.send(
+                        f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
+                        ephemeral=True
+                    )
+                    return
 
-            if uid not in profiles:
-                print(f"❌ Profile missing for UID {uid} — {user.display_name}")
-                await interaction.followup.send(
-                    f"❌ That player does not have a profile yet. Ask them to use `/register` first.",
-                    ephemeral=True
-                )
-                return
-
-            profile = profiles[uid]
-            stash = profile.get("stash", [])
-            if not isinstance(stash, list):
-                print(f"⚠️ Stash was not a list. Resetting stash for UID {uid}")
-                stash = []
-
-            # ── GIVE ───────────────────────
-            if action == "give":
-                stash.extend([item] * quantity)
-                msg = f"✅ Gave **{quantity} × {item}** to {user.mention}."
-                print(f"✅ {quantity} × {item} added to {user.display_name}'s stash")
+                stash = Stash(profile)
 
-            # ── REMOVE ─────────────────────
-            else:
-                if stash.count(item) < quantity:
-                    msg = f"⚠️ {user.mention} does not have **{quantity} × {item}** to remove."
-                    print(f"⚠️ Not enough {item} in stash to remove from {user.display_name}")
-                    await interaction.followup.send(msg, ephemeral=True)
-                    return
+                # ── GIVE ───────────────────────
+                if action == "give":
+                    stash.add(item, quantity)
+                    msg = f"✅ Gave **{quantity} × {item}** to {user.mention}."
+                    log.debug("✅ %s × %s added to %s's stash", quantity, item, user.display_name)
 
-                removed = 0
-                new_stash = []
-                for s in stash:
-                    if s == item and removed < quantity:
-                        removed += 1
-                        continue
-                    new_stash.append(s)
+                # ── REMOVE ─────────────────────
+                else:
+                    if not stash.take(item, quantity):
+                        msg = f"⚠️ {user.mention} does not have **{quantity} × {item}** to remove."
+                        log.debug("⚠️ Not enough %s in stash to remove from %s", item, user.display_name)
+                        await interaction.followup.send(msg, ephemeral=True)
+                        return
 
-                stash = new_stash
-                msg = f"🗑 Removed **{removed} × {item}** from {user.mention}."
-                print(f"🗑 {removed} × {item} removed from {user.display_name}'s stash")
+                    msg = f"🗑 Removed **{quantity} × {item}** from {user.mention}."
+                    log.debug("🗑 %s × %s removed from %s's stash", quantity, item, user.display_name)
 
-            profile["stash"] = stash
-            profiles[uid] = profile
-            await save_file(USER_DATA, profiles)
-            print(f"💾 Profile updated for {user.display_name} ({uid})")
+            log.debug("💾 Profile updated for %s (%s)", user.display_name, uid)
             await interaction.followup.send(msg, ephemeral=True)
 
         except Exception as e:
-            print(f"❌ Error in /tool command: {type(e).__name__}: {e}")
+            log.error("❌ Error in /tool command: %s: %s", type(e).__name__, e)
             try:
                 await interaction.followup.send(f"❌ Unexpected error: {e}", ephemeral=True)
             except:
@@ -3,15 +3,19 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.storageClient import load_file, save_file
+from utils.fileIO import file_transaction
+from utils.profileManager import get_profile, profile_transaction
+from utils.storageGuard import WarlabView
+from utils.circuitBreaker import CircuitOpen
+from utils.inventory import Stash
 from utils.prestigeUtils import get_prestige_rank, get_prestige_progress, broadcast_prestige_announcement
 from datetime import datetime
-import traceback
 import asyncio
-from collections import Counter
 from cogs.rank import RANK_TITLES
+from utils.logPipeline import get_logger
+
+log = get_logger("turnin")
 
-USER_DATA = "data/user_profiles.json"
 TURNIN_LOG = "logs/turnin_log.json"
 TRADER_ORDERS_CHANNEL_ID = 1367583463775146167
 ADMIN_ROLE_IDS = ["1173049392371085392", "1184921037830373468"]
@@ -41,42 +45,37 @@ class TurnInButton(discord.ui.Button):
             return
 
         try:
-            profiles = await load_file(USER_DATA) or {}
-            logs = await load_file(TURNIN_LOG) or {}
-
-            user_data = profiles.get(self.user_id)
-            if not user_data:
-                return await interaction.response.send_message("❌ No profile found.", ephemeral=True)
-
-            stash = user_data.get("stash", [])
-            crafted_entries = user_data.get("crafted", [])
-            crafted_entry = next((c for c in crafted_entries if isinstance(c, dict) and c.get("item") == self.item_name), None)
-
-            if self.item_name not in stash or not crafted_entry:
-                return await interaction.response.send_message("❌ This item is not eligible or not in your stash.", ephemeral=True)
-
-            prestige = REWARD_VALUES["base_prestige"]
-            if "Tactical" in self.item_name:
-                prestige += REWARD_VALUES["tactical_bonus"]
-            coins = REWARD_VALUES["coin_bonus"] if REWARD_VALUES["coin_enabled"] else 0
-
-            user_data["stash"].remove(self.item_name)
-            user_data["crafted"].remove(crafted_entry)
-            user_data.setdefault("crafted_log", []).append(self.item_name)
-            user_data["prestige"] += prestige
-            user_data["prestige_points"] = user_data.get("prestige_points", 0) + prestige
-            user_data["coins"] += coins
-            user_data["turnins_completed"] = user_data.get("turnins_completed", 0) + 1
-
-            logs.setdefault(self.user_id, []).append({
-                "item": self.item_name,
-                "reward_prestige": prestige,
-                "reward_coins": coins,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-
-            await save_file(USER_DATA, profiles)
-            await save_file(TURNIN_LOG, logs)
+            async with profile_transaction(self.user_id) as user_data:
+                if not user_data:
+                    return await interaction.response.send_message("❌ No profile found.", ephemeral=True)
+
+                stash = Stash(user_data)
+                crafted_entries = user_data.get("crafted", [])
+                crafted_entry = next((c for c in crafted_entries if isinstance(c, dict) and c.get("item") == self.item_name), None)
+
+                if self.item_name not in stash or not crafted_entry:
+                    return await interaction.response.send_message("❌ This item is not eligible or not in your stash.", ephemeral=True)
+
+                prestige = REWARD_VALUES["base_prestige"]
+                if "Tactical" in self.item_name:
+                    prestige += REWARD_VALUES["tactical_bonus"]
+                coins = REWARD_VALUES["coin_bonus"] if REWARD_VALUES["coin_enabled"] else 0
+
+                stash.take(self.item_name)
+                user_data.crafted.remove(crafted_entry)
+                user_data.crafted_log.append(self.item_name)
+                user_data.prestige += prestige
+                user_data.prestige_points += prestige
+                user_data.coins += coins
+                user_data.turnins_completed += 1
+
+                async with file_transaction(TURNIN_LOG, {}) as logs:
+                    logs.setdefault(self.user_id, []).append({
+                        "item": self.item_name,
+                        "reward_prestige": prestige,
+                        "reward_coins": coins,
+                        "timestamp": datetime.utcnow().isoformat()
+                    })
 
             optional_bonus = "\n• " + "\n• ".join(crafted_entry.get("optional", [])) if crafted_entry.get("optional") else "None"
 
@@ -104,13 +103,15 @@ class TurnInButton(discord.ui.Button):
                     admin_embed.set_footer(text="Please click the button below when the reward is ready.")
                     await channel.send(embed=admin_embed, view=RewardConfirmView(self.user_id, self.item_name))
             except Exception:
-                print("❌ [Admin Ping Error]\n" + traceback.format_exc())
+                log.error("❌ [Admin Ping Error]", exc_info=True)
 
+        except CircuitOpen:
+            raise  # the view tells the player storage is down
         except Exception:
-            print("❌ [TurnInButton Error]\n" + traceback.format_exc())
+            log.error("❌ [TurnInButton Error]", exc_info=True)
             await interaction.followup.send("❌ Something broke while processing your turn-in. Please ping an admin.", ephemeral=True)
 
-class RewardConfirmView(discord.ui.View):
+class RewardConfirmView(WarlabView):
     def __init__(self, player_id, item_name):
         super().__init__(timeout=86400)
         self.add_item(ConfirmRewardButton(player_id, item_name))
@@ -128,42 +129,44 @@ class ConfirmRewardButton(discord.ui.Button):
         await interaction.message.edit(content=f"✅ Confirmed by {interaction.user.mention}", view=None)
 
         try:
-            profiles = await load_file(USER_DATA) or {}
-            player_data = profiles.get(self.player_id, {})
-
-            old_points = player_data.get("prestige_points", 0)
-            old_rank = get_prestige_rank(old_points)
-
-            prestige_points = player_data["prestige_points"]
-            progress_data = get_prestige_progress(prestige_points)
-            new_rank = progress_data["current_rank"]
-            crafted_total = len(player_data.get("crafted_log", []))
-
-            player_data["prestige"] = new_rank
-            rank_title = RANK_TITLES.get(new_rank, "Unknown Survivor")
-
-            if progress_data["next_threshold"]:
-                progress_line = f"Tier {new_rank} — {progress_data['points']}/{progress_data['next_threshold']}"
-            else:
-                progress_line = f"Tier {new_rank} — MAX"
-
-            user = await interaction.client.fetch_user(int(self.player_id))
-            if new_rank > old_rank:
-                await broadcast_prestige_announcement(interaction.client, user, player_data)
-
-            if user:
-                await user.send(
-                    f"🎉 **Your reward has been confirmed! Please make your way to Sobotka Trader to receive your new:**\n\n"
-                    f"🔧 **Item Turned In:** {self.item_name}\n"
-                    f"📦 **Total Builds Completed:** `{crafted_total}`\n"
-                    f"🧠 **Current Prestige:** {progress_line} • *{rank_title}*\n\n"
-                    f"🫡 Stay frosty, Survivor — your legend is growing!"
-                )
+            async with profile_transaction(self.player_id) as player_data:
+                if player_data is None:
+                    raise LookupError(f"No profile found for {self.player_id}")
+
+                old_points = player_data.get("prestige_points", 0)
+                old_rank = get_prestige_rank(old_points)
+
+                prestige_points = player_data["prestige_points"]
+                progress_data = get_prestige_progress(prestige_points)
+                new_rank = progress_data["current_rank"]
+                crafted_total = len(player_data.get("crafted_log", []))
+
+                player_data["prestige"] = new_rank
+                rank_title = RANK_TITLES.get(new_rank, "Unknown Survivor")
+
+                if progress_data["next_threshold"]:
+                    progress_line = f"Tier {new_rank} — {progress_data['points']}/{progress_data['next_threshold']}"
+                else:
+                    progress_line = f"Tier {new_rank} — MAX"
+
+                user = await interaction.client.fetch_user(int(self.player_id))
+                if new_rank > old_rank:
+                    await broadcast_prestige_announcement(interaction.client, user, player_data)
+
+                if user:
+                    await user.send(
+                        f"🎉 **Your reward has been confirmed! Please make your way to Sobotka Trader to receive your new:**\n\n"
+                        f"🔧 **Item Turned In:** {self.item_name}\n"
+                        f"📦 **Total Builds Completed:** `{crafted_total}`\n"
+                        f"🧠 **Current Prestige:** {progress_line} • *{rank_title}*\n\n"
+                        f"🫡 Stay frosty, Survivor — your legend is growing!"
+                    )
 
-            await save_file(USER_DATA, profiles)
 
+        except CircuitOpen:
+            raise  # the view tells the admin storage is down
         except Exception as e:
-            print(f"⚠️ [RewardConfirmButton Error] {e}")
+            log.warning("⚠️ [RewardConfirmButton Error] %s", e)
 
         await interaction.response.defer()
 
@@ -174,16 +177,15 @@ class TurnIn(commands.Cog):
     @app_commands.command(name="turnin", description="Submit a crafted item for rewards")
     async def turnin(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
-        profiles = await load_file(USER_DATA) or {}
-        user_data = profiles.get(user_id)
+        user_data = await get_profile(user_id)
 
         if not user_data:
             return await interaction.response.send_message("❌ You don’t have a profile yet. Use `/register` first.", ephemeral=True)
 
-        stash_counter = Counter(user_data.get("stash", []))
+        stash = Stash(user_data)
         crafted_list = user_data.get("crafted", [])
         crafted_items = {entry["item"] for entry in crafted_list if isinstance(entry, dict)}
-        eligible = [item for item in TURNIN_ELIGIBLE if stash_counter.get(item, 0) > 0 and item in crafted_items]
+        eligible = [item for item in TURNIN_ELIGIBLE if item in stash and item in crafted_items]
 
         if not eligible:
             return await interaction.response.send_message("❌ No eligible crafted items to turn in. Use `/craft` first.", ephemeral=True)
@@ -194,7 +196,7 @@ class TurnIn(commands.Cog):
             color=0x3498DB
         )
 
-        view = discord.ui.View(timeout=86400)
+        view = WarlabView(timeout=86400)
         for item in eligible[:10]:
             view.add_item(TurnInButton(item, user_id))
 
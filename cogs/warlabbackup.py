@@ -3,9 +3,11 @@ from discord.ext import commands
 from discord import app_commands
 import os
 import json
-from utils.fileIO import load_file
+from utils.profileManager import load_all_profiles
+from utils.logPipeline import get_logger
+
+log = get_logger("warlabbackup")
 
-USER_DATA = "data/user_profiles.json"
 WARLAB_CHANNEL_ID = 1382187883590455296     # Warlab channel
 BACKUP_CHANNEL_ID = 1389706195102728322     # Secure archive channel
 
@@ -17,7 +19,7 @@ class WarlabBackup(commands.Cog):
     @app_commands.guilds(discord.Object(id=1166441420643639348))  # Server ID
     @app_commands.checks.has_permissions(administrator=True)
     async def warlabbackup(self, interaction: discord.Interaction):
-        print(f"📦 [warlabbackup] Called by {interaction.user} ({interaction.user.id})")
+        log.debug("📦 [warlabbackup] Called by %s (%s)", interaction.user, interaction.user.id)
 
         # Channel restriction
         if interaction.channel_id != WARLAB_CHANNEL_ID:
@@ -29,7 +31,7 @@ class WarlabBackup(commands.Cog):
 
         try:
             # Load player data
-            profiles = await load_file(USER_DATA) or {}
+            profiles = await load_all_profiles()
 
             # Ensure /mnt/data exists
             backup_dir = "/mnt/data"
@@ -38,7 +40,7 @@ class WarlabBackup(commands.Cog):
             # Save to temp file
             backup_path = os.path.join(backup_dir, "user_profiles_backup.json")
             with open(backup_path, "w", encoding="utf-8") as f:
-                json.dump(profiles, f, indent=2)
+                json.dump({uid: p.to_dict() for uid, p in profiles.items()}, f, indent=2)
 
             # Upload to archive
             backup_channel = self.bot.get_channel(BACKUP_CHANNEL_ID)
@@ -48,13 +50,13 @@ class WarlabBackup(commands.Cog):
                     file=discord.File(backup_path)
                 )
                 await interaction.followup.send("✅ Backup completed and sent to the archive channel.", ephemeral=True)
-                print("✅ [warlabbackup] Backup sent successfully.")
+                log.debug("✅ [warlabbackup] Backup sent successfully.")
             else:
                 await interaction.followup.send("❌ Backup channel not found.", ephemeral=True)
-                print(f"❌ [warlabbackup] Could not find channel ID: {BACKUP_CHANNEL_ID}")
+                log.debug("❌ [warlabbackup] Could not find channel ID: %s", BACKUP_CHANNEL_ID)
 
         except Exception as e:
-            print(f"❌ [warlabbackup] Backup failed: {e}")
+            log.error("❌ [warlabbackup] Backup failed: %s", e)
             await interaction.followup.send("❌ Backup failed. Check logs for details.", ephemeral=True)
 
 async def setup(bot):
@@ -4,9 +4,11 @@ from discord import app_commands
 import asyncio
 import os
 import time
-from utils.fileIO import load_file, save_file
+from utils.profileManager import list_profile_ids, profile_transaction
+from utils.logPipeline import get_logger
+
+log = get_logger("warlabnuke")
 
-USER_DATA = "data/user_profiles.json"
 WARLAB_CHANNEL_ID = 1382187883590455296
 
 class ConfirmButton(discord.ui.View):
@@ -32,7 +34,7 @@ class WarlabNuke(commands.Cog):
     @app_commands.guilds(discord.Object(id=1166441420643639348))
     @app_commands.checks.has_permissions(administrator=True)
     async def warlabnuke(self, interaction: discord.Interaction):
-        print(f"☢️ [warlabnuke] Called by {interaction.user} ({interaction.user.id})")
+        log.debug("☢️ [warlabnuke] Called by %s (%s)", interaction.user, interaction.user.id)
 
         if interaction.channel_id != WARLAB_CHANNEL_ID:
             return await interaction.response.send_message(
@@ -53,33 +55,35 @@ class WarlabNuke(commands.Cog):
             return await interaction.followup.send("⌛ Nuke cancelled — no confirmation received.", ephemeral=True)
 
         try:
-            data = await load_file(USER_DATA) or {}
-            wiped = {}
-
-            for uid, profile in data.items():
-                wiped[uid] = {
-                    "username": profile.get("username", "[unknown]"),
-                    "coins": 0,
-                    "materials": {},
-                    "blueprints": [],
-                    "tools": [],
-                    "prestige": 0,
-                    "rank_level": 0,
-                    "builds_completed": 0,
-                    "turnins": 0,
-                    "boosts": {},
-                    "reinforcements": {},
-                    "task_status": "not_started",
-                    "baseImage": profile.get("baseImage", "base_house.png"),
-                    "created": profile.get("created", str(int(time.time())))
-                }
+            for uid in await list_profile_ids():
+                async with profile_transaction(uid) as profile:
+                    if not profile:
+                        continue
+                    wiped = {
+                        "username": profile.get("username", "[unknown]"),
+                        "coins": 0,
+                        "materials": {},
+                        "blueprints": [],
+                        "tools": [],
+                        "prestige": 0,
+                        "rank_level": 0,
+                        "builds_completed": 0,
+                        "turnins": 0,
+                        "boosts": {},
+                        "reinforcements": {},
+                        "task_status": "not_started",
+                        "baseImage": profile.get("baseImage", "base_house.png"),
+                        "created": profile.get("created", str(int(time.time())))
+                    }
+                    # Swap contents in place so the transaction saves the wiped profile
+                    profile.clear()
+                    profile.update(wiped)
 
-            await save_file(USER_DATA, wiped)
-            print("✅ [warlabnuke] All profiles reset but structure preserved.")
+            log.debug("✅ [warlabnuke] All profiles reset but structure preserved.")
             await interaction.followup.send("💥 All player data wiped. Structure preserved. Ready to continue.", ephemeral=True)
 
         except Exception as e:
-            print(f"❌ [warlabnuke] Failed: {e}")
+            log.error("❌ [warlabnuke] Failed: %s", e)
             await interaction.followup.send("❌ Wipe failed — see logs for details.", ephemeral=True)
 
 async def setup(bot):
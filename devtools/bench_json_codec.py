@@ -0,0 +1,104 @@
+# devtools/bench_json_codec.py — How long one storage body blocks the event loop: stdlib json vs utils/jsonCodec
+#
+#   python devtools/bench_json_codec.py [--profiles 1 200 4000]
+#
+# For each document size, runs every decode/encode variant on a live event loop
+# while a 1 ms ticker measures the longest stall it saw. "total" is the call's
+# wall time, "worst stall" how long every other coroutine had to wait at once
+# (medians of 7 runs).
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devtools.bench_storage_save import synthetic_profiles
+from utils import jsonCodec
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+async def measure(work) -> tuple:
+    """(total ms, worst loop stall ms) for awaiting work()."""
+    stop, lags = asyncio.Event(), [0.0]
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0.005)
+    lags[:] = [0.0]
+    started = time.perf_counter()
+    await work()
+    total = time.perf_counter() - started
+    await asyncio.sleep(0.005)
+    stop.set()
+    await ticker
+    return total * 1000, max(lags) * 1000
+
+def variants(doc, body):
+    async def stdlib_loads():
+        json.loads(body)
+
+    async def stdlib_loads_thread():
+        await asyncio.to_thread(json.loads, body)
+
+    async def codec_decode():
+        jsonCodec.decode(body)
+
+    async def codec_decode_thread():
+        await asyncio.to_thread(jsonCodec.decode, body)
+
+    async def legacy_dumps():
+        json.dumps(doc, indent=2).encode("utf-8")
+
+    async def stdlib_iterencode():  # the previous streamed upload body
+        pending, size = [], 0
+        for piece in json.JSONEncoder(separators=(",", ":")).iterencode(doc):
+            pending.append(piece)
+            size += len(piece)
+            if size >= 64 * 1024:
+                "".join(pending).encode("utf-8")
+                pending, size = [], 0
+                await asyncio.sleep(0)
+        "".join(pending).encode("utf-8")
+
+    async def codec_chunks():
+        async for _ in jsonCodec.encode_chunks(doc, 64 * 1024):
+            pass
+
+    return [
+        ("decode", "json.loads", stdlib_loads),
+        ("decode", "json.loads in thread", stdlib_loads_thread),
+        ("decode", f"codec ({jsonCodec.CODEC})", codec_decode),
+        ("decode", "codec in thread", codec_decode_thread),
+        ("encode", "json.dumps indent=2", legacy_dumps),
+        ("encode", "json iterencode 64K", stdlib_iterencode),
+        ("encode", f"codec chunks ({jsonCodec.CODEC})", codec_chunks),
+    ]
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, nargs="+", default=[1, 200, 4000])
+    args = parser.parse_args()
+
+    for count in args.profiles:
+        doc = synthetic_profiles(count)
+        if count == 1:
+            doc = next(iter(doc.values()))  # one profile shard, not a map of one
+        body = json.dumps(doc).encode("utf-8")
+        print(f"\n{count} profile(s), {len(body) / 1024:,.0f} KiB")
+        print(f"  {'':<6} {'variant':<24} {'total ms':>9} {'worst stall ms':>15}")
+        for op, name, work in variants(doc, body):
+            runs = [await measure(work) for _ in range(7)]
+            total = statistics.median(r[0] for r in runs)
+            stall = statistics.median(r[1] for r in runs)
+            print(f"  {op:<6} {name:<24} {total:>9.2f} {stall:>15.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+# devtools/bench_logging.py — Event-loop time spent logging: legacy print() vs the queued pipeline
+#
+#   python devtools/bench_logging.py [--commands 5000]
+#
+# Replays the log traffic of N commands (one profile load + one save each, as
+# the storage stack logs them) on an event loop, once per mode, each in a fresh
+# unbuffered child process whose stdout is a file — like a container log driver.
+# Reports the time the loop itself spent, which is what every other command
+# waits behind; the listener thread's writing is off the loop.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    "no logging":   {},
+    "print":        {},
+    "queue":        {"LOG_LEVEL": "INFO", "LOG_FORMAT": "text"},
+    "queue-prod":   {"WARLAB_ENV": "production"},
+    "queue-debug":  {"LOG_LEVEL": "DEBUG", "LOG_FORMAT": "text"},
+}
+
+def _profile(uid: int) -> dict:
+    from devtools.bench_storage_save import synthetic_profiles
+    return next(iter(synthetic_profiles(uid + 1).values()))
+
+async def bare_command(uid: str, path: str, url: str, profile: dict):
+    """The command without any logging — the loop's fixed cost, subtracted from every mode."""
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+async def legacy_command(uid: str, path: str, url: str, profile: dict):
+    """The lines the pre-pipeline code printed for one load + save."""
+    print(f"🟢 /scavenge by player#{uid} ({uid})")
+    print(f"📡 [fileIO] Requesting remote load for: {path}")
+    print(f"📥 [storageClient] Loading file from: {url}")
+    print(f"📦 [storageClient] Loaded content type: application/json")
+    print(f"✅ [storageClient] JSON load success: {path}")
+    print(f"✅ [fileIO] Successfully loaded: {path}")
+    await asyncio.sleep(0)
+    json_data = json.dumps(profile, indent=2)
+    print(f"📡 [fileIO] Requesting remote save for: {path}")
+    print(f"📤 [storageClient] Save requested: {path}")
+    print(f"📝 [storageClient] Data preview: {json_data[:300]}...")
+    print(f"✅ [storageClient] Save successful: {path}")
+    print(f"✅ [fileIO] Successfully saved: {path}")
+    await asyncio.sleep(0)
+
+async def pipeline_command(uid: str, path: str, url: str, profile: dict):
+    """The same traffic through utils/logPipeline at the levels the modules now use."""
+    from utils.logPipeline import get_logger, payload_preview
+    bot, fio, sc = get_logger("bot"), get_logger("fileIO"), get_logger("storageClient")
+    bot.info("🟢 /%s by %s (%s)", "scavenge", f"player#{uid}", uid)
+    fio.debug("📡 Requesting remote load for: %s", path)
+    sc.debug("📥 Loading file from: %s", url)
+    sc.debug("📦 Loaded content type: %s", "application/json")
+    sc.debug("✅ JSON load success: %s", path)
+    await asyncio.sleep(0)
+    fio.debug("📡 Requesting remote save for: %s", path)
+    sc.debug("📤 Save requested: %s", path)
+    if sc.isEnabledFor(logging.DEBUG) and (preview := payload_preview(profile)):
+        sc.debug("🧾 %s preview: %s", path, preview)
+    sc.debug("✅ Save successful: %s (%d bytes sent%s)", path, 2048, "")
+    await asyncio.sleep(0)
+
+async def child(mode: str, commands: int):
+    from utils.logPipeline import setup_logging, shutdown_logging
+    if mode.startswith("queue"):
+        setup_logging()
+    run = {"no logging": bare_command, "print": legacy_command}.get(mode, pipeline_command)
+    profiles = [_profile(i) for i in range(50)]
+
+    loop_time = 0.0
+    for i in range(commands):
+        uid = str(100000000000000000 + i)
+        path = f"data/profiles/{uid}.json"
+        start = time.perf_counter()
+        await run(uid, path, f"https://storage.example/{path}", profiles[i % len(profiles)])
+        loop_time += time.perf_counter() - start
+
+    drain = time.perf_counter()
+    shutdown_logging()
+    drain = time.perf_counter() - drain
+    sys.stderr.write(json.dumps({"mode": mode, "loop_seconds": loop_time, "drain_seconds": drain}) + "\n")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=5000)
+    parser.add_argument("--child", choices=list(MODES))
+    args = parser.parse_args()
+
+    if args.child:
+        await child(args.child, args.commands)
+        return
+
+    print(f"{args.commands} commands (1 load + 1 save each), stdout → file, unbuffered\n")
+    print(f"{'mode':<12} {'loop ms':>9} {'logging µs/command':>19} {'lines':>8} {'log MB':>8}")
+    bare = legacy = None
+    for mode, env in MODES.items():
+        with tempfile.TemporaryFile() as sink:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-u", os.path.abspath(__file__), "--child", mode,
+                "--commands", str(args.commands), stdout=sink, stderr=asyncio.subprocess.PIPE, cwd=ROOT,
+                env={**os.environ, "PYTHONUNBUFFERED": "1", **env},
+            )
+            _, err = await proc.communicate()
+            result = json.loads(err.decode().strip().splitlines()[-1])
+            size = sink.seek(0, os.SEEK_END)
+            sink.seek(0)
+            lines = sum(1 for _ in sink)
+        loop_ms = result["loop_seconds"] * 1000
+        bare = loop_ms if bare is None else bare
+        spent = (loop_ms - bare) * 1000 / args.commands
+        legacy = spent if mode == "print" else legacy
+        versus = ""
+        if legacy is not None and mode.startswith("queue"):
+            # Signed: negative means the pipeline kept the loop busier than print() did
+            versus = f"  ({legacy - spent:+.1f} µs/command saved vs print"
+            versus += f", {spent / legacy:.2f}× print's cost)" if legacy > 0 else ")"
+        print(f"{mode:<12} {loop_ms:>9.1f} {spent:>19.1f} {lines:>8,} {size / 1e6:>8.2f}{versus}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
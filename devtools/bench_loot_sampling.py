@@ -0,0 +1,128 @@
+# devtools/bench_loot_sampling.py — Cost of the loot rolls behind /scavenge and /rollblueprint
+#
+#   python devtools/bench_loot_sampling.py [--rounds 20000]
+#
+# Replays each command's roll against the real catalog in data/: the legacy
+# way (rebuild the pool, then weighted_choice() expanding every entry into
+# `weight` copies per draw) and through the catalog's precompiled alias
+# samplers with an exclusion mask for what the player already owns.
+#
+# A second table asks for k distinct items from the loot pool as k grows
+# towards the whole pool: draw-and-discard-duplicates (the old 15-attempt
+# scavenge loop, and the same loop run until it has k) against the one-pass
+# sample_unique(). It reports µs per pull and how often the capped loop came
+# up short.
+
+import os
+import sys
+import time
+import random
+import argparse
+from collections.abc import Mapping
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devtools.bench_profile_memory import load_catalog
+
+def legacy_weighted_choice(loot_list, rarity_weights):
+    weighted_items = []
+    for entry in loot_list:
+        weighted_items.extend([entry] * rarity_weights.get(entry["rarity"], 0))
+    return random.choice(weighted_items) if weighted_items else None
+
+def scavenge_legacy(catalog, owned_blueprints, pulls=5, max_attempts=15):
+    loot_pool = []
+    for name, data in catalog.items_master.items():
+        if not isinstance(data, Mapping) or "rarity" not in data:
+            continue
+        if data.get("type") == "crafted" and f"{name} Blueprint" in owned_blueprints:
+            continue
+        loot_pool.append({"item": name, "rarity": data["rarity"]})
+    found, attempts = [], 0
+    while len(found) < pulls and attempts < max_attempts:
+        item = legacy_weighted_choice(loot_pool, catalog.rarity_weights)
+        if item["item"] not in found:
+            found.append(item["item"])
+        attempts += 1
+    return found
+
+def scavenge_alias(catalog, owned_blueprints, pulls=5):
+    sampler = catalog.loot_sampler
+    owned = sampler.mask(n for n in catalog.items_by_type.get("crafted", ()) if f"{n} Blueprint" in owned_blueprints)
+    return [item["item"] for item in sampler.sample_unique(pulls, exclude=owned)]
+
+def roll_legacy(catalog, owned_blueprints):
+    all_items = []
+    for pool in (catalog.recipes, catalog.armor, catalog.explosives):
+        for key, entry in pool.items():
+            produced = entry.get("produces")
+            if produced and f"{produced} Blueprint" not in owned_blueprints:
+                all_items.append({"item": f"{produced} Blueprint", "source_key": key,
+                                  "rarity": entry.get("rarity", "Common")})
+    return legacy_weighted_choice(all_items, catalog.rarity_weights)
+
+def roll_alias(catalog, owned_blueprints):
+    sampler = catalog.blueprint_sampler
+    return sampler.draw(exclude=sampler.mask(owned_blueprints))
+
+def dedupe_capped(sampler, k, max_attempts=15):
+    found = []
+    for item in sampler.sample(max_attempts):
+        if len(found) >= k:
+            break
+        if item not in found:
+            found.append(item)
+    return found
+
+def dedupe_until(sampler, k):
+    found = set()
+    while len(found) < k:
+        found.add(sampler.draw()["item"])
+    return found
+
+def saturation(sampler, rounds):
+    print(f"\n  {'k of ' + str(len(sampler)):<10} {'capped µs/pull':>15} {'short':>6} {'until-k µs/pull':>16} {'unique µs/pull':>15}")
+    for k in sorted({2, 5, 7, len(sampler) // 4, len(sampler) // 2, 3 * len(sampler) // 4, len(sampler)}):
+        reps = max(rounds // k, 50)
+        started = time.perf_counter()
+        short = sum(len(dedupe_capped(sampler, k)) < k for _ in range(reps))
+        capped = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(max(reps // 20, 5)):  # the tail of the last few pulls dominates; fewer reps
+            dedupe_until(sampler, k)
+        until = (time.perf_counter() - started) / max(reps // 20, 5)
+        started = time.perf_counter()
+        for _ in range(reps):
+            sampler.sample_unique(k)
+        unique = (time.perf_counter() - started) / reps
+        print(f"  {k:<10} {capped * 1e6 / reps / k:>15.2f} {100 * short / reps:>5.0f}% "
+              f"{until * 1e6 / k:>16.2f} {unique * 1e6 / k:>15.2f}")
+
+def bench(fn, catalog, players, rounds) -> float:
+    started = time.perf_counter()
+    for i in range(rounds):
+        fn(catalog, players[i % len(players)])
+    return (time.perf_counter() - started) * 1e6 / rounds
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+    rng = random.Random(24)
+    blueprints = [e["item"] for e in catalog.blueprint_sampler.entries]
+    players = [set(rng.sample(blueprints, rng.randint(0, len(blueprints) - 1))) for _ in range(500)]
+
+    print(f"{len(catalog.loot_sampler)} loot entries, {len(blueprints)} blueprints, "
+          f"{args.rounds:,} rolls over {len(players)} players\n")
+    print(f"  {'roll':<16} {'legacy µs':>10} {'alias µs':>10}")
+    for name, legacy, alias in (("scavenge", scavenge_legacy, scavenge_alias),
+                                ("rollblueprint", roll_legacy, roll_alias)):
+        before, after = bench(legacy, catalog, players, args.rounds), bench(alias, catalog, players, args.rounds)
+        print(f"  {name:<16} {before:>10.1f} {after:>10.1f}   ({before / after:.0f}x)")
+    saturation(catalog.loot_sampler, args.rounds)
+
+if __name__ == "__main__":
+    main()
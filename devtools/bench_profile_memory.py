@@ -0,0 +1,103 @@
+# devtools/bench_profile_memory.py — Memory held by cached profiles: as decoded vs. compacted item names
+#
+#   python devtools/bench_profile_memory.py [--profiles 10000]
+#
+# Builds N synthetic profiles from the real catalog names in data/ (stash,
+# blueprints, crafted entries, crafted_log), encodes each one as its own shard,
+# then decodes them all the way the cache does — once as-is and once passed
+# through utils/itemDictionary.compact() — and reports the Python heap each
+# set occupies (tracemalloc). compact() is also the cache's copier, so its cost
+# is shown next to the copy.deepcopy() it replaces.
+
+import os
+import sys
+import json
+import copy
+import time
+import random
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("STORAGE_BACKEND", "memory")  # utils.catalog pulls in the storage stack; nothing is stored
+
+from utils import jsonCodec, itemDictionary
+from utils.catalog import Catalog, CATALOG_FILES
+
+def load_catalog() -> Catalog:
+    raw = {}
+    for name, path in CATALOG_FILES.items():
+        try:
+            with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+                raw[name] = json.load(f)
+        except FileNotFoundError:
+            raw[name] = {}
+    return Catalog(raw)
+
+def synthetic_shards(catalog: Catalog, count: int) -> list:
+    rng = random.Random(22)
+    parts = list(catalog.items_master) + list(catalog.car_parts)
+    crafted = list(catalog.produces)
+    shards = []
+    for uid in range(count):
+        made = [rng.choice(crafted) for _ in range(rng.randint(0, 12))]
+        profile = {
+            "schema": 2,
+            "username": f"player{uid}",
+            "coins": rng.randint(0, 5000),
+            "stash": {item: rng.randint(1, 9) for item in rng.sample(parts, rng.randint(5, 40))},
+            "blueprints": [f"{item} Blueprint" for item in rng.sample(crafted, rng.randint(0, len(crafted)))],
+            "labskins": rng.sample(list(catalog.labskins), rng.randint(0, len(catalog.labskins))),
+            "crafted": [{"item": item, "optional": []} for item in made],
+            "crafted_log": [rng.choice(crafted) for _ in range(rng.randint(0, 60))],
+            "reinforcements": {"Barbed Fence": rng.randint(0, 9), "Guard Dog": rng.randint(0, 1)},
+            "prestige": rng.randint(0, 6),
+            "created": str(1700000000 + uid),
+        }
+        shards.append(jsonCodec.dumps(profile))
+    return shards
+
+def held(shards, compact: bool) -> int:
+    """Heap bytes held by the decoded set."""
+    tracemalloc.start()
+    profiles = [jsonCodec.loads(body) for body in shards]
+    if compact:
+        profiles = [itemDictionary.compact(p) for p in profiles]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+def timed(shards) -> tuple:
+    """(decode, deepcopy, compact) seconds for the whole set, untraced."""
+    started = time.perf_counter()
+    profiles = [jsonCodec.loads(body) for body in shards]
+    decoded = time.perf_counter()
+    for p in profiles:
+        copy.deepcopy(p)
+    copied = time.perf_counter()
+    for p in profiles:
+        itemDictionary.compact(p)
+    return decoded - started, copied - decoded, time.perf_counter() - copied
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=10000)
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+    itemDictionary.register_catalog(catalog)
+    shards = synthetic_shards(catalog, args.profiles)
+    print(f"{args.profiles:,} profiles, {sum(map(len, shards)) / 1e6:.1f} MB of JSON, "
+          f"{len(itemDictionary._shared)} item names, codec {jsonCodec.CODEC}\n")
+
+    plain = held(shards, compact=False)
+    compacted = held(shards, compact=True)
+    decode, deep, spent = timed(shards)
+    per = 1e6 / args.profiles
+    print(f"  as decoded   {plain / 1e6:8.1f} MB   decode {decode * per:5.1f} µs/shard, deepcopy {deep * per:5.1f} µs/shard")
+    print(f"  compacted    {compacted / 1e6:8.1f} MB   ({100 * (1 - compacted / plain):.0f}% less)"
+          f"         compact copy {spent * per:5.1f} µs/shard")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# devtools/bench_stash_render.py — Per-render CPU time: legacy compositing vs. the layer atlas
+#
+#   python devtools/bench_stash_render.py [--renders 20]
+#
+# Both paths composite in memory only (no PNG encode, no render cache), and the
+# outputs are compared pixel for pixel before timing.
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageEnhance, ImageDraw, ImageFont, ImageChops
+import stash_image_generator as sig
+
+LAYOUTS_SEED = 13
+
+def legacy_compose(reinforcements, base_image_path, base_path=sig.DEFAULT_LAYERS_DIR):
+    """The compositing loop as it was before the atlas: decode, convert, brighten and draw per call."""
+    base = Image.open(base_image_path).convert("RGBA")
+    base_size = base.size
+    try:
+        font = ImageFont.truetype(sig.BADGE_FONT_PATH, sig.BADGE_FONT_SIZE)
+    except Exception:
+        font = ImageFont.load_default()
+
+    for key, filename in sig.LAYER_FILES.items():
+        count = reinforcements.get(key.replace("_", " ").title(), 0)
+        if count == 0:
+            continue
+        layer_path = os.path.join(base_path, filename)
+        if not os.path.exists(layer_path):
+            continue
+        overlay = Image.open(layer_path).convert("RGBA")
+        if overlay.size != base_size:
+            overlay = overlay.resize(base_size)
+        base.alpha_composite(ImageEnhance.Brightness(overlay).enhance(1.15))
+        if count > 1:
+            badge_img = Image.new("RGBA", base_size, (0, 0, 0, 0))
+            position = (base_size[0] - 60, 10 + list(sig.LAYER_FILES.keys()).index(key) * 40)
+            ImageDraw.Draw(badge_img).text(position, f"x{count}", fill=(255, 255, 0, 255), font=font)
+            base.alpha_composite(badge_img)
+    return base
+
+def random_layouts(n):
+    rng = random.Random(LAYOUTS_SEED)
+    bases = sorted(
+        os.path.join(sig.DEFAULT_LAYERS_DIR, f)
+        for f in os.listdir(sig.DEFAULT_LAYERS_DIR) if f.lower().startswith("base_house")
+    )
+    names = [k.replace("_", " ").title() for k in sig.LAYER_FILES]
+    return [
+        ({name: rng.randint(0, 3) for name in names}, rng.choice(bases))
+        for _ in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--renders", type=int, default=20)
+    args = parser.parse_args()
+
+    layouts = random_layouts(args.renders)
+
+    t0 = time.process_time()
+    sig.get_atlas()
+    atlas_build = time.process_time() - t0
+
+    for reinforcements, base in layouts[:5]:
+        diff = ImageChops.difference(legacy_compose(reinforcements, base), sig.compose_stash(reinforcements, base))
+        if diff.getbbox() is not None:
+            sys.exit(f"❌ Output mismatch for {reinforcements} on {base}")
+    print("✅ Atlas output is pixel-identical to the legacy path")
+
+    def timed(fn):
+        start = time.process_time()
+        for reinforcements, base in layouts:
+            fn(reinforcements, base)
+        return (time.process_time() - start) / len(layouts)
+
+    legacy = timed(legacy_compose)
+    atlas = timed(sig.compose_stash)
+
+    print(f"🗂️ Atlas build (one-off): {atlas_build * 1000:.0f} ms")
+    print(f"🐢 Legacy compositing:    {legacy * 1000:.1f} ms CPU / render")
+    print(f"⚡ Atlas compositing:     {atlas * 1000:.1f} ms CPU / render")
+    print(f"📈 Speed-up: {legacy / atlas:.1f}x over {len(layouts)} renders")
+
+if __name__ == "__main__":
+    main()
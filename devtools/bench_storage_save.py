@@ -0,0 +1,133 @@
+# devtools/bench_storage_save.py — Peak RSS and upload bytes per save: legacy PUT vs. streamed JSON
+#
+#   python devtools/bench_storage_save.py [--profiles 4000]
+#
+# Starts the storage stub in this process, then saves one large document (a
+# legacy-style user_profiles.json blob) from a fresh child process per mode so
+# each peak-RSS reading starts from the same baseline.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ("legacy", "stream", "stream+gzip")
+
+def synthetic_profiles(count: int) -> dict:
+    items = [f"Item {i:03d}" for i in range(300)]
+    return {
+        str(100000000000000000 + uid): {
+            "username": f"player{uid}",
+            "coins": uid * 7 % 5000,
+            "materials": {f"Material {m}": (uid + m) % 40 for m in range(25)},
+            "blueprints": [f"Blueprint {b}" for b in range(uid % 15)],
+            "tools": [f"Tool {t}" for t in range(uid % 6)],
+            "stash": [items[(uid * 31 + s) % len(items)] for s in range(60)],
+            "reinforcements": {"Barbed Fence": uid % 3, "Guard Dog": uid % 2},
+            "prestige": uid % 7,
+            "builds_completed": uid % 90,
+            "created": str(1700000000 + uid),
+        }
+        for uid in range(count)
+    }
+
+class RssSampler:
+    """Polls resident set size (Linux /proc) every millisecond and keeps the peak."""
+
+    def __init__(self):
+        self.peak = self.baseline = self.current()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    @staticmethod
+    def current() -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            time.sleep(0.001)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+async def _legacy_save(url, data):
+    """The save path as it was: indented dump, 300-char preview, one-shot PUT."""
+    import utils.storageClient as sc
+    json_data = json.dumps(data, indent=2)
+    preview = json_data[:300]
+    session = await sc._get_session()
+    async with session.put(url, data=json_data, headers={"Content-Type": "application/json"}) as resp:
+        assert resp.status == 200, resp.status
+    return len(json_data.encode("utf-8"))
+
+async def child(mode: str, base_url: str, count: int):
+    os.environ["PERSISTENT_DATA_URL"] = base_url
+    os.environ["STORAGE_UPLOAD_GZIP"] = "on" if mode == "stream+gzip" else "off"
+    import utils.storageClient as sc
+
+    data = synthetic_profiles(count)
+    session = await sc._get_session()
+    async with session.get(f"{base_url}/warmup.json"):
+        pass  # open the connection outside the measurement
+
+    with RssSampler() as rss:
+        if mode == "legacy":
+            sent = await _legacy_save(f"{base_url}/bench.json", data)
+        else:
+            ok, _ = await sc.save_file_versioned("bench.json", data)
+            assert ok
+            sent = sc.UPLOAD_STATS["sent_bytes"]
+    await session.close()
+    print(json.dumps({"mode": mode, "sent_bytes": sent, "peak_rss_delta": rss.peak - rss.baseline}))
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=4000)
+    parser.add_argument("--child", choices=MODES)
+    parser.add_argument("--url")
+    args = parser.parse_args()
+
+    if args.child:
+        await child(args.child, args.url, args.profiles)
+        return
+
+    from aiohttp import web
+    from devtools.storageStub import make_app
+
+    runner = web.AppRunner(make_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}"
+
+    doc_bytes = len(json.dumps(synthetic_profiles(args.profiles), indent=2).encode("utf-8"))
+    print(f"Document: {args.profiles} profiles, {doc_bytes / 1e6:.1f} MB as indented JSON\n")
+    print(f"{'mode':<12} {'upload bytes':>14} {'peak RSS Δ':>12}")
+    for mode in MODES:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "--child", mode, "--url", url,
+            "--profiles", str(args.profiles), stdout=asyncio.subprocess.PIPE, cwd=ROOT,
+        )
+        out, _ = await proc.communicate()
+        result = json.loads(out.decode().strip().splitlines()[-1])
+        print(f"{mode:<12} {result['sent_bytes']:>14,} {result['peak_rss_delta'] / 1e6:>9.1f} MB")
+
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+# devtools/storageStub.py — Local stand-in for the remote persistent storage server
+#
+# Speaks the same protocol the bot uses (GET / PUT /<path>) plus ETag versioning:
+#   • every response carries an ETag (hash of the stored body)
+#   • PUT with If-Match only succeeds if the file is still at that version (else 412)
+#   • PUT with If-None-Match: * only succeeds if the file does not exist yet
+#   • gzip request bodies (Content-Encoding: gzip) are accepted and advertised
+#     via Accept-Encoding on every response; --no-gzip answers them with 415
+#   • PATCH with an RFC 6902 JSON Patch (application/json-patch+json) edits a
+#     JSON file in place, advertised via Accept-Patch; --no-patch answers 405
+#   • GET honours If-None-Match / If-Modified-Since (304), sends Last-Modified,
+#     and compresses bodies for clients that send Accept-Encoding: gzip/deflate
+#   • POST /_batch takes {"get": [{"path", "etag"?}]} or {"put": {path: data}} and
+#     answers {"files": {path: {"status", "etag", "body"?}}}, advertised via
+#     X-Batch-Endpoint; --no-batch leaves it out (clients fall back to parallel requests)
+#   • DELETE /<path> removes a file (204, or 404 if there was none)
+#
+# Run it and point the bot at it:
+#   python devtools/storageStub.py --port 8787 --root .storage
+#   PERSISTENT_DATA_URL=http://127.0.0.1:8787 python bot.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import hashlib
+from aiohttp import web
+from email.utils import formatdate, parsedate_to_datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.jsonPatch import apply_patch, PatchError
+
+JSON_PATCH_TYPE = "application/json-patch+json"
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+class StubStore:
+    """In-memory file store, optionally mirrored to a directory on disk."""
+
+    def __init__(self, root=None):
+        self.root = root
+        self.files = {}
+        self.modified = {}  # path -> unix time of the last write (whole seconds, as HTTP dates are)
+        if root:
+            for dirpath, _, names in os.walk(root):
+                for name in names:
+                    full = os.path.join(dirpath, name)
+                    rel = os.path.relpath(full, root).replace(os.sep, "/")
+                    with open(full, "rb") as f:
+                        self.files[rel] = f.read()
+                    self.modified[rel] = int(os.path.getmtime(full))
+
+    def get(self, path):
+        return self.files.get(path)
+
+    def delete(self, path) -> bool:
+        if self.files.pop(path, None) is None:
+            return False
+        self.modified.pop(path, None)
+        if self.root:
+            os.remove(os.path.join(self.root, path))
+        return True
+
+    def put(self, path, body: bytes):
+        self.files[path] = body
+        self.modified[path] = int(time.time())
+        if self.root:
+            full = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            tmp = full + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, full)
+
+def make_app(store: StubStore = None, accept_gzip: bool = True, accept_patch: bool = True,
+             batch: bool = True) -> web.Application:
+    store = store or StubStore()
+    app = web.Application(client_max_size=256 * 1024 * 1024)  # legacy blobs run to several MB
+    app["store"] = store
+    app["stats"] = {"gets": 0, "not_modified": 0, "batches": 0}
+    advertised = "gzip" if accept_gzip else "identity"
+
+    @web.middleware
+    async def advertise_encoding(request, handler):
+        response = await handler(request)
+        response.headers["Accept-Encoding"] = advertised
+        if accept_patch:
+            response.headers["Accept-Patch"] = JSON_PATCH_TYPE
+        if batch:
+            response.headers["X-Batch-Endpoint"] = "/_batch"
+        return response
+
+    app.middlewares.append(advertise_encoding)
+
+    async def handle_get(request):
+        path = request.match_info["path"]
+        body = store.get(path)
+        if body is None:
+            return web.Response(status=404, text=f"Not found: {path}")
+        app["stats"]["gets"] += 1
+        headers = {"ETag": make_etag(body), "Last-Modified": formatdate(store.modified[path], usegmt=True)}
+
+        # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110 §13.2.2)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            unchanged = headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]
+        else:
+            try:
+                since = parsedate_to_datetime(request.headers["If-Modified-Since"]).timestamp()
+                unchanged = store.modified[path] <= since
+            except (KeyError, TypeError, ValueError):
+                unchanged = False
+        if unchanged:
+            app["stats"]["not_modified"] += 1
+            return web.Response(status=304, headers=headers)
+
+        response = web.Response(body=body, content_type="application/json", headers=headers)
+        response.enable_compression()  # gzip/deflate per the client's Accept-Encoding
+        return response
+
+    async def handle_put(request):
+        path = request.match_info["path"]
+        current = store.get(path)
+
+        if_match = request.headers.get("If-Match")
+        if if_match and (current is None or (if_match != "*" and if_match != make_etag(current))):
+            return web.Response(status=412, text="Version mismatch")
+        if request.headers.get("If-None-Match") == "*" and current is not None:
+            return web.Response(status=412, text="Already exists")
+
+        encoding = request.headers.get("Content-Encoding", "identity").lower()
+        if encoding not in ("identity", "gzip") or (encoding == "gzip" and not accept_gzip):
+            return web.Response(status=415, text=f"Unsupported Content-Encoding: {encoding}")
+
+        body = await request.read()  # aiohttp inflates gzip bodies for us
+        store.put(path, body)
+        return web.Response(status=200, text="OK", headers={"ETag": make_etag(body)})
+
+    async def handle_patch(request):
+        path = request.match_info["path"]
+        if not accept_patch:
+            return web.Response(status=405, text="PATCH not supported")
+        if request.content_type != JSON_PATCH_TYPE:
+            return web.Response(status=415, text=f"Unsupported patch type: {request.content_type}")
+
+        current = store.get(path)
+        if current is None:
+            return web.Response(status=404, text=f"Not found: {path}")
+        if_match = request.headers.get("If-Match")
+        if if_match and if_match != "*" and if_match != make_etag(current):
+            return web.Response(status=412, text="Version mismatch")
+
+        try:
+            patched = apply_patch(json.loads(current), await request.json())
+        except (PatchError, KeyError, ValueError) as e:
+            return web.Response(status=422, text=f"Patch failed: {e}")
+
+        body = json.dumps(patched, separators=(",", ":")).encode("utf-8")
+        store.put(path, body)
+        return web.Response(status=200, text="OK", headers={"ETag": make_etag(body)})
+
+    async def handle_delete(request):
+        path = request.match_info["path"]
+        if not store.delete(path):
+            return web.Response(status=404, text=f"Not found: {path}")
+        return web.Response(status=204)
+
+    async def handle_batch(request):
+        payload = await request.json()
+        app["stats"]["batches"] += 1
+        files = {}
+        for item in payload.get("get", []):
+            path = item["path"]
+            body = store.get(path)
+            if body is None:
+                files[path] = {"status": 404}
+            elif item.get("etag") == make_etag(body):
+                files[path] = {"status": 304, "etag": make_etag(body)}
+            else:
+                files[path] = {
+                    "status": 200, "etag": make_etag(body), "body": body.decode("utf-8"),
+                    "last_modified": formatdate(store.modified[path], usegmt=True),
+                }
+        for path, data in payload.get("put", {}).items():
+            body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            store.put(path, body)
+            files[path] = {"status": 200, "etag": make_etag(body)}
+        return web.json_response({"files": files})
+
+    if batch:
+        app.router.add_post("/_batch", handle_batch)
+    app.router.add_get("/{path:.+}", handle_get)
+    app.router.add_put("/{path:.+}", handle_put)
+    app.router.add_patch("/{path:.+}", handle_patch)
+    app.router.add_delete("/{path:.+}", handle_delete)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the bot's persistent storage server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--root", default=None, help="Directory to persist files in (default: memory only)")
+    parser.add_argument("--no-gzip", action="store_true", help="Reject gzip-encoded uploads with 415")
+    parser.add_argument("--no-patch", action="store_true", help="Answer PATCH with 405 (full PUTs only)")
+    parser.add_argument("--no-batch", action="store_true", help="Serve no /_batch endpoint")
+    args = parser.parse_args()
+
+    print(f"🗄️ [storageStub] Serving on http://{args.host}:{args.port} (root: {args.root or 'memory'})")
+    app = make_app(StubStore(args.root), accept_gzip=not args.no_gzip,
+                   accept_patch=not args.no_patch, batch=not args.no_batch)
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# raid_overlay_generator.py — Animated raid overlays composited onto stash renders
+#
+# Decoding + LANCZOS-scaling the 4K overlay GIFs costs seconds of CPU, and the
+# scaled frames only depend on (overlay file, target size). They are built once,
+# cropped to their visible box, written to OVERLAY_FRAMES_DIR (so fresh render
+# workers start warm) and kept in memory bounded by OVERLAY_CACHE_MAX_BYTES.
+# A raid phase is then a paste onto the base per frame plus the GIF encode.
+
+import os
+import gc
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageSequence, ImageFile
+
+from stash_image_generator import get_atlas
+from utils.logPipeline import get_logger
+
+log = get_logger("raid_overlay_generator")
+
+# PIL safety for partial/large files
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+OVERLAY_DIR        = "assets/overlays"
+OVERLAY_FRAMES_DIR = "generated_overlays"
+
+# --- memory-safe merge settings ---
+MAX_WORKING_WIDTH = 720   # cap working size; Discord downscales anyway
+FRAME_STEP        = 2     # sample every 2nd frame for animated overlays
+MAX_FRAMES        = 20    # hard cap frames to avoid huge RAM spikes
+OVERLAY_SCALE     = 1.10  # animated overlays are drawn slightly larger than the base
+
+# --- overlay frame cache ---
+OVERLAY_CACHE_MAX_BYTES = int(os.getenv("OVERLAY_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+_overlay_cache = OrderedDict()   # key -> (frames [(image, offset)], duration, animated, nbytes)
+_overlay_cache_bytes = 0
+_overlay_cache_lock = threading.Lock()
+_overlay_build_lock = threading.Lock()
+
+def _fit_to_width(img: Image.Image, max_w: int) -> Image.Image:
+    if img.width <= max_w:
+        return img
+    ratio = max_w / float(img.width)
+    new_size = (max_w, int(img.height * ratio))
+    return img.resize(new_size, Image.LANCZOS)
+
+def _crop_visible(img: Image.Image):
+    """Crop to the non-transparent box; pasting the rest with its own mask is a no-op."""
+    box = img.getchannel("A").getbbox()
+    return (img.crop(box), box[:2]) if box else None
+
+def _build_overlay_frames(overlay_path: str, base_size: tuple):
+    with Image.open(overlay_path) as overlay:
+        animated = getattr(overlay, "is_animated", False)
+        duration = overlay.info.get("duration", 100)
+        frames = []
+        if animated:
+            new_size = (int(base_size[0] * OVERLAY_SCALE), int(base_size[1] * OVERLAY_SCALE))
+            for idx, frame in enumerate(ImageSequence.Iterator(overlay)):
+                if idx % FRAME_STEP != 0:
+                    continue
+                frames.append(_crop_visible(frame.convert("RGBA").resize(new_size, Image.LANCZOS)))
+                if len(frames) >= MAX_FRAMES:
+                    break
+        else:
+            frames.append(_crop_visible(overlay.convert("RGBA").resize(base_size, Image.LANCZOS)))
+    nbytes = sum(f[0].width * f[0].height * 4 for f in frames if f)
+    return frames, duration, animated, nbytes
+
+def _frames_dir(key) -> str:
+    return os.path.join(OVERLAY_FRAMES_DIR, hashlib.sha1(repr(key).encode()).hexdigest())
+
+def _read_frames(key):
+    """Load pre-scaled frames written by an earlier build (any process), or None."""
+    folder = _frames_dir(key)
+    try:
+        with open(os.path.join(folder, "meta.json")) as f:
+            meta = json.load(f)
+        frames = []
+        for idx, offset in enumerate(meta["offsets"]):
+            if offset is None:
+                frames.append(None)
+                continue
+            with Image.open(os.path.join(folder, f"{idx:03d}.png")) as im:
+                frames.append((im.convert("RGBA"), tuple(offset)))
+    except (OSError, ValueError, KeyError):
+        return None
+    nbytes = sum(f[0].width * f[0].height * 4 for f in frames if f)
+    return frames, meta["duration"], meta["animated"], nbytes
+
+def _write_frames(key, entry):
+    frames, duration, animated, _ = entry
+    folder = _frames_dir(key)
+    tmp = f"{folder}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(tmp, exist_ok=True)
+        for idx, frame in enumerate(frames):
+            if frame:
+                frame[0].save(os.path.join(tmp, f"{idx:03d}.png"), compress_level=1)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"duration": duration, "animated": animated,
+                       "offsets": [list(fr[1]) if fr else None for fr in frames]}, f)
+        os.rename(tmp, folder)
+    except OSError:
+        # Another process published the same frames first (or the disk is read-only)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def get_overlay_frames(overlay_path: str, base_size: tuple):
+    """Return (frames, duration, animated) for an overlay scaled to a working-size base, cached."""
+    global _overlay_cache_bytes
+    st = os.stat(overlay_path)
+    key = (os.path.abspath(overlay_path), st.st_mtime_ns, st.st_size, base_size)
+
+    with _overlay_cache_lock:
+        entry = _overlay_cache.get(key)
+        if entry is not None:
+            _overlay_cache.move_to_end(key)
+            return entry[:3]
+
+    # One build at a time: concurrent raids on a cold cache wait instead of decoding twice
+    with _overlay_build_lock:
+        with _overlay_cache_lock:
+            entry = _overlay_cache.get(key)
+        if entry is None:
+            entry = _read_frames(key)
+            if entry is None:
+                entry = _build_overlay_frames(overlay_path, base_size)
+                _write_frames(key, entry)
+            log.debug("🎞️ Cached overlay frames: %s @ %s (%s KB)", os.path.basename(overlay_path), base_size, entry[3] // 1024)
+            with _overlay_cache_lock:
+                _overlay_cache[key] = entry
+                _overlay_cache_bytes += entry[3]
+                while _overlay_cache_bytes > OVERLAY_CACHE_MAX_BYTES and len(_overlay_cache) > 1:
+                    _, evicted = _overlay_cache.popitem(last=False)
+                    _overlay_cache_bytes -= evicted[3]
+    return entry[:3]
+
+def warm_overlay_cache():
+    """Pre-build frames for every overlay GIF at each stash base size."""
+    for size in get_atlas().base_sizes():
+        if size[0] > MAX_WORKING_WIDTH:
+            size = (MAX_WORKING_WIDTH, int(size[1] * MAX_WORKING_WIDTH / float(size[0])))
+        for name in sorted(os.listdir(OVERLAY_DIR)):
+            if name.lower().endswith(".gif"):
+                get_overlay_frames(os.path.join(OVERLAY_DIR, name), size)
+
+def merge_overlay(base_path: str, overlay_path: str, out_path: str) -> str:
+    """
+    Memory-conscious compositor:
+    - Downscales base to MAX_WORKING_WIDTH
+    - Pastes pre-scaled overlay frames from the frame cache (FRAME_STEP sampled, MAX_FRAMES capped)
+    - Ensures images are closed and memory freed after save
+    """
+    base = overlay = None
+    frames = None
+    try:
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        base = Image.open(base_path).convert("RGBA")
+        base = _fit_to_width(base, MAX_WORKING_WIDTH)
+
+        overlay_frames, duration, animated = get_overlay_frames(overlay_path, base.size)
+
+        if animated:
+            new_size = (int(base.width * OVERLAY_SCALE), int(base.height * OVERLAY_SCALE))
+            pos = ((base.width - new_size[0]) // 2, (base.height - new_size[1]) // 2)
+
+            frames = []
+            for entry in overlay_frames:
+                combined = base.copy()
+                if entry:
+                    f, (ox, oy) = entry
+                    combined.paste(f, (pos[0] + ox, pos[1] + oy), f)
+                # Convert to palette per-frame to keep memory low
+                frames.append(combined.convert("P", palette=Image.ADAPTIVE))
+
+            if not frames:
+                # fallback single frame if overlay had too few frames
+                still = base.copy().convert("P", palette=Image.ADAPTIVE)
+                frames = [still]
+            frames[0].save(
+                out_path,
+                save_all=True,
+                append_images=frames[1:],
+                loop=0,
+                duration=duration,
+                optimize=True,
+                disposal=2
+            )
+
+            # explicit cleanup
+            for f in frames:
+                try: f.close()
+                except: pass
+            del frames
+        else:
+            if overlay_frames and overlay_frames[0]:
+                ov, offset = overlay_frames[0]
+                base.paste(ov, offset, ov)
+            base.convert("RGB").save(out_path, "GIF", optimize=True)
+
+        return out_path
+    except Exception as e:
+        log.error("❌ merge_overlay failed: %s", e)
+        # fall back to base image if something goes wrong
+        try:
+            if base_path != out_path:
+                # copy base to out_path to keep downstream happy
+                Image.open(base_path).save(out_path)
+            return out_path
+        except Exception:
+            return base_path
+    finally:
+        try:
+            if overlay: overlay.close()
+        except: pass
+        try:
+            if base: base.close()
+        except: pass
+        gc.collect()
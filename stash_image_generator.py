@@ -1,8 +1,25 @@
 # stash_image_generator.py — Composite generator for Fortify UI visuals (Badge fix)
+#
+# Renders are content-addressed: the output only depends on the base image and
+# the five reinforcement counts, so the PNG is stored under a hash of those
+# inputs and reused by every player / view with the same layout. The cache
+# directory is kept under RENDER_CACHE_MAX_BYTES by evicting least-recently-used files.
+#
+# Cache misses composite from a LayerAtlas: every file in the layers directory is
+# decoded once, overlays are brightened, resized per base size and cropped to their
+# visible area, and the badge font and badge labels are kept ready, so a render
+# is a base copy plus a handful of alpha_composite calls.
 
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 from PIL import Image, ImageEnhance, ImageDraw, ImageFont
 
+from utils.logPipeline import get_logger
+
+log = get_logger("stash_image_generator")
+
 # === Default Paths ===
 DEFAULT_LAYERS_DIR = "assets/stash_layers"
 OUTPUT_DIR = "generated_stashes"
@@ -21,76 +38,256 @@ LAYER_FILES = {
 BADGE_FONT_PATH = "assets/fonts/arialbd.ttf"
 BADGE_FONT_SIZE = 26
 
-def generate_stash_image(user_id: str, reinforcements: dict, base_path: str = DEFAULT_LAYERS_DIR, baseImagePath: str = None) -> str:
-    """
-    Composites a stash image for a user based on equipped reinforcements and custom base image.
-    Returns the saved image path.
-    """
-    output_path = os.path.join(OUTPUT_DIR, f"{user_id}.png")
+# === Render Cache ===
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+RENDER_VERSION = 1  # bump when the compositing code changes so old renders are not reused
+
+_cache_lock = threading.Lock()
+_cache_index = None  # OrderedDict filename -> size, least recently used first
+_cache_bytes = 0
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
 
-    if os.path.exists(output_path):
-        os.remove(output_path)
-        print(f"♻️ Removed cached image to regenerate: {output_path}")
+def _load_cache_index():
+    """Scan OUTPUT_DIR once, oldest first, so LRU order survives restarts."""
+    global _cache_index, _cache_bytes
+    entries = []
+    for name in os.listdir(OUTPUT_DIR):
+        if not name.endswith(".png"):
+            continue
+        try:
+            st = os.stat(os.path.join(OUTPUT_DIR, name))
+        except OSError:
+            continue
+        entries.append((st.st_mtime, name, st.st_size))
+    entries.sort()
+    _cache_index = OrderedDict((name, size) for _, name, size in entries)
+    _cache_bytes = sum(_cache_index.values())
 
+def _render_key(base_image: str, base_path: str, reinforcements: dict) -> str:
+    st = os.stat(base_image)
+    counts = tuple(int(reinforcements.get(key.replace("_", " ").title(), 0) or 0) for key in LAYER_FILES)
+    raw = repr((RENDER_VERSION, os.path.abspath(base_image), st.st_mtime_ns, st.st_size,
+                os.path.abspath(base_path), counts))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def lookup_render(filename: str):
+    """Return the cached render's path (and mark it recently used), or None."""
+    path = os.path.join(OUTPUT_DIR, filename)
+    with _cache_lock:
+        if _cache_index is None:
+            _load_cache_index()
+        known = filename in _cache_index
     try:
-        # 🔍 Load base image
-        if not baseImagePath:
-            baseImagePath = os.path.join(base_path, "base_house.png")
-        if not os.path.exists(baseImagePath):
-            print("⚠️ Missing base image, falling back.")
-            baseImagePath = os.path.join(base_path, "base_house.png")
-        if not os.path.exists(baseImagePath):
-            raise FileNotFoundError(f"❌ Base image not found: {baseImagePath}")
-
-        base = Image.open(baseImagePath).convert("RGBA")
-        base_size = base.size
-        print(f"🎨 Base size: {base_size}")
-
-        # 🎨 Font for badges
+        os.utime(path)  # keep LRU order on disk for the next restart
+    except OSError:
+        with _cache_lock:
+            _cache_index.pop(filename, None)
+            _cache_stats["misses"] += 1
+        return None
+    if not known:
+        # Rendered by another process (e.g. a render worker) — adopt it
+        record_render(filename)
+    with _cache_lock:
+        if filename in _cache_index:
+            _cache_index.move_to_end(filename)
+        _cache_stats["hits"] += 1
+    return path
+
+def record_render(filename: str):
+    """Account a freshly written render and evict least-recently-used ones over budget."""
+    global _cache_bytes
+    size = os.path.getsize(os.path.join(OUTPUT_DIR, filename))
+    victims = []
+    with _cache_lock:
+        if _cache_index is None:
+            _load_cache_index()
+        if filename in _cache_index:
+            _cache_bytes -= _cache_index[filename]
+        _cache_index[filename] = size
+        _cache_bytes += size
+        while _cache_bytes > RENDER_CACHE_MAX_BYTES and len(_cache_index) > 1:
+            victim, victim_size = _cache_index.popitem(last=False)
+            _cache_bytes -= victim_size
+            _cache_stats["evictions"] += 1
+            victims.append(victim)
+    for victim in victims:
+        try:
+            os.remove(os.path.join(OUTPUT_DIR, victim))
+        except OSError:
+            pass
+
+# === Layer Atlas ===
+class LayerAtlas:
+    """Decoded, pre-processed stash layers for one layers directory. Images are shared — never mutate them."""
+
+    def __init__(self, layers_dir: str):
+        self.layers_dir = layers_dir
+        self._lock = threading.Lock()
+        self._images = {}    # path -> RGBA image
+        self._overlays = {}  # (filename, base_size) -> (cropped brightened overlay, offset) or None
+        self._badges = {}    # text -> RGBA label image
         try:
-            font = ImageFont.truetype(BADGE_FONT_PATH, BADGE_FONT_SIZE)
-        except:
-            font = ImageFont.load_default()
-            print("⚠️ Using default font for badges.")
-
-        for key, filename in LAYER_FILES.items():
-            readable = key.replace("_", " ").title()
-            count = reinforcements.get(readable, 0)
-            if count == 0:
-                continue
-
-            layer_path = os.path.join(base_path, filename)
-            if not os.path.exists(layer_path):
-                print(f"⚠️ Missing layer file: {layer_path}")
-                continue
-
-            overlay = Image.open(layer_path).convert("RGBA")
+            self.font = ImageFont.truetype(BADGE_FONT_PATH, BADGE_FONT_SIZE)
+        except Exception:
+            self.font = ImageFont.load_default()
+            log.warning("⚠️ Using default font for badges.")
+
+        if os.path.isdir(layers_dir):
+            for name in sorted(os.listdir(layers_dir)):
+                if name.lower().endswith(".png"):
+                    self.image(os.path.join(layers_dir, name))
+        # Overlays for every base size we already know about
+        for size in self.base_sizes():
+            for filename in LAYER_FILES.values():
+                self.overlay(filename, size)
+        log.debug("🗂️ Layer atlas ready: %s images from %s", len(self._images), layers_dir)
+
+    def base_sizes(self) -> set:
+        """Distinct sizes of every decoded image (i.e. the base sizes renders will have)."""
+        return {im.size for im in self._images.values()}
+
+    def image(self, path: str):
+        key = os.path.abspath(path)
+        im = self._images.get(key)
+        if im is None:
+            with self._lock:
+                im = self._images.get(key)
+                if im is None:
+                    im = Image.open(path).convert("RGBA")
+                    im.load()
+                    self._images[key] = im
+        return im
+
+    def overlay(self, filename: str, base_size: tuple):
+        key = (filename, base_size)
+        if key in self._overlays:
+            return self._overlays[key]
+
+        layer_path = os.path.join(self.layers_dir, filename)
+        if not os.path.exists(layer_path):
+            log.warning("⚠️ Missing layer file: %s", layer_path)
+            entry = None
+        else:
+            overlay = self.image(layer_path)
             if overlay.size != base_size:
                 overlay = overlay.resize(base_size)
-                print(f"🔧 Resized {filename} to match base size")
-
-            # 🌟 Composite overlay with base
             faded = ImageEnhance.Brightness(overlay).enhance(1.15)
-            base.alpha_composite(faded)
+            # Fully transparent pixels don't change the base — only keep the visible box
+            box = faded.getchannel("A").getbbox()
+            entry = (faded.crop(box), box[:2]) if box else None
+
+        with self._lock:
+            self._overlays[key] = entry
+        return entry
+
+    def badge(self, text: str):
+        im = self._badges.get(text)
+        if im is None:
+            _, _, right, bottom = self.font.getbbox(text)
+            im = Image.new("RGBA", (max(right, 1), max(bottom, 1)), (0, 0, 0, 0))
+            ImageDraw.Draw(im).text((0, 0), text, fill=(255, 255, 0, 255), font=self.font)
+            with self._lock:
+                self._badges[text] = im
+        return im
+
+_atlases = {}
+_atlas_lock = threading.Lock()
+
+def get_atlas(layers_dir: str = DEFAULT_LAYERS_DIR) -> LayerAtlas:
+    """Return the atlas for a layers directory, building it on first use."""
+    atlas = _atlases.get(layers_dir)
+    if atlas is None:
+        with _atlas_lock:
+            atlas = _atlases.get(layers_dir)
+            if atlas is None:
+                atlas = LayerAtlas(layers_dir)
+                _atlases[layers_dir] = atlas
+    return atlas
+
+def compose_stash(reinforcements: dict, base_image_path: str, base_path: str = DEFAULT_LAYERS_DIR):
+    """Composite the stash picture in memory and return it as an RGBA image."""
+    atlas = get_atlas(base_path)
+    base = atlas.image(base_image_path).copy()
+    base_size = base.size
+
+    for index, (key, filename) in enumerate(LAYER_FILES.items()):
+        readable = key.replace("_", " ").title()
+        count = reinforcements.get(readable, 0)
+        if count == 0:
+            continue
+
+        entry = atlas.overlay(filename, base_size)
+        if entry is None:
+            continue
+        overlay, offset = entry
+        base.alpha_composite(overlay, dest=offset)
+
+        # 🏷️ Count badge if more than one
+        if count > 1:
+            badge_position = (base_size[0] - 60, 10 + index * 40)
+            base.alpha_composite(atlas.badge(f"x{count}"), dest=badge_position)
+
+    return base
 
-            # 🏷️ Add badge as separate transparent layer if count > 1
-            if count > 1:
-                badge_text = f"x{count}"
-                badge_img = Image.new("RGBA", base_size, (0, 0, 0, 0))
-                draw = ImageDraw.Draw(badge_img)
+def render_cache_stats() -> dict:
+    """Hit / miss / eviction counters for monitoring."""
+    with _cache_lock:
+        lookups = _cache_stats["hits"] + _cache_stats["misses"]
+        return {
+            **_cache_stats,
+            "hit_rate": round(_cache_stats["hits"] / lookups, 3) if lookups else 0.0,
+            "files": len(_cache_index or ()),
+            "bytes": _cache_bytes,
+        }
 
-                badge_position = (base_size[0] - 60, 10 + list(LAYER_FILES.keys()).index(key) * 40)
-                draw.text(badge_position, badge_text, fill=(255, 255, 0, 255), font=font)
-                base.alpha_composite(badge_img)
+def resolve_base_image(base_path: str = DEFAULT_LAYERS_DIR, baseImagePath: str = None) -> str:
+    """Pick the base picture for a stash, falling back to the default house."""
+    if not baseImagePath:
+        baseImagePath = os.path.join(base_path, "base_house.png")
+    if not os.path.exists(baseImagePath):
+        log.warning("⚠️ Missing base image, falling back.")
+        baseImagePath = os.path.join(base_path, "base_house.png")
+    if not os.path.exists(baseImagePath):
+        raise FileNotFoundError(f"❌ Base image not found: {baseImagePath}")
+    return baseImagePath
+
+def render_cache_name(reinforcements: dict, base_image: str, base_path: str = DEFAULT_LAYERS_DIR) -> str:
+    return f"{_render_key(base_image, base_path, reinforcements)}.png"
+
+def render_stash_file(reinforcements: dict, base_image: str, base_path: str, cache_name: str) -> str:
+    """Composite and write one render into OUTPUT_DIR (no cache bookkeeping — safe in worker processes)."""
+    output_path = os.path.join(OUTPUT_DIR, cache_name)
+    base = compose_stash(reinforcements, base_image, base_path)
+
+    # Write-then-rename so a concurrent reader never sees a half-written file
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    base.save(tmp_path, format="PNG")
+    os.replace(tmp_path, output_path)
+    log.debug("📦 Saved new stash image: %s", output_path)
+    return output_path
+
+def generate_stash_image(user_id: str, reinforcements: dict, base_path: str = DEFAULT_LAYERS_DIR, baseImagePath: str = None) -> str:
+    """
+    Composites a stash image for a user based on equipped reinforcements and custom base image.
+    Returns the image path — shared by every user with the same layout, so treat it as read-only.
+    The bot goes through utils.renderService instead, which runs the same steps off the event loop.
+    """
+    try:
+        # 🔍 Load base image
+        baseImagePath = resolve_base_image(base_path, baseImagePath)
 
-                print(f"🏷️ Badge {badge_text} drawn at {badge_position}")
+        cache_name = render_cache_name(reinforcements, baseImagePath, base_path)
+        cached = lookup_render(cache_name)
+        if cached:
+            log.debug("⚡ Stash render cache hit for %s: %s", user_id, cached)
+            return cached
 
-        base.save(output_path)
-        print(f"📦 Saved new stash image: {output_path}")
+        output_path = render_stash_file(reinforcements, baseImagePath, base_path, cache_name)
+        record_render(cache_name)
         return output_path
 
     except Exception as e:
-        print(f"❌ Error generating stash image: {e}")
+        log.error("❌ Error generating stash image: %s", e)
         return None
 
 # === Local Test ===
@@ -110,3 +307,4 @@ if __name__ == "__main__":
         baseImagePath="assets/stash_layers/base_house_prestige3.png"
     )
     print(f"🖼️ Output: {path}")
+    print(f"📊 Render cache: {render_cache_stats()}")
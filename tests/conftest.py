@@ -0,0 +1,97 @@
+# tests/conftest.py — Shared fixtures: a local storage stub server and a clean storage client per test
+#
+#   python -m pytest tests
+#
+# The remote storage server is replaced by devtools/storageStub.py, served on
+# a random local port by aiohttp's own pytest plugin. Storage defaults to the
+# in-memory backend and the journal to a throwaway file, so importing the
+# storage modules never touches data/.
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("JOURNAL_PATH", os.path.join(tempfile.mkdtemp(prefix="warlab-tests-"), "storage.journal"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest
+from aiohttp import web
+
+from devtools.storageStub import make_app, StubStore
+from utils import storageClient
+from utils.circuitBreaker import CircuitBreaker
+
+pytest_plugins = ["aiohttp.pytest_plugin"]
+
+def pytest_configure(config):
+    config.addinivalue_line("filterwarnings", "ignore:aiohttp.pytest_plugin will be removed:DeprecationWarning")
+    config.addinivalue_line("filterwarnings", "ignore:It is recommended to use web.AppKey")  # the stub's string keys
+
+@pytest.fixture(autouse=True)
+async def fresh_client(loop):
+    """Forget everything the client learned about servers; close its session afterwards."""
+    storageClient._gzip_support.clear()
+    storageClient._patch_support.clear()
+    storageClient._batch_support.clear()
+    storageClient._validators.clear()
+    storageClient._validator_bytes = 0
+    storageClient._inflight_loads.clear()
+    storageClient.BREAKER = CircuitBreaker("storage")
+    for counters in (storageClient.UPLOAD_STATS, storageClient.LOAD_STATS):
+        for key in counters:
+            counters[key] = 0
+    yield
+    if storageClient.SESSION is not None:
+        await storageClient.SESSION.close()
+        storageClient.SESSION = None
+
+class StubServer:
+    """A running stub: its base URL, its StubStore, and the headers of every request it received."""
+
+    def __init__(self, url: str, store: StubStore, requests: list, app_stats: dict):
+        self.url = url
+        self.store = store
+        self.requests = requests  # [(method, path, headers)]
+        self.app_stats = app_stats  # the stub's own counters (gets, not_modified, batches)
+
+@pytest.fixture
+def stub(aiohttp_server):
+    """start(**make_app options) -> StubServer on a free port."""
+    async def start(**options):
+        store, requests = StubStore(), []
+        app = make_app(store, **options)
+
+        @web.middleware
+        async def record(request, handler):
+            requests.append((request.method, request.path, dict(request.headers)))
+            return await handler(request)
+
+        app.middlewares.insert(0, record)
+        server = await aiohttp_server(app)
+        return StubServer(str(server.make_url("")).rstrip("/"), store, requests, app["stats"])
+    return start
+
+@pytest.fixture
+async def stub_storage(stub, monkeypatch):
+    """
+    fileIO (and so profileManager) wired to a fresh stub over HTTP, with an
+    empty write-back cache of its own and no journal. Yields the StubServer.
+    """
+    from utils import fileIO, profileManager
+    from utils.fileCache import FileCache
+    from utils.storageBackends import HttpBackend
+
+    server = await stub()
+    cache = FileCache(fileIO._cache_loader, fileIO._cache_saver, fileIO.three_way_merge,
+                      batch_loader=fileIO._cache_batch_loader, copier=fileIO._copy_entry)
+    monkeypatch.setattr(fileIO, "BACKEND", HttpBackend(server.url))
+    monkeypatch.setattr(fileIO, "CACHE", cache)
+    monkeypatch.setattr(profileManager, "CACHE", cache)
+    monkeypatch.setattr(profileManager, "_store", None)
+    monkeypatch.setattr(profileManager, "_replicate", True)
+    yield server
+    await cache.close()
@@ -0,0 +1,27 @@
+# tests/test_batch_transfers.py — Batched loads and saves count every file and every byte they carry
+
+from utils import storageClient, jsonCodec
+
+FILES = {f"data/profiles/{i}.json": {"username": f"player{i}", "coins": i, "blueprints": ["Saw Blueprint"] * i}
+         for i in range(3)}
+
+async def test_batch_save_counts_files_and_bytes(stub):
+    server = await stub()
+    saved, errors = await storageClient.save_many(FILES, server.url)
+
+    assert errors == {} and set(saved) == set(FILES)
+    assert server.app_stats["batches"] == 1
+    stats = storageClient.upload_stats()
+    assert stats["saves"] == 3 and stats["batches"] == 1
+    assert stats["json_bytes"] == stats["sent_bytes"] == len(jsonCodec.dumps({"put": FILES}))
+    assert stats["ratio"] == 1.0
+
+async def test_batch_load_counts_every_file(stub):
+    server = await stub()
+    await storageClient.save_many(FILES, server.url)
+
+    loaded, errors = await storageClient.load_many(list(FILES) + ["data/profiles/missing.json"], server.url)
+    assert errors.keys() == {"data/profiles/missing.json"}
+    assert {name: data for name, (data, _) in loaded.items()} == FILES
+    assert storageClient.load_stats()["gets"] == 4
+    assert storageClient.load_stats()["batches"] == 1
@@ -0,0 +1,68 @@
+# tests/test_conditional_loads.py — If-None-Match / 304 served from the cached value, gzip responses
+
+import json
+
+import aiohttp
+
+from utils import storageClient
+
+PATH = "data/profiles/4.json"
+DOC = {"username": "player4", "coins": 40, "crafted_log": ["Reinforced Gate"] * 300}
+
+def gets(server):
+    return [headers for method, path, headers in server.requests if method == "GET" and path == f"/{PATH}"]
+
+async def test_unchanged_file_is_a_304_served_from_cache(stub, monkeypatch):
+    server = await stub()
+    server.store.put(PATH, json.dumps(DOC).encode())
+
+    first, version = await storageClient.load_file_versioned(PATH, server.url)
+    assert first == DOC
+    assert "If-None-Match" not in gets(server)[0]
+
+    decodes = []
+    real_decode = storageClient._decode_body
+
+    async def counted(filename, body):
+        decodes.append(filename)
+        return await real_decode(filename, body)
+
+    monkeypatch.setattr(storageClient, "_decode_body", counted)
+    first["coins"] = 0  # the caller's copy is its own
+
+    second, second_version = await storageClient.load_file_versioned(PATH, server.url)
+    assert gets(server)[1]["If-None-Match"] == version
+    assert server.app_stats["not_modified"] == 1
+    assert storageClient.LOAD_STATS["not_modified"] == 1
+    assert second == DOC and second_version == version
+    assert decodes == []  # reused, not re-parsed
+
+    second["crafted_log"].append("Saw")
+    third, _ = await storageClient.load_file_versioned(PATH, server.url)
+    assert third == DOC
+
+async def test_changed_file_is_fetched_again(stub):
+    server = await stub()
+    server.store.put(PATH, json.dumps(DOC).encode())
+    await storageClient.load_file_versioned(PATH, server.url)
+
+    server.store.put(PATH, json.dumps({**DOC, "coins": 41}).encode())
+    data, _ = await storageClient.load_file_versioned(PATH, server.url)
+    assert data["coins"] == 41
+    assert server.app_stats["not_modified"] == 0
+
+async def test_compressed_responses_are_decoded(stub):
+    server = await stub()
+    server.store.put(PATH, json.dumps(DOC).encode())
+
+    # The stub compresses for the client's Accept-Encoding…
+    async with aiohttp.ClientSession(auto_decompress=False) as raw:
+        for accept in ("gzip", "gzip, deflate"):
+            async with raw.get(f"{server.url}/{PATH}", headers={"Accept-Encoding": accept}) as resp:
+                assert resp.headers.get("Content-Encoding") in accept.split(", ")
+                assert len(await resp.read()) < len(json.dumps(DOC)) / 10
+
+    # …and the client asks for it and reads the document back intact
+    data, _ = await storageClient.load_file_versioned(PATH, server.url)
+    assert gets(server)[-1]["Accept-Encoding"] == "gzip, deflate"
+    assert data == DOC
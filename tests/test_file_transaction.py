@@ -0,0 +1,30 @@
+# tests/test_file_transaction.py — Concurrent writers to one shared file keep each other's entries
+
+import asyncio
+
+from utils import fileIO
+
+async def test_concurrent_appends_are_serialised():
+    path = "logs/test_turnin_log.json"
+
+    async def turn_in(uid, item):
+        async with fileIO.file_transaction(path, {}) as logs:
+            await asyncio.sleep(0)  # let the other writer run mid-update
+            logs.setdefault(uid, []).append({"item": item})
+
+    await asyncio.gather(turn_in("p1", "Ghillie Suit"), turn_in("p2", "Tactical Vest"), turn_in("p1", "Mosin"))
+    assert await fileIO.load_file(path) == {
+        "p1": [{"item": "Ghillie Suit"}, {"item": "Mosin"}],
+        "p2": [{"item": "Tactical Vest"}],
+    }
+
+async def test_failed_block_saves_nothing():
+    path = "logs/test_untouched.json"
+    try:
+        async with fileIO.file_transaction(path, {}) as logs:
+            logs["p1"] = ["half-written"]
+            raise RuntimeError("handler crashed")
+    except RuntimeError:
+        pass
+    async with fileIO.file_transaction(path, {}) as logs:
+        assert logs == {}
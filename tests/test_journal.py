@@ -0,0 +1,37 @@
+# tests/test_journal.py — Journal appends are group committed off the event loop and survive a restart
+
+import os
+import threading
+
+from utils import journal as journal_module
+from utils.journal import Journal
+
+async def test_appends_fsync_in_a_worker_thread(tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path / "storage.journal"))
+    journal.open()  # at boot (fileIO.replay_journal), before any command runs
+
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(journal_module.os, "fsync", lambda fd: (fsyncs.append(threading.get_ident()), real_fsync(fd)))
+    for i in range(20):
+        journal.append(f"data/profiles/{i}.json", {"coins": i})
+    await journal.sync()
+
+    assert fsyncs and threading.get_ident() not in fsyncs
+    assert len(fsyncs) < 20  # batched: appends made together share an fsync
+    await journal.close()
+
+async def test_unacked_writes_are_replayed_and_acked_ones_truncated(tmp_path):
+    path = str(tmp_path / "storage.journal")
+    journal = Journal(path)
+    first = journal.append("a.json", {"v": 1})
+    journal.append("b.json", {"v": 2})
+    journal.ack("a.json", first)
+    await journal.close()
+
+    reopened = Journal(path)
+    assert {name: data for name, (data, _) in reopened.open().items()} == {"b.json": {"v": 2}}
+    reopened.ack("b.json", reopened.last_seq("b.json"))
+    await reopened.sync()
+    assert os.path.getsize(path) == 0
+    await reopened.close()
@@ -0,0 +1,72 @@
+# tests/test_json_patch_saves.py — Profile saves as JSON Patch deltas, and the full-PUT fallback
+
+import json
+
+import pytest
+
+from utils import fileIO, storageClient
+from utils.storageBackends import HttpBackend
+from utils.storageClient import PatchUnsupported, JSON_PATCH_TYPE
+
+PATH = "data/profiles/3.json"
+BASE = {"coins": 10, "stash": {"Nails": 1}, "blueprints": ["Mosin Blueprint"], "username": "player3"}
+CHANGED = {"coins": 25, "stash": {"Nails": 1, "Saw": 2}, "blueprints": ["Mosin Blueprint"], "username": "player3"}
+
+def methods(server):
+    return [(method, headers.get("Content-Type")) for method, _, headers in server.requests if method in ("PUT", "PATCH")]
+
+async def start(stub, monkeypatch, **options):
+    server = await stub(**options)
+    server.store.put(PATH, json.dumps(BASE).encode())
+    monkeypatch.setattr(fileIO, "BACKEND", HttpBackend(server.url))
+    base, version = await fileIO.BACKEND.load(PATH)
+    return server, base, version
+
+async def test_changes_are_sent_as_a_patch(stub, monkeypatch):
+    server, base, version = await start(stub, monkeypatch)
+
+    ok, new_version, saved = await fileIO._cache_saver(PATH, CHANGED, version, base)
+    assert ok and new_version != version
+    assert saved == CHANGED
+    assert methods(server) == [("PATCH", JSON_PATCH_TYPE)]
+    assert json.loads(server.store.get(PATH)) == CHANGED
+    assert storageClient.UPLOAD_STATS["patches"] == 1
+
+async def test_no_change_sends_nothing(stub, monkeypatch):
+    server, base, version = await start(stub, monkeypatch)
+
+    ok, new_version, _ = await fileIO._cache_saver(PATH, dict(BASE), version, base)
+    assert ok and new_version == version
+    assert methods(server) == []
+
+async def test_server_without_patch_gets_a_full_put(stub, monkeypatch):
+    server, base, version = await start(stub, monkeypatch, accept_patch=False)
+
+    ok, new_version, saved = await fileIO._cache_saver(PATH, CHANGED, version, base)
+    assert ok and new_version
+    assert saved == CHANGED
+    assert [method for method, _ in methods(server)] == ["PATCH", "PUT"]
+    assert json.loads(server.store.get(PATH)) == CHANGED
+    assert storageClient._patch_support[server.url] is False
+
+    # Remembered: the next save goes straight to PUT
+    again = {**CHANGED, "coins": 30}
+    ok, _, _ = await fileIO._cache_saver(PATH, again, new_version, CHANGED)
+    assert ok
+    assert [method for method, _ in methods(server)] == ["PATCH", "PUT", "PUT"]
+    assert json.loads(server.store.get(PATH)) == again
+
+async def test_patch_the_server_cannot_apply_falls_back_to_put(stub, monkeypatch):
+    server, base, version = await start(stub, monkeypatch)
+
+    # A patch against a base the server never had: removing "extra" fails there (422)
+    with pytest.raises(PatchUnsupported):
+        await storageClient.patch_file(PATH, [{"op": "remove", "path": "/extra"}], version, server.url)
+    assert json.loads(server.store.get(PATH)) == BASE
+
+    ok, _, saved = await fileIO._cache_saver(PATH, CHANGED, version, {**base, "extra": 1})
+    assert ok and saved == CHANGED
+    assert [method for method, _ in methods(server)] == ["PATCH", "PATCH", "PUT"]
+    assert json.loads(server.store.get(PATH)) == CHANGED
+    # Only that patch was refused: PATCH support itself stays on
+    assert storageClient._patch_support.get(server.url) is not False
@@ -0,0 +1,62 @@
+# tests/test_leaderboard_rankings.py — Several rankings from one profile sweep; the SQLite store off the event loop
+
+import asyncio
+import threading
+
+from utils import profileManager
+from utils.profileStore import ProfileStore
+
+async def test_rankings_share_one_sweep(monkeypatch):
+    for i in range(4):
+        await profileManager.create_profile(f"lb{i}", f"player{i}", {
+            "username": f"player{i}", "coins": 10 * i, "successful_raids": 4 - i, "builds_completed": i % 2,
+        })
+
+    sweeps = []
+    real_load_all = profileManager.load_all_profiles
+
+    async def counted():
+        sweeps.append(1)
+        return {uid: p for uid, p in (await real_load_all()).items() if uid.startswith("lb")}
+
+    monkeypatch.setattr(profileManager, "load_all_profiles", counted)
+    tops = await profileManager.top_profiles_by(("successful_raids", "builds_completed", "coins"), limit=2)
+
+    assert len(sweeps) == 1
+    assert [uid for uid, _ in tops["coins"]] == ["lb3", "lb2"]
+    assert [uid for uid, _ in tops["successful_raids"]] == ["lb0", "lb1"]
+    assert [p.builds_completed for _, p in tops["builds_completed"]] == [1, 1]
+
+async def test_profile_store_runs_in_worker_threads(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    threads = set()
+
+    def put(uid, coins):
+        threads.add(threading.get_ident())
+        store.put(uid, {"username": uid, "coins": coins})
+
+    await asyncio.gather(*(asyncio.to_thread(put, f"u{i}", i) for i in range(20)))
+    assert threading.get_ident() not in threads
+    assert store.count() == 20
+    assert [uid for uid, _ in await asyncio.to_thread(store.top, "coins", 3)] == ["u19", "u18", "u17"]
+    store.close()
+
+async def test_seeded_legacy_profiles_rank_by_current_fields(monkeypatch, tmp_path):
+    legacy = {
+        "seed_a": {"username": "a", "raids_successful": 9, "stash": ["Nails", "Nails"]},
+        "seed_b": {"username": "b", "raidsSuccessful": 5},
+        "seed_c": {"username": "c", "successful_raids": 7},
+    }
+    for uid, doc in legacy.items():
+        await profileManager.save_file(profileManager.profile_path(uid), doc)
+    await profileManager.save_file(profileManager.PROFILE_INDEX_PATH, list(legacy))
+
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    monkeypatch.setattr(profileManager, "_store", store)
+    monkeypatch.setattr(profileManager, "_replicate", True)
+    await profileManager.migrate_legacy_profiles()
+
+    tops = await profileManager.top_profiles_by(("successful_raids",), limit=3)
+    assert [uid for uid, _ in tops["successful_raids"]] == ["seed_a", "seed_c", "seed_b"]
+    assert (await profileManager.get_profile("seed_a")).stash == {"Nails": 2}
+    store.close()
@@ -0,0 +1,50 @@
+# tests/test_load_coalescing.py — Concurrent loads of one file share a single GET
+
+import json
+import asyncio
+
+import pytest
+
+from utils import storageClient
+
+PATH = "data/profiles/7.json"
+DOC = {"username": "player7", "coins": 70, "blueprints": ["Mosin Blueprint"]}
+
+def gets(server, path=PATH):
+    return sum(1 for method, request_path, _ in server.requests if method == "GET" and request_path == f"/{path}")
+
+async def test_concurrent_loads_share_one_get(stub):
+    server = await stub()
+    server.store.put(PATH, json.dumps(DOC).encode())
+
+    results = await asyncio.gather(*(storageClient.load_file_versioned(PATH, server.url) for _ in range(10)))
+    assert gets(server) == 1
+    assert storageClient.LOAD_STATS["gets"] == 1 and storageClient.LOAD_STATS["coalesced"] == 9
+    assert all(data == DOC for data, _ in results)
+    assert len({version for _, version in results}) == 1
+
+    results[0][0]["blueprints"].append("Saw Blueprint")  # every waiter got its own copy
+    assert all(data == DOC for data, _ in results[1:])
+
+    await storageClient.load_file_versioned(PATH, server.url)  # the flight has landed: a new GET
+    assert gets(server) == 2
+
+async def test_a_missing_file_fails_every_waiter_once(stub):
+    server = await stub()
+    results = await asyncio.gather(*(storageClient.load_file_versioned("nobody.json", server.url) for _ in range(5)),
+                                   return_exceptions=True)
+    assert gets(server, "nobody.json") == 1
+    assert all(isinstance(result, FileNotFoundError) for result in results)
+
+async def test_a_cancelled_waiter_does_not_abort_the_others(stub):
+    server = await stub()
+    server.store.put(PATH, json.dumps(DOC).encode())
+
+    first = asyncio.ensure_future(storageClient.load_file_versioned(PATH, server.url))
+    second = asyncio.ensure_future(storageClient.load_file_versioned(PATH, server.url))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert (await second)[0] == DOC
+    assert gets(server) == 1
@@ -0,0 +1,39 @@
+# tests/test_profile_model.py — Profile answers `in` and .get() like the stored document, and stores only what it holds
+
+from utils.profileModel import Profile
+from utils.profileSchema import SCHEMA_KEY, PROFILE_SCHEMA_VERSION
+
+def _stored(**fields):
+    return Profile.from_dict({SCHEMA_KEY: PROFILE_SCHEMA_VERSION, **fields})
+
+def test_unset_fields_are_absent_but_attributes_default():
+    profile = _stored(username="Rook", coins=12)
+    assert "coins" in profile and "last_scavenge" not in profile and "stash" not in profile
+    assert profile.get("coins", 0) == 12
+    assert profile.get("prestige_points", 7) == 7
+    assert profile.get("boosts") is None
+    assert profile.stash == {} and profile.last_scavenge is None and profile.scavenges == 0
+
+def test_to_dict_skips_untouched_defaults():
+    profile = _stored(username="Rook")
+    assert profile.to_dict() == {SCHEMA_KEY: PROFILE_SCHEMA_VERSION, "username": "Rook"}
+
+def test_changes_make_fields_present():
+    profile = _stored(username="Rook")
+    profile.coins += 5
+    profile.stash["Nails"] = 2
+    profile["task_status"] = "not_started"
+    assert "coins" in profile and "stash" in profile
+    assert profile.to_dict() == {SCHEMA_KEY: PROFILE_SCHEMA_VERSION, "username": "Rook",
+                                 "coins": 5, "stash": {"Nails": 2}, "task_status": "not_started"}
+
+def test_stored_defaults_round_trip():
+    profile = _stored(coins=0, blueprints=[])
+    assert "coins" in profile and profile.get("blueprints", None) == []
+    assert profile.to_dict() == {SCHEMA_KEY: PROFILE_SCHEMA_VERSION, "coins": 0, "blueprints": []}
+
+def test_setdefault_and_del():
+    profile = _stored()
+    assert profile.setdefault("tools", ["Saw"]) == ["Saw"] and profile.tools == ["Saw"]
+    del profile["tools"]
+    assert "tools" not in profile and profile.tools == []
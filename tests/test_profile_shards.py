@@ -0,0 +1,46 @@
+# tests/test_profile_shards.py — One document per player plus an index of registered UIDs
+
+import json
+
+from utils import profileManager
+from utils.fileIO import flush_cache
+
+def stored(server, path):
+    body = server.store.get(path)
+    return json.loads(body) if body is not None else None
+
+async def test_each_player_gets_a_shard_and_an_index_entry(stub_storage):
+    await profileManager.create_profile("101", "Rook")
+    await profileManager.create_profile("202", "Bishop")
+    async with profileManager.profile_transaction("101") as profile:
+        profile.coins += 25
+    await flush_cache()
+
+    assert stored(stub_storage, "data/profiles/101.json")["coins"] == 25
+    assert stored(stub_storage, "data/profiles/202.json")["username"] == "Bishop"
+    assert stored(stub_storage, "data/profiles/202.json").get("coins", 0) == 0  # the other shard is untouched
+    assert stored(stub_storage, profileManager.PROFILE_INDEX_PATH) == ["101", "202"]
+    assert sorted(await profileManager.load_all_profiles()) == ["101", "202"]
+
+async def test_delete_removes_the_shard_and_its_index_entry(stub_storage):
+    await profileManager.create_profile("101", "Rook")
+    await profileManager.create_profile("202", "Bishop")
+    await flush_cache()
+    assert await profileManager.delete_profile("101")
+    await flush_cache()
+
+    assert stored(stub_storage, "data/profiles/101.json") is None
+    assert stored(stub_storage, profileManager.PROFILE_INDEX_PATH) == ["202"]
+    assert await profileManager.get_profile("101") is None
+
+async def test_legacy_blob_is_split_once(stub_storage):
+    legacy = {"101": {"username": "Rook", "coins": 5}, "202": {"username": "Bishop", "coins": 9}}
+    stub_storage.store.put(profileManager.LEGACY_PROFILE_PATH, json.dumps(legacy).encode())
+
+    await profileManager.migrate_legacy_profiles()
+    assert stored(stub_storage, "data/profiles/202.json")["coins"] == 9
+    assert stored(stub_storage, profileManager.PROFILE_INDEX_PATH) == ["101", "202"]
+
+    puts = sum(1 for method, _, _ in stub_storage.requests if method in ("PUT", "PATCH", "POST"))
+    await profileManager.migrate_legacy_profiles()  # the index marks it done
+    assert sum(1 for method, _, _ in stub_storage.requests if method in ("PUT", "PATCH", "POST")) == puts
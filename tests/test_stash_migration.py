@@ -0,0 +1,43 @@
+# tests/test_stash_migration.py — v1 list stashes become item → quantity maps, lazily and once
+
+import json
+
+from utils import profileManager
+from utils.fileIO import flush_cache
+from utils.inventory import Stash
+from utils.profileSchema import migrate_profile, SCHEMA_KEY, PROFILE_SCHEMA_VERSION
+
+V1 = {"username": "Rook", "stash": ["Nails", "Nails", "Hammer", "Nails", 7]}
+
+def test_list_stash_becomes_a_quantity_map():
+    profile = json.loads(json.dumps(V1))
+    assert migrate_profile(profile)
+    assert profile["stash"] == {"Nails": 3, "Hammer": 1}  # non-strings dropped
+    assert profile[SCHEMA_KEY] == PROFILE_SCHEMA_VERSION
+    assert not migrate_profile(profile)  # already current: untouched
+
+def test_current_documents_are_left_alone():
+    profile = {SCHEMA_KEY: PROFILE_SCHEMA_VERSION, "stash": {"Saw": 2}}
+    assert not migrate_profile(profile)
+    assert profile == {SCHEMA_KEY: PROFILE_SCHEMA_VERSION, "stash": {"Saw": 2}}
+
+def test_stash_wrapper_converts_an_unmigrated_list_in_place():
+    profile = {"stash": ["Saw", "Saw"]}
+    stash = Stash(profile)
+    assert stash.take("Saw") and profile["stash"] == {"Saw": 1}
+
+async def test_stored_v1_shard_is_upgraded_on_read_and_written_on_next_save(stub_storage):
+    path = profileManager.profile_path("303")
+    stub_storage.store.put(path, json.dumps(V1).encode())
+
+    profile = await profileManager.get_profile("303")
+    assert profile.stash == {"Nails": 3, "Hammer": 1}
+    await flush_cache()
+    assert json.loads(stub_storage.store.get(path))["stash"] == V1["stash"]  # reads alone rewrite nothing
+
+    async with profileManager.profile_transaction("303") as profile:
+        Stash(profile).take("Hammer")
+    await flush_cache()
+    stored = json.loads(stub_storage.store.get(path))
+    assert stored["stash"] == {"Nails": 3}
+    assert stored[SCHEMA_KEY] == PROFILE_SCHEMA_VERSION
@@ -0,0 +1,29 @@
+# tests/test_storage_config.py — Without storage configured the bot refuses to boot instead of writing to local disk
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _boot(**env):
+    clean = {k: v for k, v in os.environ.items() if k not in ("STORAGE_BACKEND", "PERSISTENT_DATA_URL")}
+    return subprocess.run([sys.executable, "-c", "import utils.fileIO as f; print(f.BACKEND.kind)"],
+                          cwd=ROOT, env={**clean, **env}, capture_output=True, text=True, timeout=60)
+
+def test_no_storage_configured_fails_at_import():
+    result = _boot()
+    assert result.returncode != 0
+    assert "No storage configured" in result.stderr
+
+@pytest.mark.parametrize("env, kind", [
+    ({"PERSISTENT_DATA_URL": "http://127.0.0.1:9"}, "http"),
+    ({"STORAGE_BACKEND": "filesystem"}, "filesystem"),
+    ({"STORAGE_BACKEND": "memory"}, "memory"),
+])
+def test_backend_is_chosen_explicitly(env, kind, tmp_path):
+    result = _boot(STORAGE_FS_ROOT=str(tmp_path), **env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == kind
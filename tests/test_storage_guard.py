@@ -0,0 +1,38 @@
+# tests/test_storage_guard.py — Buttons and selects answer an open storage circuit instead of failing silently
+
+from types import SimpleNamespace
+
+import discord
+
+from utils.circuitBreaker import CircuitOpen
+from utils.storageGuard import WarlabView, STORAGE_DOWN_MESSAGE
+
+class FakeInteraction:
+    def __init__(self, deferred: bool):
+        self.sent = []
+        self.user = "player#0001"
+        self.response = SimpleNamespace(is_done=lambda: deferred, send_message=self._record("response"))
+        self.followup = SimpleNamespace(send=self._record("followup"))
+
+    def _record(self, channel):
+        async def send(content, **kwargs):
+            self.sent.append((channel, content, kwargs.get("ephemeral")))
+        return send
+
+async def test_circuit_open_after_defer_gets_a_followup():
+    view = WarlabView(timeout=None)
+    interaction = FakeInteraction(deferred=True)
+    await view.on_error(interaction, CircuitOpen("storage is unavailable"), discord.ui.Button(label="Buy"))
+    assert interaction.sent == [("followup", STORAGE_DOWN_MESSAGE, True)]
+
+async def test_circuit_open_before_any_reply_gets_a_response():
+    view = WarlabView(timeout=None)
+    interaction = FakeInteraction(deferred=False)
+    await view.on_error(interaction, CircuitOpen("storage is unavailable"), discord.ui.Button(label="Buy"))
+    assert interaction.sent == [("response", STORAGE_DOWN_MESSAGE, True)]
+
+async def test_other_errors_are_logged_not_answered():
+    view = WarlabView(timeout=None)
+    interaction = FakeInteraction(deferred=True)
+    await view.on_error(interaction, ValueError("boom"), discord.ui.Button(label="Buy"))
+    assert interaction.sent == []
@@ -0,0 +1,66 @@
+# tests/test_upload_encoding.py — Chunked, gzip-negotiated uploads and the 415 fallback
+
+import json
+
+from utils import storageClient
+
+PATH = "data/profiles/2.json"
+DOC = {"username": "player2", "crafted_log": ["Reinforced Gate"] * 400, "stash": {"Nails": 3}}
+
+def puts(server):
+    return [headers for method, _, headers in server.requests if method == "PUT"]
+
+async def test_uploads_are_chunked_and_gzip_once_advertised(stub, monkeypatch):
+    monkeypatch.setattr(storageClient, "UPLOAD_GZIP", "auto")
+    monkeypatch.setattr(storageClient, "UPLOAD_CHUNK_SIZE", 512)
+    server = await stub()
+
+    # Nothing known about the server yet: plain JSON, streamed in chunks
+    ok, _ = await storageClient.save_file_versioned(PATH, DOC, base_url_override=server.url)
+    assert ok
+    first = puts(server)[-1]
+    assert first.get("Transfer-Encoding") == "chunked"
+    assert "Content-Encoding" not in first
+    assert json.loads(server.store.get(PATH)) == DOC
+
+    # The response advertised gzip: the next save is compressed
+    before = dict(storageClient.UPLOAD_STATS)
+    ok, _ = await storageClient.save_file_versioned(PATH, DOC, base_url_override=server.url)
+    assert ok
+    second = puts(server)[-1]
+    assert second.get("Transfer-Encoding") == "chunked"
+    assert second.get("Content-Encoding") == "gzip"
+    assert json.loads(server.store.get(PATH)) == DOC
+
+    sent = storageClient.UPLOAD_STATS["sent_bytes"] - before["sent_bytes"]
+    raw = storageClient.UPLOAD_STATS["json_bytes"] - before["json_bytes"]
+    assert raw == len(json.dumps(DOC, separators=(",", ":")))
+    assert sent < raw / 10
+
+async def test_refused_gzip_falls_back_to_identity(stub, monkeypatch):
+    monkeypatch.setattr(storageClient, "UPLOAD_GZIP", "on")
+    server = await stub(accept_gzip=False)
+
+    ok, version = await storageClient.save_file_versioned(PATH, DOC, base_url_override=server.url)
+    assert ok and version
+    assert [h.get("Content-Encoding") for h in puts(server)] == ["gzip", None]
+    assert json.loads(server.store.get(PATH)) == DOC
+    assert storageClient._gzip_support[server.url] is False
+    assert storageClient.UPLOAD_STATS["saves"] == 1
+
+    # Remembered: later saves go out as plain JSON straight away
+    ok, _ = await storageClient.save_file_versioned(PATH, {"username": "player2"}, base_url_override=server.url)
+    assert ok
+    assert [h.get("Content-Encoding") for h in puts(server)] == ["gzip", None, None]
+
+async def test_ratio_counts_patches_on_both_sides(stub):
+    server = await stub()
+    ok, version = await storageClient.save_file_versioned(PATH, {"coins": 1}, base_url_override=server.url)
+    assert ok
+    ok, _ = await storageClient.patch_file(PATH, [{"op": "replace", "path": "/coins", "value": 2}],
+                                           version, base_url_override=server.url)
+    assert ok
+    stats = storageClient.upload_stats()
+    assert stats["patches"] == 1
+    assert stats["sent_bytes"] == stats["json_bytes"]
+    assert stats["ratio"] == 1.0
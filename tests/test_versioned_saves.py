@@ -0,0 +1,77 @@
+# tests/test_versioned_saves.py — If-Match saves against the stub server: 412 → VersionConflict → re-merge
+
+import json
+
+import pytest
+
+from utils import fileIO, storageClient
+from utils.storageBackends import HttpBackend
+from utils.storageClient import VersionConflict
+
+PATH = "data/profiles/1.json"
+
+def stored(store, path=PATH):
+    return json.loads(store.get(path))
+
+@pytest.mark.parametrize("accept_patch", [True, False], ids=["patch", "put"])
+async def test_concurrent_writers_both_land(stub, monkeypatch, accept_patch):
+    server = await stub(accept_patch=accept_patch)
+    url, store = server.url, server.store
+    store.put(PATH, json.dumps({"coins": 10, "stash": {"Nails": 1}, "blueprints": []}).encode())
+
+    backend = HttpBackend(url)
+    monkeypatch.setattr(fileIO, "BACKEND", backend)
+    updates, merges = [], []
+    real_update, real_merge = backend.update, fileIO.three_way_merge
+
+    async def spy_update(name, mutate, *args, **kwargs):
+        updates.append(name)
+        return await real_update(name, mutate, *args, **kwargs)
+
+    def spy_merge(base, local, remote):
+        merges.append(remote)
+        return real_merge(base, local, remote)
+
+    monkeypatch.setattr(backend, "update", spy_update)
+    monkeypatch.setattr(fileIO, "three_way_merge", spy_merge)
+
+    # Both writers start from the same version
+    base, version = await backend.load(PATH)
+    ours = {"coins": 13, "stash": {"Nails": 3}, "blueprints": []}
+    theirs = {"coins": 15, "stash": {"Nails": 1, "Saw": 1}, "blueprints": ["Mosin Blueprint"]}
+
+    # The other writer lands first
+    ok, _ = await storageClient.save_file_versioned(PATH, theirs, version, url)
+    assert ok
+
+    # A conditional save at the old version is refused by the server (412)
+    with pytest.raises(VersionConflict):
+        await storageClient.save_file_versioned(PATH, ours, version, url)
+
+    # The cache's saver replays our change on their copy instead
+    ok, new_version, merged = await fileIO._cache_saver(PATH, ours, version, base)
+    assert ok and new_version
+    assert updates == [PATH]
+    assert merges and merges[-1] == theirs
+
+    expected = {"coins": 18, "stash": {"Nails": 3, "Saw": 1}, "blueprints": ["Mosin Blueprint"]}
+    assert merged == expected
+    assert stored(store) == expected
+
+async def test_update_rereads_after_losing_the_race(stub):
+    server = await stub()
+    url, store = server.url, server.store
+    store.put(PATH, json.dumps({"coins": 1}).encode())
+    seen = []
+
+    def add_five(doc):
+        seen.append(doc["coins"])
+        if len(seen) == 1:
+            # Someone else writes between our load and our save
+            store.put(PATH, json.dumps({"coins": 2}).encode())
+        return {**doc, "coins": doc["coins"] + 5}
+
+    data, _ = await storageClient.update_file(PATH, add_five, url)
+    assert seen == [1, 2]
+    assert data == {"coins": 7}
+    assert stored(store) == {"coins": 7}
@@ -0,0 +1,53 @@
+# tests/test_weighted_sampler.py — Masks, distinct weighted samples, and the weighted_choice sampler cache
+
+import random
+
+import utils.inventory as inventory
+from utils.weightedSampler import AliasSampler
+
+def test_mask_excludes_every_entry_with_the_name():
+    sampler = AliasSampler(["Nails#1", "Saw", "Nails#2"], [1, 1, 1], names=["Nails", "Saw", "Nails"])
+    mask = sampler.mask(["Nails", "Unknown"])
+    assert mask == 0b101
+    rng = random.Random(7)
+    assert {sampler.draw(exclude=mask, rng=rng) for _ in range(200)} == {"Saw"}
+    assert sampler.sample_unique(3, exclude=mask, rng=rng) == ["Saw"]
+
+def test_weighted_choice_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(inventory, "_CHOICE_SAMPLERS", inventory.OrderedDict())
+    monkeypatch.setattr(inventory, "_CHOICE_SAMPLERS_MAX", 2)
+    weights = {"common": 1}
+    pools = [[{"item": f"Item {n}", "rarity": "common"}] * n for n in (1, 2, 3)]
+    inventory.weighted_choice(pools[0], weights)
+    inventory.weighted_choice(pools[1], weights)
+    first = next(iter(inventory._CHOICE_SAMPLERS))
+    inventory.weighted_choice(pools[0], weights)  # most recent again
+    inventory.weighted_choice(pools[2], weights)  # evicts pools[1]'s sampler, not pools[0]'s
+    assert first in inventory._CHOICE_SAMPLERS
+    assert len(inventory._CHOICE_SAMPLERS) == 2
+    assert [len(key[0]) for key in inventory._CHOICE_SAMPLERS] == [1, 3]
+
+def _pool(n):
+    names = [f"Item {i}" for i in range(n)]
+    return AliasSampler(names, [1 + i % 4 for i in range(n)], names=names)
+
+def test_sample_unique_returns_exactly_k_distinct_entries():
+    sampler, rng = _pool(40), random.Random(1)
+    for k in (1, 5, 20, 39, 40):  # both the rejection phase and the Efraimidis–Spirakis pass
+        picks = sampler.sample_unique(k, rng=rng)
+        assert len(picks) == k and len(set(picks)) == k
+
+def test_sample_unique_honours_exclude():
+    sampler, rng = _pool(12), random.Random(2)
+    excluded = {f"Item {i}" for i in range(0, 12, 2)}
+    mask = sampler.mask(excluded)
+    for k in (1, 3, 6):
+        picks = sampler.sample_unique(k, exclude=mask, rng=rng)
+        assert len(picks) == k and len(set(picks)) == k and not excluded & set(picks)
+
+def test_sample_unique_stops_at_the_pool_size():
+    sampler = AliasSampler(["a", "b", "c", "none"], [1, 2, 3, 0], names=["a", "b", "c", "none"])
+    rng = random.Random(3)
+    assert sorted(sampler.sample_unique(10, rng=rng)) == ["a", "b", "c"]  # weight 0 is never drawn
+    assert sorted(sampler.sample_unique(10, exclude=sampler.mask(["b"]), rng=rng)) == ["a", "c"]
+    assert sampler.sample_unique(0, rng=rng) == []
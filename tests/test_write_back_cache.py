@@ -0,0 +1,43 @@
+# tests/test_write_back_cache.py — Saves land in the cache; a flush sends one write per changed file
+
+import json
+
+from utils import fileIO
+
+def writes(server, path):
+    return [method for method, request_path, _ in server.requests
+            if method in ("PUT", "PATCH") and request_path == f"/{path}"]
+
+async def test_repeated_saves_coalesce_into_one_write(stub_storage):
+    path = "data/raid_cooldowns.json"
+    for i in range(10):
+        await fileIO.save_file(path, {"101": [f"2026-10-18T00:0{i}:00"]})
+    assert writes(stub_storage, path) == []  # nothing on the wire until a flush
+    assert await fileIO.load_file(path) == {"101": ["2026-10-18T00:09:00"]}
+
+    await fileIO.flush_cache()
+    assert writes(stub_storage, path) == ["PUT"]
+    assert json.loads(stub_storage.store.get(path)) == {"101": ["2026-10-18T00:09:00"]}
+
+    await fileIO.flush_cache()  # nothing dirty: nothing sent
+    assert writes(stub_storage, path) == ["PUT"]
+
+async def test_one_flush_covers_every_dirty_file(stub_storage):
+    paths = [f"data/profiles/{uid}.json" for uid in range(5)]
+    for n, path in enumerate(paths):
+        await fileIO.save_file(path, {"coins": n})
+        await fileIO.save_file(path, {"coins": n * 10})
+
+    await fileIO.flush_cache()
+    assert fileIO.cache_stats()["flushes"] == 1
+    assert [len(writes(stub_storage, path)) for path in paths] == [1] * 5
+    assert [json.loads(stub_storage.store.get(path))["coins"] for path in paths] == [0, 10, 20, 30, 40]
+
+async def test_cached_copies_are_private(stub_storage):
+    path = "data/market.json"
+    doc = {"offers": ["Saw"]}
+    await fileIO.save_file(path, doc)
+    doc["offers"].append("Nails")  # mutating after save does not reach the cache
+    loaded = await fileIO.load_file(path)
+    loaded["offers"].clear()
+    assert await fileIO.load_file(path) == {"offers": ["Saw"]}
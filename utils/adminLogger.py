@@ -2,6 +2,9 @@
 
 from datetime import datetime
 from utils.fileIO import load_file, save_file
+from utils.logPipeline import get_logger
+
+log = get_logger("AdminLogger")
 
 LOG_PATH = "logs/admin_actions.json"
 MAX_LOG_ENTRIES = 500  # Optional cap
@@ -38,7 +41,7 @@ async def log_admin_action(admin_user, target_user, action_type, details, note=N
 
         await save_file(LOG_PATH, logs)
 
-        print(f"📝 [AdminLogger] Logged admin action: {action_type} -> {target_user.name}")
+        log.info("📝 Logged admin action: %s -> %s", action_type, target_user.name)
 
     except Exception as e:
-        print(f"❌ [LOGGER ERROR] Failed to log admin action: {e}")
+        log.error("❌ Failed to log admin action: %s", e)
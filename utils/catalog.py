@@ -0,0 +1,136 @@
+# utils/catalog.py — Immutable registry of the static game data files (loaded once at boot, hot-reloadable)
+#
+# Commands read catalog data through get_catalog() instead of fetching the JSON
+# files from remote storage on every invocation. Everything in a snapshot is
+# frozen (MappingProxyType / tuple) so no handler can mutate shared data, and a
+# reload swaps the whole snapshot atomically.
+
+import asyncio
+from types import MappingProxyType
+from collections import defaultdict
+
+from utils.fileIO import load_many, CACHE
+from utils.itemDictionary import register_catalog
+from utils.weightedSampler import rarity_sampler
+from utils.logPipeline import get_logger
+
+log = get_logger("catalog")
+
+CATALOG_FILES = {
+    "items_master":       "data/items_master.json",
+    "recipes":            "data/item_recipes.json",
+    "armor":              "data/armor_blueprints.json",
+    "explosives":         "data/explosive_blueprints.json",
+    "rarity_weights":     "data/rarity_weights.json",
+    "labskins":           "data/labskins_catalog.json",
+    "car_parts":          "data/car_parts_master.json",
+    "blackmarket_items":  "data/blackmarket_items_master.json",
+    "market_items":       "data/market_items_master.json",
+    "part_reference":     "data/part_master_reference.json",
+}
+
+def freeze(obj):
+    """Recursively convert dicts → read-only mappings and lists → tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+class Catalog:
+    """One frozen, indexed snapshot of every static data file."""
+
+    def __init__(self, raw: dict):
+        for name in CATALOG_FILES:
+            data = raw.get(name)
+            setattr(self, name, freeze(data if isinstance(data, (dict, list)) else {}))
+
+        # ── Recipe indexes ──────────────────────────────────────────────
+        all_recipes = {}
+        recipe_kind = {}
+        produces = {}
+        for kind, source in (("weapon", self.recipes), ("armor", self.armor), ("explosive", self.explosives)):
+            for key, recipe in source.items():
+                all_recipes[key.lower()] = recipe
+                recipe_kind[key.lower()] = kind
+                produced = recipe.get("produces")
+                if produced:
+                    produces[produced] = key
+
+        self.all_recipes = MappingProxyType(all_recipes)    # lowercase key → recipe
+        self.recipe_kind = MappingProxyType(recipe_kind)    # lowercase key → weapon/armor/explosive
+        self.produces = MappingProxyType(produces)          # produced item name → recipe key
+        self.crafted_items = frozenset(produces)
+        self.blueprint_names = tuple(sorted(produces))
+
+        # ── Item indexes ────────────────────────────────────────────────
+        by_type = defaultdict(list)
+        by_rarity = defaultdict(list)
+        for name, info in self.items_master.items():
+            if not isinstance(info, MappingProxyType):
+                continue
+            by_type[info.get("type", "")].append(name)
+            by_rarity[info.get("rarity", "")].append(name)
+
+        self.items_by_type = MappingProxyType({k: tuple(v) for k, v in by_type.items()})
+        self.items_by_rarity = MappingProxyType({k: tuple(v) for k, v in by_rarity.items()})
+
+        # ── Loot samplers (rarity-weighted, built once per snapshot) ────
+        weights = self.rarity_weights if isinstance(self.rarity_weights, MappingProxyType) else {}
+        self.loot_sampler = rarity_sampler(
+            (freeze({"item": name, "rarity": info["rarity"]})
+             for name, info in self.items_master.items()
+             if isinstance(info, MappingProxyType) and "rarity" in info),
+            weights,
+        )
+        blueprints, market = [], []
+        for source in (self.recipes, self.armor, self.explosives):
+            for key, recipe in source.items():
+                produced = recipe.get("produces")
+                if produced:
+                    rarity = recipe.get("rarity", "Common")
+                    blueprints.append(freeze({"item": f"{produced} Blueprint", "source_key": key, "rarity": rarity}))
+                    market.append(freeze({"name": produced, "rarity": rarity}))
+        self.blueprint_sampler = rarity_sampler(blueprints, weights)
+        self.crafted_offers = tuple(market)  # black market rotation pool: {"name", "rarity"} per recipe
+
+_CURRENT = Catalog({})
+_reload_lock = asyncio.Lock()
+
+def get_catalog() -> Catalog:
+    """Return the current snapshot. Hold on to it for the whole command for a consistent view."""
+    return _CURRENT
+
+async def load_catalog() -> Catalog:
+    """
+    (Re)load every catalog file from storage and swap the snapshot in one step.
+    On any failure the previous snapshot stays active.
+    """
+    global _CURRENT
+    async with _reload_lock:
+        for path in CATALOG_FILES.values():
+            CACHE.invalidate(path)
+
+        loaded, errors = await load_many(CATALOG_FILES.values())
+
+        raw = {}
+        for name, path in CATALOG_FILES.items():
+            if path in loaded:
+                raw[name] = loaded[path]
+            else:
+                log.warning("⚠️ Failed to load %s: %s", path, errors.get(path))
+                # Keep what we had for this file rather than blanking it
+                previous = getattr(_CURRENT, name, {})
+                raw[name] = _thaw(previous)
+
+        _CURRENT = Catalog(raw)
+        added = register_catalog(_CURRENT)
+        log.info("📚 Loaded %d items, %d recipes (%d new item names)", len(_CURRENT.items_master), len(_CURRENT.all_recipes), added)
+        return _CURRENT
+
+def _thaw(obj):
+    if isinstance(obj, MappingProxyType):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(v) for v in obj]
+    return obj
@@ -0,0 +1,85 @@
+# utils/circuitBreaker.py — Closed / open / half-open circuit breaker for the storage client
+#
+#   closed     requests flow; FAILURE_THRESHOLD consecutive failures open the breaker
+#   open       requests are refused immediately for RESET_SECONDS
+#   half_open  one probe request is let through: success closes, failure re-opens
+
+import os
+import time
+from collections import deque
+
+from utils.logPipeline import get_logger
+
+log = get_logger("circuitBreaker")
+
+FAILURE_THRESHOLD = int(os.getenv("STORAGE_BREAKER_FAILURES", "5"))
+RESET_SECONDS     = float(os.getenv("STORAGE_BREAKER_RESET_SECONDS", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class CircuitOpen(Exception):
+    """The breaker is open — the backend is considered down, so the call was not attempted."""
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_seconds: float = RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None  # a half-open probe in flight (None when there is none)
+        self.transitions = deque(maxlen=20)  # (unix time, from, to)
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def _move(self, state: str):
+        if state == self.state:
+            return
+        self.transitions.append((time.time(), self.state, state))
+        log.warning("🔌 %s: %s → %s", self.name, self.state, state)
+        self.state = state
+        if state == OPEN:
+            self.stats["opened"] += 1
+            self._opened_at = time.monotonic()
+
+    def _probe_out(self) -> bool:
+        # A probe that never reported back (cancelled) stops blocking after RESET_SECONDS
+        return self._probe_started is not None and time.monotonic() - self._probe_started < self.reset_seconds
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being refused (open, or half-open with the probe already out)."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at < self.reset_seconds
+        return self.state == HALF_OPEN and self._probe_out()
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go out now."""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._move(HALF_OPEN)
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probe_out()):
+            self.stats["rejected"] += 1
+            raise CircuitOpen(f"{self.name} is unavailable (circuit {self.state})")
+        if self.state == HALF_OPEN:
+            self._probe_started = time.monotonic()
+
+    def record_success(self):
+        self.stats["successes"] += 1
+        self._failures = 0
+        self._probe_started = None
+        self._move(CLOSED)
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._probe_started = None
+            self._move(OPEN)
+
+    def snapshot_stats(self) -> dict:
+        return {
+            **self.stats,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "transitions": list(self.transitions),
+        }
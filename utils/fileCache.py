@@ -0,0 +1,267 @@
+# utils/fileCache.py — In-process write-back cache for remote persistent storage
+#
+# Reads are served from memory after the first load; saves only mark the key dirty.
+# Dirty keys are flushed to remote storage in batches: every FLUSH_INTERVAL seconds,
+# as soon as MAX_DIRTY keys pile up, and once more on shutdown (bot.main).
+#
+# Every entry remembers the remote version it was loaded at and, once modified,
+# the copy it was modified from (its base). Flushes are conditional on that
+# version, so another bot process writing the same file is never overwritten:
+# the saver replays our change (base → local) on top of the newer remote copy.
+#
+# With a journal (utils/journal.py) every save is journaled locally (group
+# committed off the event loop), acknowledged once it reaches remote storage,
+# and replayed by replay() after a crash.
+#
+# Entries are copied on the way in and out so callers never share them. The
+# copier defaults to copy.deepcopy; fileIO passes one that also swaps item
+# names for shared copies (utils/itemDictionary.py).
+
+import os
+import copy
+import time
+import asyncio
+from collections import OrderedDict
+
+from utils.logPipeline import get_logger, SAMPLED
+
+log = get_logger("fileCache")
+
+FLUSH_INTERVAL = float(os.getenv("CACHE_FLUSH_SECONDS", "5"))
+MAX_DIRTY      = int(os.getenv("CACHE_MAX_DIRTY", "50"))
+MAX_ENTRIES    = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+CLEAN_TTL      = float(os.getenv("CACHE_TTL_SECONDS", "300"))  # re-fetch clean entries after this
+
+class FileCache:
+    def __init__(self, loader, saver, merge, journal=None, batch_loader=None, copier=None):
+        self._loader = loader          # async (path) -> (data, version)
+        self._batch_loader = batch_loader  # async ([paths]) -> ({path: (data, version)}, {path: exc})
+        self._saver = saver            # async (path, data, version, base) -> (ok, new_version, stored_data)
+        self._merge = merge            # (base, local, remote) -> merged
+        self._journal = journal        # optional utils.journal.Journal
+        self._copier = copier          # optional (path, data) -> independent copy of data
+        self._entries = OrderedDict()  # path -> (data, loaded_at)
+        self._versions = {}            # path -> remote version the entry is based on
+        self._bases = {}               # path -> remote copy a dirty entry was modified from
+        self._dirty = set()
+        self._generation = {}          # path -> save counter (detects saves racing a load)
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+        self.stats = {"hits": 0, "misses": 0, "flushes": 0, "files_flushed": 0, "flush_errors": 0, "conflicts": 0,
+                      "stale_served": 0}
+
+    def _copy(self, path, data):
+        return copy.deepcopy(data) if self._copier is None else self._copier(path, data)
+
+    # ------------------------------ reads -------------------------------- #
+    async def load(self, path):
+        entry = self._entries.get(path)
+        if entry is not None and (path in self._dirty or time.monotonic() - entry[1] < CLEAN_TTL):
+            self.stats["hits"] += 1
+            self._entries.move_to_end(path)
+            return self._copy(path, entry[0])
+
+        self.stats["misses"] += 1
+        generation = self._generation.get(path, 0)
+        try:
+            data, version = await self._loader(path)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            if entry is None:
+                raise
+            # Storage is down: the last good copy beats no answer at all
+            self.stats["stale_served"] += 1
+            log.warning("🧊 Serving stale %s (%s)", path, e.__class__.__name__, extra=SAMPLED)
+            return self._copy(path, self._entries[path][0] if path in self._entries else entry[0])
+        # A save may have landed while we were waiting on the network — keep it
+        if self._generation.get(path, 0) != generation and path in self._entries:
+            return self._copy(path, self._entries[path][0])
+        self._store(path, self._copy(path, data))
+        self._versions[path] = version
+        return data
+
+    async def load_many(self, paths):
+        """
+        Like load() for several paths, fetching every miss in one batch.
+        Returns (loaded, errors): {path: data} and {path: exception}.
+        """
+        loaded, misses = {}, []
+        for path in dict.fromkeys(paths):
+            entry = self._entries.get(path)
+            if entry is not None and (path in self._dirty or time.monotonic() - entry[1] < CLEAN_TTL):
+                self.stats["hits"] += 1
+                self._entries.move_to_end(path)
+                loaded[path] = self._copy(path, entry[0])
+            else:
+                misses.append(path)
+        if not misses:
+            return loaded, {}
+
+        if self._batch_loader is None:
+            results = await asyncio.gather(*(self.load(p) for p in misses), return_exceptions=True)
+            errors = {}
+            for path, result in zip(misses, results):
+                if isinstance(result, Exception):
+                    errors[path] = result
+                else:
+                    loaded[path] = result
+            return loaded, errors
+
+        self.stats["misses"] += len(misses)
+        generations = {p: self._generation.get(p, 0) for p in misses}
+        fetched, errors = await self._batch_loader(misses)
+        for path in list(errors):
+            if path in self._entries and not isinstance(errors[path], FileNotFoundError):
+                self.stats["stale_served"] += 1
+                log.warning("🧊 Serving stale %s (%s)", path, errors[path].__class__.__name__, extra=SAMPLED)
+                loaded[path] = self._copy(path, self._entries[path][0])
+                del errors[path]
+        for path, (data, version) in fetched.items():
+            # Same rule as load(): a save that landed meanwhile wins
+            if self._generation.get(path, 0) != generations[path] and path in self._entries:
+                loaded[path] = self._copy(path, self._entries[path][0])
+                continue
+            self._store(path, self._copy(path, data))
+            self._versions[path] = version
+            loaded[path] = data
+        return loaded, errors
+
+    # ------------------------------ writes ------------------------------- #
+    def save(self, path, data):
+        data = self._copy(path, data)
+        if self._journal is not None:
+            self._journal.append(path, data)  # queued; fsync'd by the journal's writer
+        # Stored entries are never mutated, so the current one is the base as-is
+        if path not in self._bases and path in self._entries:
+            self._bases[path] = self._entries[path][0]
+        self._store(path, data)
+        self._generation[path] = self._generation.get(path, 0) + 1
+        self._dirty.add(path)
+        self._ensure_flusher()
+        if len(self._dirty) >= MAX_DIRTY:
+            asyncio.get_running_loop().create_task(self.flush())
+
+    def _store(self, path, data):
+        self._entries[path] = (data, time.monotonic())
+        self._entries.move_to_end(path)
+        # Evict least-recently-used *clean* entries only; dirty data must reach storage first
+        while len(self._entries) > MAX_ENTRIES:
+            victim = next((p for p in self._entries if p not in self._dirty), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+            self._versions.pop(victim, None)
+
+    # ------------------------------ flushing ----------------------------- #
+    async def flush(self):
+        """Push every dirty key to remote storage. Failed keys stay dirty for the next pass."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            # Snapshot up front: once a key is no longer dirty it may be evicted mid-flush
+            batch = {
+                path: (self._entries[path][0], self._versions.get(path), self._bases.get(path),
+                       self._generation.get(path, 0), self._journal.last_seq(path) if self._journal else 0)
+                for path in self._dirty
+            }
+            self._dirty.clear()
+            self.stats["flushes"] += 1
+
+            async def _one(path, data, version, base, generation, seq):
+                try:
+                    ok, new_version, stored = await self._saver(path, data, version, base)
+                except Exception as e:
+                    log.error("❌ Flush of %s failed: %s", path, e)
+                    ok, new_version, stored = False, None, None
+
+                if not ok:
+                    self.stats["flush_errors"] += 1
+                    self._dirty.add(path)
+                    if path not in self._entries:
+                        self._store(path, data)
+                    return
+
+                self.stats["files_flushed"] += 1
+                if self._journal is not None:
+                    self._journal.ack(path, seq)
+                if stored is not data:
+                    self.stats["conflicts"] += 1
+                self._versions[path] = new_version
+
+                if self._generation.get(path, 0) == generation:
+                    self._bases.pop(path, None)
+                    if path in self._entries:
+                        self._store(path, stored)
+                else:
+                    # Saved again while we were flushing: rebase the newer copy onto what landed
+                    if path in self._entries and stored is not data:
+                        self._store(path, self._merge(data, self._entries[path][0], stored))
+                    self._bases[path] = stored
+
+            await asyncio.gather(*(_one(p, *entry) for p, entry in batch.items()))
+            if self._journal is not None:
+                await self._journal.compact({p: self._entries[p][0] for p in self._dirty if p in self._entries})
+            log.debug("💾 Flushed %d file(s), %d still dirty", len(batch), len(self._dirty))
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error("❌ Periodic flush failed: %s", e)
+
+    async def close(self):
+        """Final flush on shutdown."""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+        if self._journal is not None:
+            await self._journal.close()
+
+    def replay(self) -> int:
+        """Queue every write the journal holds that never reached remote storage."""
+        if self._journal is None:
+            return 0
+        pending = self._journal.open()
+        for path, (data, _) in pending.items():
+            # Already journaled; written unconditionally since the loaded version is long gone
+            self._store(path, data)
+            self._versions.pop(path, None)
+            self._bases.pop(path, None)
+            self._generation[path] = self._generation.get(path, 0) + 1
+            self._dirty.add(path)
+        if pending:
+            self._ensure_flusher()
+        return len(pending)
+
+    def discard(self, path):
+        """Forget `path` entirely, pending changes included — it was deleted from storage."""
+        self._entries.pop(path, None)
+        self._versions.pop(path, None)
+        self._bases.pop(path, None)
+        self._dirty.discard(path)
+        if self._journal is not None and self._journal.last_seq(path):
+            self._journal.ack(path, self._journal.last_seq(path))
+
+    def invalidate(self, path=None):
+        """Drop clean cached copies so the next read goes to storage."""
+        paths = [path] if path else list(self._entries)
+        for p in paths:
+            if p not in self._dirty:
+                self._entries.pop(p, None)
+                self._versions.pop(p, None)
+
+    def snapshot_stats(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "cached": len(self._entries),
+            "dirty": len(self._dirty),
+        }
@@ -1,33 +1,171 @@
-# utils/fileIO.py — Final remote-only persistent storage with cross-repo support and debug logs
+# utils/fileIO.py — Persistent storage (STORAGE_BACKEND) behind an in-process write-back cache, with debug logs
 
-from utils.storageClient import load_file as remote_load, save_file as remote_save
+import copy
+from contextlib import asynccontextmanager
+
+from utils.storageClient import VersionConflict, PatchUnsupported
+from utils.storageBackends import make_backend, HttpBackend
+from utils.fileCache import FileCache
+from utils.journal import Journal
+from utils.merge import three_way_merge
+from utils.itemDictionary import compact
+from utils.jsonPatch import make_patch
+from utils.keyedLocks import KeyedLocks
+from utils.logPipeline import get_logger
+
+log = get_logger("fileIO")
+
+BACKEND = make_backend()
+
+async def _cache_loader(path):
+    log.debug("📡 Requesting remote load for: %s", path)
+    return await BACKEND.load(path)
+
+async def _cache_saver(path, data, version, base):
+    log.debug("📡 Requesting remote save for: %s", path)
+    try:
+        # Known remote version + the copy we changed: send only the changed fields
+        if version and base is not None:
+            ops = make_patch(base, data)
+            if not ops:
+                return True, version, data
+            try:
+                return True, await BACKEND.patch(path, ops, version), data
+            except PatchUnsupported:
+                pass
+        return True, await BACKEND.save(path, data, version), data
+    except VersionConflict:
+        # Another writer got there first: replay our change on their copy
+        log.info("🔀 Merging concurrent change into: %s", path)
+        merged, new_version = await BACKEND.update(path, lambda remote: three_way_merge(base, data, remote))
+        return True, new_version, merged
+
+async def _cache_batch_loader(paths):
+    log.debug("📡 Requesting remote batch load for %d file(s)", len(paths))
+    return await BACKEND.load_many(paths)
+
+JOURNAL = Journal()
+
+def _copy_entry(path, data):
+    # JSON documents are copied by compact(), which also points every catalog
+    # item name at one shared string — cheaper than deepcopy, and the cached
+    # player set takes about half the memory (devtools/bench_profile_memory.py)
+    return compact(data) if path.endswith(".json") else copy.deepcopy(data)
+
+CACHE = FileCache(_cache_loader, _cache_saver, three_way_merge, journal=JOURNAL,
+                  batch_loader=_cache_batch_loader, copier=_copy_entry)
+
+# Per-path locks for shared files (logs, cooldown tables) that several players write
+_file_locks = KeyedLocks()
 
 async def load_file(path, base_url_override=None):
     """
-    Loads file data from remote persistent storage.
-    Allows optional override of the base URL.
+    Loads file data, served from the in-process cache when possible.
+    Allows optional override of the base URL (bypasses the cache).
     """
-    print(f"📡 [fileIO] Requesting remote load for: {path}")
     try:
-        data = await remote_load(path, base_url_override=base_url_override)
-        print(f"✅ [fileIO] Successfully loaded: {path}")
-        return data
+        if base_url_override:
+            log.debug("📡 Requesting remote load for: %s", path)
+            data, _ = await HttpBackend(base_url_override).load(path)
+            return data
+        return await CACHE.load(path)
+    except FileNotFoundError:
+        # Expected: unregistered players, first boot before an index exists
+        log.debug("📭 Not in storage: %s", path)
+        raise
     except Exception as e:
-        print(f"❌ [fileIO] Failed to load {path}: {e}")
+        log.error("❌ Failed to load %s: %s", path, e)
         raise
 
 async def save_file(path, data, base_url_override=None):
     """
-    Saves file data to remote persistent storage.
-    Allows optional override of the base URL.
+    Saves file data. The write lands in the cache immediately and is flushed
+    to remote persistent storage in the background.
+    Allows optional override of the base URL (written through synchronously).
     """
-    print(f"📡 [fileIO] Requesting remote save for: {path}")
     try:
-        await remote_save(path, data, base_url_override=base_url_override)
-        print(f"✅ [fileIO] Successfully saved: {path}")
+        if base_url_override:
+            log.debug("📡 Requesting remote save for: %s", path)
+            await HttpBackend(base_url_override).save(path, data)
+            return
+        CACHE.save(path, data)
     except NotImplementedError:
-        print(f"⚠️ [fileIO] Remote save not supported yet for: {path}")
+        log.warning("⚠️ Remote save not supported yet for: %s", path)
         raise
     except Exception as e:
-        print(f"❌ [fileIO] Failed to save {path}: {e}")
+        log.error("❌ Failed to save %s: %s", path, e)
         raise
+
+async def load_many(paths, base_url_override=None):
+    """
+    Load several files at once: cache hits immediately, all misses in one batch.
+    Returns (loaded, errors): {path: data} and {path: exception} — one bad file
+    does not fail the rest.
+    """
+    if base_url_override:
+        fetched, errors = await HttpBackend(base_url_override).load_many(paths)
+        return {path: data for path, (data, _) in fetched.items()}, errors
+    loaded, errors = await CACHE.load_many(paths)
+    for path, e in errors.items():
+        if isinstance(e, FileNotFoundError):
+            log.debug("📭 Not in storage: %s", path)
+        else:
+            log.error("❌ Failed to load %s: %s", path, e)
+    return loaded, errors
+
+@asynccontextmanager
+async def file_transaction(path, default=None):
+    """
+    Read-modify-write of a shared file, one writer at a time in this process:
+
+        async with file_transaction("logs/turnin_log.json", {}) as logs:
+            logs.setdefault(uid, []).append(entry)
+
+    A missing file starts as `default`. The file is saved on a clean exit
+    only if it changed; an exception inside the block discards the changes.
+    Writes from other processes are merged when the cache flushes.
+    """
+    async with _file_locks.get(path):
+        try:
+            data = await load_file(path)
+        except FileNotFoundError:
+            data = None
+        if data is None:
+            data = default
+        before = _copy_entry(path, data)
+        yield data
+        if data != before:
+            CACHE.save(path, data)
+
+async def delete_file(path):
+    """
+    Remove a file from storage and from the cache.
+    Raises NotImplementedError when the backend cannot delete.
+    """
+    existed = await BACKEND.delete(path)
+    CACHE.discard(path)
+    return existed
+
+async def replay_journal() -> int:
+    """Re-queue writes a crash left unreplicated. Call once at boot, before anything reads."""
+    count = CACHE.replay()
+    if count:
+        log.info("📒 Replaying %d unreplicated write(s) to remote storage", count)
+    return count
+
+async def flush_cache():
+    """Write every pending change to remote storage now."""
+    await CACHE.flush()
+
+async def close_cache():
+    """Final flush on shutdown, then release the backend (closes the HTTP session)."""
+    await CACHE.close()
+    await BACKEND.close()
+
+def cache_stats() -> dict:
+    """Hit / miss / flush counters for monitoring."""
+    return CACHE.snapshot_stats()
+
+def replication_stats() -> dict:
+    """Journal backlog: writes not yet on remote storage and how long the oldest has waited."""
+    return JOURNAL.snapshot_stats()
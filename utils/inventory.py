@@ -1,8 +1,9 @@
 # utils/inventory.py — With persistent-ready structure
 
-from collections import Counter
-import random
+from collections import Counter, OrderedDict
 from utils.fileIO import load_file, save_file  # 📦 Add persistent support if needed later
+from utils.profileSchema import stash_from_list
+from utils.weightedSampler import AliasSampler
 
 def has_required_parts(user_parts: dict, requirements: dict) -> bool:
     """
@@ -23,14 +24,109 @@ def remove_parts(user_parts: dict, requirements: dict):
             if user_parts[part] <= 0:
                 del user_parts[part]
 
+# (rarity sequence, rarity weights) -> AliasSampler over list positions, least recently used first
+_CHOICE_SAMPLERS = OrderedDict()
+_CHOICE_SAMPLERS_MAX = 256
+
 def weighted_choice(loot_list, rarity_weights):
     """
     Selects one item (full dict) from a loot list based on rarity weighting.
     Each entry in loot_list must include 'item' and 'rarity'.
+
+    Thin wrapper over an alias sampler cached per rarity layout; pools that
+    live on the catalog (catalog.loot_sampler / blueprint_sampler) should be
+    drawn from directly.
+    """
+    rarities = tuple(entry["rarity"] for entry in loot_list)
+    key = (rarities, tuple(rarity_weights.items()))
+    sampler = _CHOICE_SAMPLERS.get(key)
+    if sampler is not None:
+        _CHOICE_SAMPLERS.move_to_end(key)
+    else:
+        sampler = _CHOICE_SAMPLERS[key] = AliasSampler(
+            range(len(rarities)), [rarity_weights.get(r, 0) for r in rarities]
+        )
+        if len(_CHOICE_SAMPLERS) > _CHOICE_SAMPLERS_MAX:
+            _CHOICE_SAMPLERS.popitem(last=False)
+    position = sampler.draw()
+    return loot_list[position] if position is not None else None
+
+class Stash:
+    """
+    A player's stash, stored in the profile as {item: quantity}. Wraps
+    profile["stash"] in place, so changes are saved with the profile:
+
+        stash = Stash(profile)
+        if stash.take_all({"Nails": 3, "Hammer": 1}):
+            stash.add("Fortified Wall")
+
+    Quantities never go below zero and emptied items are removed. Unmigrated
+    (list) stashes are converted on first use.
     """
-    weighted_items = []
-    for entry in loot_list:
-        rarity = entry["rarity"]
-        weight = rarity_weights.get(rarity, 0)
-        weighted_items.extend([entry] * weight)  # Append full entry, not just name
-    return random.choice(weighted_items) if weighted_items else None
+
+    __slots__ = ("_items",)
+
+    def __init__(self, profile: dict):
+        stash = profile.get("stash")
+        if not isinstance(stash, dict):
+            stash = profile["stash"] = stash_from_list(stash)
+        self._items = stash
+
+    def count(self, item: str) -> int:
+        return self._items.get(item, 0)
+
+    def __contains__(self, item: str) -> bool:
+        return self._items.get(item, 0) > 0
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def items(self):
+        return self._items.items()
+
+    def total(self) -> int:
+        """Units held across every item."""
+        return sum(self._items.values())
+
+    def add(self, item: str, qty: int = 1):
+        if qty > 0:
+            self._items[item] = self._items.get(item, 0) + qty
+
+    def add_all(self, items):
+        """Add an {item: qty} mapping or an iterable of item names (one unit each)."""
+        for item, qty in (items.items() if isinstance(items, dict) else Counter(items).items()):
+            self.add(item, qty)
+
+    def has_all(self, requirements) -> bool:
+        """True if every {item: qty} (or every listed name, one unit each) is held."""
+        if not isinstance(requirements, dict):
+            requirements = Counter(requirements)
+        return all(self._items.get(item, 0) >= qty for item, qty in requirements.items())
+
+    def take(self, item: str, qty: int = 1) -> bool:
+        """Remove `qty` of `item`; all or nothing. False (stash untouched) if there aren't enough."""
+        held = self._items.get(item, 0)
+        if held < qty:
+            return False
+        if held == qty:
+            del self._items[item]
+        else:
+            self._items[item] = held - qty
+        return True
+
+    def take_all(self, requirements) -> bool:
+        """take() for every {item: qty} at once — all or nothing."""
+        if not isinstance(requirements, dict):
+            requirements = Counter(requirements)
+        if not self.has_all(requirements):
+            return False
+        for item, qty in requirements.items():
+            self.take(item, qty)
+        return True
+
+    def units(self) -> list:
+        """One entry per unit held, e.g. for picking a random unit to steal."""
+        return [item for item, qty in self._items.items() for _ in range(qty)]
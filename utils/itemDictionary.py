@@ -0,0 +1,57 @@
+# utils/itemDictionary.py — One shared copy of every item name
+#
+# Profiles repeat the same few hundred names ("Reinforced Gate", "Nails", …)
+# in stashes, blueprints, crafted entries and crafted_log. Decoded from JSON,
+# every occurrence is its own string object (~50–80 bytes); after compact()
+# they all point at the one copy held here (8 bytes per reference).
+#
+# Names are registered from the catalog (items_master, the recipe files, car
+# parts, labskins — and "<X> Blueprint" for every recipe) on each catalog
+# load. Names are never dropped, so a shared copy stays valid for the life of
+# the process across catalog reloads.
+#
+# Profiles keep plain names: a reference to a shared string costs the same as
+# a reference to a small int, and handlers and embeds keep reading names.
+
+import sys
+import copy
+
+_shared = {}  # name -> canonical name
+_canon = _shared.get
+_SCALARS = frozenset((int, float, bool, type(None)))
+
+def register(names) -> int:
+    """Add names to the dictionary. Returns how many were new."""
+    added = 0
+    for name in names:
+        if isinstance(name, str) and name not in _shared:
+            name = sys.intern(name)
+            _shared[name] = name
+            added += 1
+    return added
+
+def register_catalog(catalog) -> int:
+    """Register every item name a catalog snapshot knows about."""
+    names = list(catalog.items_master) + list(catalog.car_parts) + list(catalog.labskins)
+    for recipe in catalog.all_recipes.values():
+        names += list(recipe.get("requirements", {})) + list(recipe.get("optional", {}))
+    for produced in catalog.produces:
+        names += [produced, f"{produced} Blueprint"]
+    return register(names)
+
+def compact(doc):
+    """
+    A copy of a JSON document — dicts and lists rebuilt (tuples become lists,
+    as they would on the wire), immutable values shared — with every known
+    item name, dict keys included, replaced by its shared copy.
+    """
+    kind = type(doc)
+    if kind is dict:
+        return {_canon(k, k) if type(k) is str else k: compact(v) for k, v in doc.items()}
+    if kind is list or kind is tuple:
+        return [compact(v) for v in doc]
+    if kind is str:
+        return _canon(doc, doc)
+    if kind in _SCALARS:
+        return doc
+    return copy.deepcopy(doc)  # anything else (Counter, custom types) is copied as before
@@ -0,0 +1,194 @@
+# utils/journal.py — Local write-ahead journal for the storage write-back cache
+#
+# Every cached save is appended here, so a crash or redeploy between the save
+# and the background flush to remote storage loses nothing. Appends are group
+# committed: append() only queues the encoded line, and one writer task writes
+# everything queued since its last pass and fsyncs it in a worker thread. The
+# command that saved never waits on the disk; its write is durable within one
+# fsync (milliseconds), long before the flush to remote storage that would make
+# it redundant. `await journal.sync()` waits for everything queued so far.
+# Lines are JSON:
+#   {"seq": 12, "path": "data/profiles/1.json", "data": {...}, "ts": 1700000000.0}
+#   {"ack": "data/profiles/1.json", "seq": 12}   ← replicated up to seq 12
+#
+# At boot, open() returns the newest un-acked entry per path for replay and
+# rewrites the file down to just those. Once everything is acked the file is
+# truncated; if it grows past JOURNAL_COMPACT_BYTES it is rewritten the same way.
+
+import os
+import time
+import asyncio
+
+from utils.logPipeline import get_logger
+from utils.jsonCodec import dumps, loads
+
+log = get_logger("journal")
+
+JOURNAL_PATH          = os.getenv("JOURNAL_PATH", "data/storage.journal")
+JOURNAL_COMPACT_BYTES = int(os.getenv("JOURNAL_COMPACT_BYTES", str(16 * 1024 * 1024)))
+
+class Journal:
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+        self._file = None
+        self._seq = 0
+        self._pending = {}  # path -> (last seq, time of the oldest un-acked write)
+        self._recovered = {}  # found at open(), until someone takes them for replay
+        self._queue = []      # encoded lines not yet handed to the writer
+        self._queued_sync = False  # the queue holds an append (acks alone need no fsync)
+        self._writer = None   # the task draining _queue
+        self._io = asyncio.Lock()  # one file operation at a time: a batch or a compaction
+        self._bytes = 0       # file size after the last write
+        self.stats = {"appends": 0, "acks": 0, "replayed": 0, "compactions": 0, "last_ack_at": None}
+
+    # ------------------------------ startup ------------------------------ #
+    def open(self) -> dict:
+        """Open the journal and return {path: (data, written_at)} still waiting for replication."""
+        if self._file is not None:
+            recovered, self._recovered = self._recovered, {}
+            return recovered
+        latest, acked = {}, {}
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                    except ValueError:
+                        break  # torn final write from a crash — everything before it is intact
+                    self._seq = max(self._seq, record.get("seq", 0))
+                    if "ack" in record:
+                        acked[record["ack"]] = max(acked.get(record["ack"], 0), record["seq"])
+                    else:
+                        latest[record["path"]] = record
+
+        unreplicated = {
+            path: record for path, record in latest.items() if record["seq"] > acked.get(path, 0)
+        }
+        self._rewrite(unreplicated.values())
+        self._pending = {r["path"]: (r["seq"], r.get("ts", time.time())) for r in unreplicated.values()}
+        self.stats["replayed"] = len(unreplicated)
+        if unreplicated:
+            log.warning("📒 %d unreplicated write(s) found in %s", len(unreplicated), self.path)
+        recovered = {path: (record["data"], record.get("ts", time.time())) for path, record in unreplicated.items()}
+        return recovered
+
+    def _rewrite(self, records):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            for record in records:
+                f.write(dumps(record) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, "ab")
+        self._bytes = self._file.tell()
+
+    # ------------------------------ writes ------------------------------- #
+    def _write_batch(self, lines: bytes, sync: bool, truncate: bool):
+        """Runs in a worker thread, never alongside another batch or a compaction."""
+        self._file.write(lines)
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        if truncate:  # everything journaled so far has reached remote storage
+            self._file.truncate(0)
+            self._file.seek(0)
+        self._bytes = self._file.tell()
+
+    def _enqueue(self, record: dict, sync: bool):
+        self._queue.append(dumps(record) + b"\n")
+        self._queued_sync = self._queued_sync or sync
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # no event loop (scripts, boot-time tools): write in place
+            self._take_batch_and_write()
+            return
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._drain())
+
+    def _take_batch(self):
+        lines, sync = b"".join(self._queue), self._queued_sync
+        self._queue, self._queued_sync = [], False
+        # Decided together with taking the batch: every append in it has been acked
+        return lines, sync, not self._pending
+
+    def _take_batch_and_write(self):
+        self._write_batch(*self._take_batch())
+
+    async def _drain(self):
+        while self._queue:
+            async with self._io:
+                if self._queue:
+                    await asyncio.to_thread(self._write_batch, *self._take_batch())
+
+    async def sync(self):
+        """Wait until everything appended so far is written (and fsync'd)."""
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def append(self, path: str, data) -> int:
+        """Record a write (durable once the writer's next fsync lands); returns its sequence number."""
+        if self._file is None:
+            self._recovered = self.open()  # kept for replay()
+        self._seq += 1
+        now = time.time()
+        self._enqueue({"seq": self._seq, "path": path, "data": data, "ts": now}, sync=True)
+        since = self._pending[path][1] if path in self._pending else now
+        self._pending[path] = (self._seq, since)
+        self.stats["appends"] += 1
+        return self._seq
+
+    def last_seq(self, path: str) -> int:
+        return self._pending.get(path, (0, 0))[0]
+
+    def ack(self, path: str, seq: int):
+        """Mark writes to `path` up to `seq` as replicated."""
+        pending = self._pending.get(path)
+        if pending is None or self._file is None:
+            return
+        self.stats["acks"] += 1
+        self.stats["last_ack_at"] = time.time()
+        if pending[0] <= seq:
+            del self._pending[path]
+        else:
+            self._pending[path] = (pending[0], time.time())  # newer writes are still queued
+        # Losing an ack only means a harmless re-send after a crash, so no fsync.
+        # Once nothing is pending the writer truncates the file after this line.
+        self._enqueue({"ack": path, "seq": seq}, sync=False)
+
+    async def compact(self, current: dict):
+        """Rewrite the file down to one entry per pending path, using `current` {path: data}."""
+        if self._file is None or self._bytes < JOURNAL_COMPACT_BYTES:
+            return
+        async with self._io:
+            records = [
+                {"seq": seq, "path": path, "data": current[path], "ts": since}
+                for path, (seq, since) in self._pending.items() if path in current
+            ]
+            # Queued lines are covered by the rewrite (appends) or harmless after it (acks)
+            await asyncio.to_thread(self._rewrite, records)
+        self.stats["compactions"] += 1
+        log.info("🗜️ Compacted to %d pending write(s)", len(records))
+
+    async def close(self):
+        """Write out everything queued, then close the file."""
+        await self.sync()
+        if self._queue and self._file is not None:
+            self._take_batch_and_write()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------------------ status ------------------------------- #
+    def snapshot_stats(self) -> dict:
+        oldest = min((since for _, since in self._pending.values()), default=None)
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "lag_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "bytes": self._bytes if self._file is not None else 0,
+        }
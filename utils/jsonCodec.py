@@ -0,0 +1,164 @@
+# utils/jsonCodec.py — One JSON codec for storage: orjson or msgspec when installed, stdlib json otherwise
+#
+#   JSON_CODEC        force "orjson" / "msgspec" / "json"             (default: fastest installed)
+#   JSON_LARGE_BYTES  bodies at least this big are decoded in a worker thread with the
+#                     cyclic GC paused; documents about this big are encoded member by
+#                     member, giving the event loop a turn between slices (default 256 KiB)
+#
+# The codecs hold the GIL for most of a call, so a worker thread only shortens
+# the loop's longest stall (about 40% for multi-megabyte decodes, per
+# devtools/bench_json_codec.py); the bigger wins are the faster codec, not
+# letting the GC rescan the heap every few thousand new containers during a big
+# decode, and slicing big encodes at member boundaries.
+#
+# Output is compact UTF-8 JSON bytes whichever codec is active. Documents the
+# fast codecs refuse (e.g. integers over 64 bits) fall back to stdlib json.
+
+import os
+import gc
+import json
+import time
+import asyncio
+
+JSON_LARGE_BYTES = int(os.getenv("JSON_LARGE_BYTES", str(256 * 1024)))
+SLICE_MIN_MEMBERS = 64  # smaller containers (a single profile) are encoded in one call
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+CODEC = os.getenv("JSON_CODEC") or ("orjson" if orjson else "msgspec" if msgspec else "json")
+
+if CODEC == "orjson" and orjson:
+    _fast_dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    _fast_loads = orjson.loads
+    _FAST_ERRORS = (TypeError, orjson.JSONEncodeError)
+elif CODEC == "msgspec" and msgspec:
+    _fast_dumps = msgspec.json.Encoder().encode
+    _msgspec_decode = msgspec.json.Decoder().decode
+
+    def _fast_loads(data):
+        try:
+            return _msgspec_decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None  # callers catch ValueError, as with json/orjson
+    _FAST_ERRORS = (TypeError, OverflowError, msgspec.EncodeError)
+else:
+    CODEC = "json"
+    _fast_dumps = _fast_loads = None
+    _FAST_ERRORS = ()
+
+_std_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# Time the event loop spent inside the codec for storage bodies, for /cachestats
+CODEC_STATS = {"decodes": 0, "encodes": 0, "large": 0, "offloaded": 0, "loop_seconds": 0.0, "max_stall_ms": 0.0}
+
+def _account(started: float):
+    spent = time.perf_counter() - started
+    CODEC_STATS["loop_seconds"] += spent
+    CODEC_STATS["max_stall_ms"] = max(CODEC_STATS["max_stall_ms"], spent * 1000)
+
+# ------------------------------- one-shot --------------------------------- #
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON."""
+    if _fast_dumps is not None:
+        try:
+            return _fast_dumps(obj)
+        except _FAST_ERRORS:
+            pass
+    return _std_encoder.encode(obj).encode("utf-8")
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if _fast_loads is not None:
+        return _fast_loads(data)
+    return json.loads(data)
+
+# ---------------------------- storage payloads ----------------------------- #
+
+def _decode_large(body):
+    paused = gc.isenabled()
+    if paused:
+        gc.disable()
+    try:
+        return loads(body)
+    finally:
+        if paused:
+            gc.enable()
+
+def decode(body) -> object:
+    """loads() for a storage body on the calling thread (GC paused for large ones); time is accounted."""
+    started = time.perf_counter()
+    large = len(body) >= JSON_LARGE_BYTES
+    try:
+        return _decode_large(body) if large else loads(body)
+    finally:
+        CODEC_STATS["decodes"] += 1
+        CODEC_STATS["large"] += large
+        _account(started)
+
+async def decode_async(body) -> object:
+    """decode(), handing bodies of JSON_LARGE_BYTES or more to a worker thread."""
+    if len(body) < JSON_LARGE_BYTES:
+        return decode(body)
+    CODEC_STATS["decodes"] += 1
+    CODEC_STATS["large"] += 1
+    CODEC_STATS["offloaded"] += 1
+    return await asyncio.to_thread(_decode_large, body)
+
+async def encode_chunks(obj, chunk_bytes: int = JSON_LARGE_BYTES):
+    """
+    Yield `obj` as compact JSON in pieces of roughly `chunk_bytes`, returning to
+    the event loop between pieces. A top-level dict or list is encoded one
+    member at a time, so a multi-megabyte document never stalls the loop for
+    longer than one slice; anything else is a single piece.
+    """
+    CODEC_STATS["encodes"] += 1
+    if not isinstance(obj, (dict, list)) or len(obj) < SLICE_MIN_MEMBERS:
+        started = time.perf_counter()
+        body = dumps(obj)
+        _account(started)
+        yield body
+        return
+
+    if isinstance(obj, dict):
+        opener, closer = b"{", b"}"
+        members = ((dumps(str(k)) + b":", v) for k, v in obj.items())
+    else:
+        opener, closer = b"[", b"]"
+        members = ((b"", v) for v in obj)
+
+    pending, size, first, sliced = [opener], 1, True, False
+    started = time.perf_counter()
+    for prefix, value in members:
+        if not first:
+            pending.append(b",")
+        first = False
+        piece = prefix + dumps(value)
+        pending.append(piece)
+        size += len(piece) + 1
+        if size >= chunk_bytes:
+            _account(started)
+            CODEC_STATS["large"] += not sliced
+            sliced = True
+            yield b"".join(pending)
+            await asyncio.sleep(0)
+            pending, size = [], 0
+            started = time.perf_counter()
+    pending.append(closer)
+    _account(started)
+    yield b"".join(pending)
+
+def codec_stats() -> dict:
+    calls = CODEC_STATS["decodes"] + CODEC_STATS["encodes"]
+    return {
+        **CODEC_STATS,
+        "codec": CODEC,
+        "avg_stall_ms": round(CODEC_STATS["loop_seconds"] * 1000 / calls, 3) if calls else 0.0,
+    }
@@ -0,0 +1,135 @@
+# utils/jsonPatch.py — RFC 6902 JSON Patch: diff two documents and apply a patch
+#
+# Used for delta saves: the cache diffs a dirty entry against the copy it was
+# loaded as and sends only the changed fields. apply_patch is what the storage
+# server (and devtools/storageStub.py) runs on the other end.
+
+import copy
+
+class PatchError(Exception):
+    """A patch could not be applied (bad path, failed test op, unknown op)."""
+
+def _escape(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+def make_patch(base, target, path: str = "") -> list:
+    """Return the operations that turn `base` into `target` ([] when equal)."""
+    if base == target:
+        return []
+    if type(base) is not type(target):
+        return [{"op": "replace", "path": path, "value": target}]
+
+    if isinstance(base, dict):
+        ops = []
+        for key in base:
+            if key not in target:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in base:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(base[key], value, child))
+        return ops
+
+    if isinstance(base, list):
+        # Diff the shared prefix element-wise, then trim or append at the tail —
+        # enough for the usual "append to / pop from a list" profile edits
+        ops = []
+        shared = min(len(base), len(target))
+        for i in range(shared):
+            ops.extend(make_patch(base[i], target[i], f"{path}/{i}"))
+        for i in range(len(base) - 1, shared - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for value in target[shared:]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        # A reshuffled list diffs into more ops than it is worth — send it whole
+        if len(ops) > max(1, len(target) // 2):
+            return [{"op": "replace", "path": path, "value": target}]
+        return ops
+
+    return [{"op": "replace", "path": path, "value": target}]
+
+def _walk(doc, path: str):
+    """Return (container, last token) for a JSON Pointer."""
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid pointer: {path!r}")
+    tokens = [_unescape(t) for t in path[1:].split("/")]
+    node = doc
+    for token in tokens[:-1]:
+        node = _child(node, token, path)
+    return node, tokens[-1]
+
+def _child(node, token, path):
+    try:
+        if isinstance(node, list):
+            return node[int(token)]
+        return node[token]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"Path not found: {path}")
+
+def _get(doc, path):
+    if path == "":
+        return doc
+    node, token = _walk(doc, path)
+    return _child(node, token, path)
+
+def _add(doc, path, value):
+    if path == "":
+        return value
+    node, token = _walk(doc, path)
+    if isinstance(node, list):
+        if token == "-":
+            node.append(value)
+        else:
+            index = int(token) if token.isdigit() else -1
+            if not 0 <= index <= len(node):
+                raise PatchError(f"Index out of range: {path}")
+            node.insert(index, value)
+    elif isinstance(node, dict):
+        node[token] = value
+    else:
+        raise PatchError(f"Cannot add into a scalar: {path}")
+    return doc
+
+def _remove(doc, path):
+    node, token = _walk(doc, path)
+    value = _child(node, token, path)
+    if isinstance(node, list):
+        del node[int(token)]
+    else:
+        del node[token]
+    return doc, value
+
+def apply_patch(doc, ops: list):
+    """Apply RFC 6902 operations to a copy of `doc` and return it. Raises PatchError."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        kind, path = op.get("op"), op.get("path")
+        if not isinstance(path, str):
+            raise PatchError(f"Missing path in {op!r}")
+        if kind == "add":
+            doc = _add(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            doc, _ = _remove(doc, path)
+        elif kind == "replace":
+            if path == "":
+                doc = copy.deepcopy(op["value"])
+            else:
+                _get(doc, path)  # must exist
+                doc, _ = _remove(doc, path)
+                doc = _add(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "move":
+            doc, value = _remove(doc, op["from"])
+            doc = _add(doc, path, value)
+        elif kind == "copy":
+            doc = _add(doc, path, copy.deepcopy(_get(doc, op["from"])))
+        elif kind == "test":
+            if _get(doc, path) != op.get("value"):
+                raise PatchError(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown op: {kind!r}")
+    return doc
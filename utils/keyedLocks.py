@@ -0,0 +1,22 @@
+# utils/keyedLocks.py — One asyncio.Lock per key, created on demand and dropped when unused
+#
+# Locks live in a WeakValueDictionary: while a task holds or waits on a key's
+# lock it stays referenced, and once nobody needs it the entry disappears, so
+# the table never grows with the number of players ever seen.
+
+import asyncio
+import weakref
+
+class KeyedLocks:
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+
+    def get(self, key) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def __len__(self):
+        return len(self._locks)
@@ -0,0 +1,164 @@
+# utils/logPipeline.py — Leveled, asynchronous logging: records are queued on the
+# event loop and formatted + written to stdout by a background listener thread
+#
+#   LOG_LEVEL             DEBUG / INFO / WARNING / ERROR              (default INFO)
+#   LOG_FORMAT            "text" (emoji lines) or "json" (JSON lines)  (default json in production)
+#   LOG_SAMPLE_EVERY      high-frequency messages tagged with SAMPLED are let through
+#                         1 in N per message template                 (default 100)
+#   LOG_PAYLOAD_PREVIEWS  debug previews of saved documents           (always off in production)
+#   WARLAB_ENV            "production" switches the defaults above; falls back to Railway's
+#                         RAILWAY_ENVIRONMENT
+#
+# Usage:
+#   log = get_logger("storageClient")
+#   log.debug("📥 Loading file from: %s", url)          ← formatted off-loop, only if enabled
+#   log.info("🔗 Joined in-flight load: %s", name, extra=SAMPLED)
+#
+# Pass plain values (strings, numbers, exceptions) as arguments, never live
+# documents: they are formatted later on the listener thread.
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+
+WARLAB_ENV   = os.getenv("WARLAB_ENV", os.getenv("RAILWAY_ENVIRONMENT", "development")).lower()
+PRODUCTION   = WARLAB_ENV == "production"
+LOG_LEVEL    = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT   = os.getenv("LOG_FORMAT", "json" if PRODUCTION else "text").lower()
+LOG_SAMPLE_EVERY = max(1, int(os.getenv("LOG_SAMPLE_EVERY", "100")))
+PAYLOAD_PREVIEWS = not PRODUCTION and os.getenv("LOG_PAYLOAD_PREVIEWS", "on").lower() in ("1", "on", "true", "yes")
+PREVIEW_CHARS = 300
+
+# extra= tag for messages that fire on every load/save/interaction
+SAMPLED = {"sample_every": LOG_SAMPLE_EVERY}
+
+ROOT_NAME = "warlab"
+
+_listener = None
+_queue_handler = None
+
+def get_logger(module: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_NAME}.{module}")
+
+# ------------------------------ producer side ------------------------------ #
+
+class _SamplingFilter(logging.Filter):
+    """Let 1 in `sample_every` records through per (logger, template); the kept one carries the rate."""
+
+    def __init__(self):
+        super().__init__()
+        self._seen = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, "sample_every", 1)
+        if every <= 1 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.msg)
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if seen % every:
+            self.dropped += 1
+            return False
+        record.sampled = every
+        return True
+
+class _LoopQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record as-is. The stock prepare() formats the message on the
+    calling thread (so records can be pickled); this queue never leaves the
+    process, so formatting is left to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+# ------------------------------ listener side ------------------------------ #
+
+def _short_name(name: str) -> str:
+    return name[len(ROOT_NAME) + 1:] if name.startswith(ROOT_NAME + ".") else name
+
+class TextFormatter(logging.Formatter):
+    """Keeps the familiar `📥 [storageClient] ...` console lines, with time and level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} [{_short_name(record.name)}] {record.getMessage()}"
+        if getattr(record, "sampled", None):
+            line += f"  (1/{record.sampled})"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log collectors."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": _short_name(record.name),
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "sampled", None):
+            entry["sampled"] = record.sampled
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+# ------------------------------- lifecycle -------------------------------- #
+
+def setup_logging(stream=None) -> logging.handlers.QueueListener:
+    """Route all logging through one queue to a background writer. Safe to call twice."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    records = queue.SimpleQueue()
+    _queue_handler = _LoopQueueHandler(records)
+    _queue_handler.addFilter(_SamplingFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+    # discord.py's gateway chatter stays at INFO even when we debug our own code
+    logging.getLogger("discord").setLevel(max(logging.getLevelName(LOG_LEVEL), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """Drain the queue and stop the writer thread (runs at exit too).
+    Anything logged afterwards is written directly."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+
+def payload_preview(data, limit: int = PREVIEW_CHARS):
+    """The first `limit` characters of `data` as JSON, or None when previews are off.
+
+    Encodes only as much of the document as the preview needs; guard calls with
+    log.isEnabledFor(logging.DEBUG) so nothing is encoded when debug is off."""
+    if not PAYLOAD_PREVIEWS:
+        return None
+    out, size = [], 0
+    for piece in json.JSONEncoder(separators=(",", ":"), default=str).iterencode(data):
+        out.append(piece)
+        size += len(piece)
+        if size >= limit:
+            break
+    return "".join(out)[:limit]
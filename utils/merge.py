@@ -0,0 +1,93 @@
+# utils/merge.py — Three-way merge of JSON documents (used to replay a local change on a newer remote copy)
+#
+# base   = the copy the change was made against
+# local  = base + our change
+# remote = what storage holds now (base + someone else's change)
+#
+# Our change is re-applied to remote field by field:
+#   • numbers   → the delta is added (coins +5 stays +5 even if remote moved)
+#   • lists     → items we added are appended, items we removed are removed once
+#   • dicts     → merged key by key; keys we deleted are dropped
+#   • quantity maps (dicts of positive ints, e.g. the stash) → per-key deltas,
+#               a missing key counting as 0; entries that reach 0 are dropped
+#   • the rest  → our value wins where we changed it, remote wins elsewhere
+
+import json
+from collections import Counter
+
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+def _key(x):
+    # List items may be dicts (e.g. crafted entries) — compare them by canonical JSON
+    try:
+        hash(x)
+        return x
+    except TypeError:
+        return json.dumps(x, sort_keys=True)
+
+def _is_quantity_map(*docs):
+    return all(
+        isinstance(d, dict) and all(isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in d.values())
+        for d in docs
+    )
+
+def _merge_quantities(base, local, remote):
+    merged = dict(remote)
+    for k in set(base) | set(local):
+        delta = local.get(k, 0) - base.get(k, 0)
+        if delta:
+            qty = merged.get(k, 0) + delta
+            if qty > 0:
+                merged[k] = qty
+            else:
+                merged.pop(k, None)
+    return merged
+
+def _merge_list(base, local, remote):
+    base_counts = Counter(_key(x) for x in base)
+    local_counts = Counter(_key(x) for x in local)
+    removed = base_counts - local_counts
+    added = local_counts - base_counts
+
+    merged = []
+    for item in remote:
+        k = _key(item)
+        if removed[k] > 0:
+            removed[k] -= 1
+            continue
+        merged.append(item)
+    for item in local:
+        k = _key(item)
+        if added[k] > 0:
+            added[k] -= 1
+            merged.append(item)
+    return merged
+
+def three_way_merge(base, local, remote):
+    if local == base:
+        return remote
+    if remote == base or remote is None:
+        return local
+
+    if _is_quantity_map(base, local, remote):
+        return _merge_quantities(base, local, remote)
+
+    if isinstance(base, dict) and isinstance(local, dict) and isinstance(remote, dict):
+        merged = dict(remote)
+        for k in set(base) | set(local):
+            if k not in local:
+                # We deleted it; keep remote's only if they changed it meanwhile
+                if k in merged and merged[k] == base.get(k):
+                    del merged[k]
+            elif k not in base or local[k] != base[k]:
+                merged[k] = three_way_merge(base.get(k), local[k], remote.get(k))
+        return merged
+
+    if isinstance(base, list) and isinstance(local, list) and isinstance(remote, list):
+        return _merge_list(base, local, remote)
+
+    if _is_number(base) and _is_number(local) and _is_number(remote):
+        return remote + (local - base)
+
+    return local
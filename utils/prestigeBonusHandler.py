@@ -17,7 +17,7 @@ def get_unlocked_features(prestige_level: int, profile: dict = None) -> list:
         bonuses.append("Warlab Exclusive Loot")
 
     # Optional logic for non-prestige bonuses (Dark Ops via raids)
-    if profile and profile.get("raidsSuccessful", 0) >= 25:
+    if profile and profile.get("successful_raids", 0) >= 25:
         bonuses.append("Dark Ops Lab Skin")
 
     return bonuses
@@ -39,4 +39,4 @@ def has_dark_ops_skin(profile: dict) -> bool:
     Returns True if the user has completed 25 or more successful raids.
     This logic is used to unlock the 'Dark Ops' labskin.
     """
-    return profile.get("raidsSuccessful", 0) >= 25
+    return profile.get("successful_raids", 0) >= 25
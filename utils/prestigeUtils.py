@@ -65,7 +65,7 @@ def get_prestige_class(user: dict):
     skin = user.get("skin")
     raids = user.get("successful_raids", 0)
     blueprints = user.get("blueprints", [])
-    scavenges = user.get("scavenges_completed", 0)
+    scavenges = user.get("scavenges", 0)
 
     if skin == "Dark Ops" and raids >= 25:
         return PRESTIGE_CLASSES[1]
@@ -1,35 +1,65 @@
-# utils/profileManager.py — Fully remote with persistent storage and debug logs
+# utils/profileManager.py — Per-user profile shards on remote persistent storage + debug logs
+#
+# Layout:
+#   data/profiles/<uid>.json   → one document per player
+#   data/profiles/index.json   → list of registered UIDs (used for leaderboards / admin sweeps)
+#
+# The old single-blob file (data/user_profiles.json) is migrated once at boot.
+# Older profile documents are upgraded on read (utils/profileSchema.py) and
+# written back in the new shape the next time they are saved. Readers get
+# utils/profileModel.Profile objects; storage only ever sees plain dicts.
+#
+# With PROFILE_BACKEND=sqlite the profiles live in a local SQLite database
+# (utils/profileStore.py) and the remote shards above become a write-behind
+# replica, kept only when PERSISTENT_DATA_URL is set. An empty database is
+# seeded from the remote shards on first boot.
 
+import os
 import time
-from utils.fileIO import load_file, save_file
+import asyncio
+from contextlib import asynccontextmanager
 
-PROFILE_PATH = "data/user_profiles.json"
+from utils.fileIO import load_file, save_file, delete_file, load_many, flush_cache, CACHE
+from utils.keyedLocks import KeyedLocks
+from utils.profileStore import ProfileStore, HOT_COLUMNS
+from utils.profileSchema import migrate_profile, PROFILE_SCHEMA_VERSION, SCHEMA_KEY
+from utils.profileModel import Profile
+from utils.itemDictionary import compact
+from utils.storageClient import storage_available, CircuitOpen
+from utils.logPipeline import get_logger
 
-async def _load():
-    print(f"📥 [ProfileManager] Loading all profiles from: {PROFILE_PATH}")
-    return await load_file(PROFILE_PATH)
+log = get_logger("ProfileManager")
 
-async def _save(data):
-    print(f"📤 [ProfileManager] Saving all profiles to: {PROFILE_PATH}")
-    await save_file(PROFILE_PATH, data)
+PROFILE_DIR = "data/profiles"
+PROFILE_INDEX_PATH = f"{PROFILE_DIR}/index.json"
+LEGACY_PROFILE_PATH = "data/user_profiles.json"
 
-async def get_profile(uid: str):
-    """Return profile dict or None if the user never registered."""
-    data = await _load()
-    return data.get(uid)
+# Max parallel shard writes during the legacy migration (reads go through fileIO.load_many)
+SWEEP_CONCURRENCY = 10
+
+PROFILE_BACKEND = os.getenv("PROFILE_BACKEND", "remote").lower()
+PROFILE_DB_PATH = os.getenv("PROFILE_DB_PATH", "data/warlab_profiles.db")
+
+_store = ProfileStore(PROFILE_DB_PATH) if PROFILE_BACKEND == "sqlite" else None
+# Shards are the primary copy, or a replica of the SQLite one if storage is configured explicitly
+_replicate = _store is None or bool(os.getenv("PERSISTENT_DATA_URL") or os.getenv("STORAGE_BACKEND"))
 
-async def create_profile(uid: str, username: str):
-    data = await _load()
-    if uid in data:
-        print(f"ℹ️ [ProfileManager] Profile already exists for UID: {uid}")
-        return data[uid]
+# Per-UID locks: one player's read-modify-write never interleaves with another
+# of their own, while different players proceed in parallel.
+_profile_locks = KeyedLocks()
 
-    data[uid] = {
+def profile_path(uid: str) -> str:
+    return f"{PROFILE_DIR}/{uid}.json"
+
+def default_profile(username: str) -> dict:
+    return {
+        SCHEMA_KEY: PROFILE_SCHEMA_VERSION,
         "username": username,
         "coins": 0,
         "materials": {},
         "blueprints": [],
         "tools": [],
+        "stash": {},  # item → quantity, see utils/inventory.Stash
         "prestige": 0,
         "rank_level": 0,
         "builds_completed": 0,
@@ -41,25 +71,242 @@ async def create_profile(uid: str, username: str):
         "created": str(int(time.time()))
     }
 
-    await _save(data)
-    print(f"✅ [ProfileManager] Created new profile for UID: {uid}")
-    return data[uid]
+# ----------------------------- index helpers ------------------------------ #
+
+async def list_profile_ids() -> list:
+    """Return every registered UID (empty list if the index does not exist yet)."""
+    if _store is not None:
+        return await asyncio.to_thread(_store.ids)
+    try:
+        index = await load_file(PROFILE_INDEX_PATH)
+    except FileNotFoundError:
+        return []
+    return list(index) if isinstance(index, list) else []
+
+async def _index_add(uid: str):
+    if _store is not None:
+        # The database is its own index; just keep the replica's copy current
+        if _replicate:
+            await save_file(PROFILE_INDEX_PATH, await asyncio.to_thread(_store.ids))
+        return
+    ids = await list_profile_ids()
+    if uid not in ids:
+        ids.append(uid)
+        await save_file(PROFILE_INDEX_PATH, ids)
+
+async def _index_remove(uid: str):
+    if _store is not None:
+        if _replicate:
+            await save_file(PROFILE_INDEX_PATH, await asyncio.to_thread(_store.ids))
+        return
+    ids = await list_profile_ids()
+    if uid in ids:
+        ids.remove(uid)
+        await save_file(PROFILE_INDEX_PATH, ids)
+
+# ------------------------------ profile API ------------------------------- #
+
+async def get_profile(uid: str):
+    """Return the player's Profile, or None if the user never registered."""
+    if _store is not None:
+        profile = await asyncio.to_thread(_store.get, uid)
+    else:
+        try:
+            profile = await load_file(profile_path(uid))
+        except FileNotFoundError:
+            return None
+    return Profile.from_dict(profile) if profile else None
+
+async def save_profile(uid: str, profile):
+    """Persist a single player's profile shard (a Profile or a raw profile dict)."""
+    log.debug("📤 Saving profile shard for UID: %s", uid)
+    profile = profile.to_dict() if isinstance(profile, Profile) else profile
+    migrate_profile(profile)
+    if _store is not None:
+        await asyncio.to_thread(_store.put, uid, profile)
+    if _replicate:
+        await save_file(profile_path(uid), profile)
+
+@asynccontextmanager
+async def profile_transaction(uid: str):
+    """
+    Atomic read-modify-write of one player's profile:
+
+        async with profile_transaction(uid) as profile:
+            if profile is None: ...   # not registered
+            profile["coins"] += 5
+
+    The profile is saved on a clean exit only if it actually changed; an
+    exception inside the block discards the changes. Do not nest transactions
+    for the same UID.
+
+    Raises CircuitOpen while storage is down: changes made against a stale
+    cached copy are refused rather than queued.
+    """
+    if not storage_available():
+        raise CircuitOpen("Storage is unavailable — changes are paused")
+    async with _profile_locks.get(uid):
+        profile = await get_profile(uid)
+        before = compact(profile.to_dict()) if profile is not None else None
+        yield profile
+        if profile is not None and profile.to_dict() != before:
+            await save_profile(uid, profile)
+
+async def create_profile(uid: str, username: str, profile: dict = None):
+    async with _profile_locks.get(uid):
+        existing = await get_profile(uid)
+        if existing:
+            log.info("ℹ️ Profile already exists for UID: %s", uid)
+            return existing
+
+        profile = Profile.from_dict(profile if profile is not None else default_profile(username))
+        await save_profile(uid, profile)
+        async with _profile_locks.get(PROFILE_INDEX_PATH):
+            await _index_add(uid)
+        log.info("✅ Created new profile for UID: %s", uid)
+        return profile
 
 async def update_profile(uid: str, updates: dict):
     """Safely update a user profile with new data."""
-    data = await _load()
-    if uid not in data:
-        print(f"❌ [ProfileManager] No profile found for UID: {uid}")
-        return None
+    async with profile_transaction(uid) as profile:
+        if profile is None:
+            log.warning("❌ No profile found for UID: %s", uid)
+            return None
 
-    profile = data[uid]
+        # Sync prestige to rank_level if applicable
+        if "prestige" in updates:
+            updates["rank_level"] = updates["prestige"]
 
-    # Sync prestige to rank_level if applicable
-    if "prestige" in updates:
-        updates["rank_level"] = updates["prestige"]
-
-    profile.update(updates)
-    data[uid] = profile
-    await _save(data)
-    print(f"🛠️ [ProfileManager] Updated profile for UID: {uid}")
+        profile.update(updates)
+    log.debug("🛠️ Updated profile for UID: %s", uid)
     return profile
+
+async def delete_profile(uid: str) -> bool:
+    """Unregister a player: the shard is deleted (blanked where storage has no DELETE) and dropped from the index."""
+    async with _profile_locks.get(uid):
+        if await get_profile(uid) is None:
+            return False
+        if _store is not None:
+            await asyncio.to_thread(_store.delete, uid)
+        if _replicate:
+            try:
+                deleted = await delete_file(profile_path(uid))
+            except NotImplementedError:
+                deleted = False
+            if not deleted:  # a blank shard reads as "not registered" too
+                await save_file(profile_path(uid), {})
+        async with _profile_locks.get(PROFILE_INDEX_PATH):
+            await _index_remove(uid)
+    log.info("🗑️ Deleted profile for UID: %s", uid)
+    return True
+
+async def load_all_profiles() -> dict:
+    """
+    Load every registered profile as {uid: Profile}.
+    Only used by guild-wide views (listregistered, backups, nuke).
+    """
+    if _store is not None:
+        profiles = await asyncio.to_thread(_store.all)
+    else:
+        profiles = await _load_shards(await list_profile_ids())
+    return {uid: Profile.from_dict(profile) for uid, profile in profiles.items()}
+
+async def _load_shards(ids) -> dict:
+    """{uid: profile} for the given UIDs, fetched in batches. Missing or blank shards are skipped."""
+    loaded, errors = await load_many([profile_path(uid) for uid in ids])
+    for error in errors.values():
+        if not isinstance(error, FileNotFoundError):
+            raise error  # a partial sweep would silently drop players from backups and resets
+    return {uid: loaded[profile_path(uid)] for uid in ids if loaded.get(profile_path(uid))}
+
+async def top_profiles(field: str, limit: int = 3) -> list:
+    """[(uid, profile)] with the highest `field`, best first."""
+    return (await top_profiles_by((field,), limit))[field]
+
+async def top_profiles_by(fields, limit: int = 3) -> dict:
+    """
+    {field: [(uid, profile)] with the highest values, best first} for several
+    rankings at once. Indexed in SQLite; the remote backend sweeps every shard
+    once and sorts that one set per field.
+    """
+    fields = tuple(fields)
+    if _store is not None and all(field in HOT_COLUMNS for field in fields):
+        ranked = {}
+        for field in fields:
+            rows = await asyncio.to_thread(_store.top, field, limit)
+            ranked[field] = [(uid, Profile.from_dict(profile)) for uid, profile in rows]
+        return ranked
+
+    profiles = list((await load_all_profiles()).items())
+
+    def _key(field):
+        def key(item):
+            value = item[1].get(field, 0)
+            return value if isinstance(value, (int, float)) else 0
+        return key
+
+    return {field: sorted(profiles, key=_key(field), reverse=True)[:limit] for field in fields}
+
+# ------------------------------- migration -------------------------------- #
+
+async def _seed_store():
+    """Copy the remote profiles into an empty SQLite database (first boot on this backend)."""
+    if not _replicate or await asyncio.to_thread(_store.count):
+        return
+    try:
+        ids = await load_file(PROFILE_INDEX_PATH)
+    except FileNotFoundError:
+        ids = None
+
+    if isinstance(ids, list):
+        profiles = await _load_shards(ids)
+    else:
+        try:
+            profiles = await load_file(LEGACY_PROFILE_PATH) or {}
+        except FileNotFoundError:
+            profiles = {}
+
+    profiles = {uid: p for uid, p in (profiles.items() if isinstance(profiles, dict) else []) if isinstance(p, dict) and p}
+    for profile in profiles.values():
+        migrate_profile(profile)  # the indexed columns read the current field names
+    await asyncio.to_thread(_store.put_many, profiles)
+    for uid in profiles:
+        CACHE.invalidate(profile_path(uid))  # the database has them now
+    log.info("🚚 Seeded %d profiles into %s", len(profiles), PROFILE_DB_PATH)
+
+async def migrate_legacy_profiles():
+    """
+    One-time split of data/user_profiles.json into per-user shards.
+    The index is written last, so an interrupted migration simply re-runs next boot.
+    On the SQLite backend this seeds an empty database from remote storage instead.
+    """
+    if _store is not None:
+        await _seed_store()
+        return
+
+    try:
+        await load_file(PROFILE_INDEX_PATH)
+        return  # already sharded
+    except FileNotFoundError:
+        pass
+
+    try:
+        legacy = await load_file(LEGACY_PROFILE_PATH) or {}
+    except FileNotFoundError:
+        legacy = {}
+
+    if not isinstance(legacy, dict):
+        legacy = {}
+
+    log.info("🚚 Migrating %d legacy profiles to %s/", len(legacy), PROFILE_DIR)
+    sem = asyncio.Semaphore(SWEEP_CONCURRENCY)
+
+    async def _one(uid, profile):
+        async with sem:
+            await save_profile(uid, profile)
+
+    await asyncio.gather(*(_one(uid, p) for uid, p in legacy.items() if isinstance(p, dict)))
+    await flush_cache()  # shards must be durable before the index marks the migration done
+    await save_file(PROFILE_INDEX_PATH, [uid for uid, p in legacy.items() if isinstance(p, dict)])
+    await flush_cache()
+    log.info("✅ Legacy profile migration complete.")
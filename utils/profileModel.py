@@ -0,0 +1,199 @@
+# utils/profileModel.py — Profile: a slotted, typed player profile built once per load
+#
+# profileManager hands out Profile objects instead of raw dicts. from_dict()
+# upgrades the document (utils/profileSchema.py, which also folds drifted
+# legacy field names) and fills every missing field with its default in one
+# pass, so handlers no longer setdefault() the same keys on every command:
+#
+#     profile.coins += 5
+#     Stash(profile).add("Nails")
+#
+# The common fields live in __slots__; anything else a handler stores
+# (activeSkin, last_task, purchasedToday, …) goes to a small overflow dict.
+# Profile still behaves like a dict — profile["coins"], .get(), .setdefault(),
+# .update(), `in`, iteration — so older handlers keep working unchanged.
+# Through that interface a field exists only once it has been stored or
+# assigned, or holds something other than its default: `"x" in profile` and
+# profile.get("x", fallback) answer as they did on the raw document.
+# Attribute access always sees the default.
+#
+# to_dict() is what gets stored: the same present fields plus the overflow
+# keys, referencing the profile's own values (no copying), which the cache
+# then copies once on its way in. Untouched defaults are never written out.
+
+import copy
+from collections.abc import MutableMapping
+
+from utils.profileSchema import migrate_profile, FIELD_ALIASES, PROFILE_SCHEMA_VERSION, SCHEMA_KEY
+
+# field -> default; mutable defaults are built fresh per profile
+FIELDS = {
+    SCHEMA_KEY:           PROFILE_SCHEMA_VERSION,
+    "username":           "",
+    "coins":              0,
+    "prestige":           0,
+    "prestige_points":    0,
+    "rank_level":         0,
+    "builds_completed":   0,
+    "turnins":            0,
+    "turnins_completed":  0,
+    "tasks_completed":    0,
+    "scavenges":          0,
+    "successful_raids":   0,
+    "stash_hp":           0,
+    "last_scavenge":      None,
+    "stash":              dict,   # item → quantity (utils/inventory.Stash)
+    "materials":          dict,
+    "boosts":             dict,
+    "reinforcements":     dict,   # e.g. {"Barbed Fence": 2, "Guard Dog": 1}
+    "blueprints":         list,
+    "tools":              list,
+    "labskins":           list,
+    "crafted":            list,   # [{"item": ..., "optional": [...]}] awaiting turn-in
+    "crafted_log":        list,
+}
+
+def _default(field):
+    default = FIELDS[field]
+    return default() if callable(default) else default
+
+# Defaults to compare against; never handed out, so never mutated
+_BLANK = {field: _default(field) for field in FIELDS}
+
+class Profile(MutableMapping):
+    __slots__ = tuple(FIELDS) + ("_extra", "_given")
+
+    schema: int
+    username: str
+    coins: int
+    prestige: int
+    prestige_points: int
+    rank_level: int
+    builds_completed: int
+    turnins: int
+    turnins_completed: int
+    tasks_completed: int
+    scavenges: int
+    successful_raids: int
+    stash_hp: int
+    last_scavenge: str  # ISO timestamp; None until the first scavenge
+    stash: dict
+    materials: dict
+    boosts: dict
+    reinforcements: dict
+    blueprints: list
+    tools: list
+    labskins: list
+    crafted: list
+    crafted_log: list
+
+    def __init__(self, **values):
+        self._extra = {}
+        self._given = {SCHEMA_KEY}
+        for field in FIELDS:
+            setattr(self, field, _default(field))
+        for key, value in values.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, doc: dict) -> "Profile":
+        """Build from a stored document (taken over, not copied): upgraded, aliased and defaulted in one pass."""
+        migrate_profile(doc)
+        self = cls.__new__(cls)
+        extra = self._extra = {}
+        given = self._given = set()
+        for key, value in doc.items():
+            if key in FIELDS:
+                setattr(self, key, value)
+                given.add(key)
+            else:
+                extra[key] = value
+        for field in FIELDS:
+            if field not in doc:
+                setattr(self, field, _default(field))
+        return self
+
+    def _has(self, field) -> bool:
+        return field in self._given or getattr(self, field) != _BLANK[field]
+
+    def to_dict(self) -> dict:
+        """The stored form: present fields plus the overflow keys, values shared with this profile."""
+        doc = {field: getattr(self, field) for field in FIELDS if self._has(field)}
+        doc.update(self._extra)
+        return doc
+
+    # ------------------------- dict compatibility ------------------------- #
+    def __getitem__(self, key):
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            setattr(self, key, value)
+            self._given.add(key)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        """Fields go back to their default (and out of the stored form); overflow keys are removed."""
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            if not self._has(key):
+                raise KeyError(key)
+            setattr(self, key, _default(key))
+            self._given.discard(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            return self._has(key)
+        return key in self._extra
+
+    def __iter__(self):
+        yield from (field for field in FIELDS if self._has(field))
+        yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            return getattr(self, key) if self._has(key) else default
+        return self._extra.get(key, default)
+
+    def setdefault(self, key, default=None):
+        """A missing field is stored as `default` (its own default when that is None)."""
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS:
+            if not self._has(key):
+                self[key] = _default(key) if default is None else default
+            return getattr(self, key)
+        return self._extra.setdefault(key, default)
+
+    def clear(self):
+        """Reset every field to its default and drop the overflow keys."""
+        for field in FIELDS:
+            setattr(self, field, _default(field))
+        self._extra = {}
+        self._given = {SCHEMA_KEY}
+
+    def __eq__(self, other):
+        if isinstance(other, Profile):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo):
+        return Profile.from_dict(copy.deepcopy(self.to_dict(), memo))
+
+    def __repr__(self):
+        return f"Profile({self.to_dict()!r})"
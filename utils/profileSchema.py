@@ -0,0 +1,61 @@
+# utils/profileSchema.py — Versioned profile documents, upgraded lazily on read
+#
+# Every profile carries "schema": <version>. Documents written before versioning
+# have no key and count as version 1. profileManager runs migrate_profile() on
+# every profile it hands out; the upgraded document reaches storage the next
+# time that profile is saved, so nothing is rewritten in bulk.
+#
+#   v1 → v2   "stash" goes from one string per unit (["Nails", "Nails", "Hammer"])
+#             to an item → quantity map ({"Nails": 2, "Hammer": 1})
+#   v2 → v3   counters written under drifted names are folded into one field
+#             (see FIELD_ALIASES): raids_successful / raidsSuccessful → successful_raids,
+#             scavenges_completed → scavenges
+
+from collections import Counter
+
+SCHEMA_KEY = "schema"
+PROFILE_SCHEMA_VERSION = 3
+
+# Legacy field name → the field it always meant
+FIELD_ALIASES = {
+    "raids_successful": "successful_raids",
+    "raidsSuccessful": "successful_raids",
+    "scavenges_completed": "scavenges",
+}
+
+def stash_from_list(units) -> dict:
+    """{item: qty} from the v1 one-string-per-unit list (anything else becomes empty)."""
+    if isinstance(units, dict):
+        return {item: int(qty) for item, qty in units.items() if int(qty) > 0}
+    if not isinstance(units, list):
+        return {}
+    return dict(Counter(u for u in units if isinstance(u, str)))
+
+def _v1_to_v2(profile: dict):
+    profile["stash"] = stash_from_list(profile.get("stash"))
+
+def _v2_to_v3(profile: dict):
+    for alias, field in FIELD_ALIASES.items():
+        if alias in profile:
+            legacy = profile.pop(alias)
+            if isinstance(legacy, int) and legacy > (profile.get(field) or 0):
+                profile[field] = legacy
+
+# version → upgrade to version + 1
+MIGRATIONS = {
+    1: _v1_to_v2,
+    2: _v2_to_v3,
+}
+
+def migrate_profile(profile: dict) -> bool:
+    """Upgrade `profile` in place to PROFILE_SCHEMA_VERSION. Returns True if anything changed."""
+    if not profile:
+        return False
+    version = profile.get(SCHEMA_KEY, 1)
+    if version >= PROFILE_SCHEMA_VERSION:
+        return False
+    while version < PROFILE_SCHEMA_VERSION:
+        MIGRATIONS[version](profile)
+        version += 1
+    profile[SCHEMA_KEY] = version
+    return True
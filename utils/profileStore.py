@@ -0,0 +1,129 @@
+# utils/profileStore.py — Local SQLite profile database (WAL mode) with indexed hot columns
+#
+# One row per player. The full profile document lives in the `data` JSON column;
+# the fields leaderboards sort on are mirrored into real, indexed columns so
+# those queries never have to parse a document.
+#
+# Methods are synchronous and safe to call from any thread (one connection,
+# serialised by a lock). profileManager runs them through asyncio.to_thread,
+# so a slow disk or a WAL checkpoint never stalls the event loop.
+
+import os
+import time
+import sqlite3
+import threading
+
+from utils.logPipeline import get_logger
+from utils.jsonCodec import dumps, loads
+
+log = get_logger("profileStore")
+
+HOT_COLUMNS = ("coins", "prestige_points", "successful_raids", "builds_completed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    uid              TEXT PRIMARY KEY,
+    coins            INTEGER NOT NULL DEFAULT 0,
+    prestige_points  INTEGER NOT NULL DEFAULT 0,
+    successful_raids INTEGER NOT NULL DEFAULT 0,
+    builds_completed INTEGER NOT NULL DEFAULT 0,
+    data             TEXT NOT NULL,
+    updated_at       REAL NOT NULL
+);
+DROP INDEX IF EXISTS idx_profiles_last_scavenge;
+""" + "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_profiles_{col} ON profiles({col});\n" for col in HOT_COLUMNS
+)
+
+_UPSERT = f"""
+INSERT INTO profiles (uid, {", ".join(HOT_COLUMNS)}, data, updated_at)
+VALUES (?, {", ".join("?" for _ in HOT_COLUMNS)}, ?, ?)
+ON CONFLICT(uid) DO UPDATE SET
+    {", ".join(f"{col} = excluded.{col}" for col in HOT_COLUMNS)},
+    data = excluded.data, updated_at = excluded.updated_at
+"""
+
+def _as_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _row(uid: str, profile: dict) -> tuple:
+    return (
+        uid,
+        _as_int(profile.get("coins")),
+        _as_int(profile.get("prestige_points")),
+        _as_int(profile.get("successful_raids")),
+        _as_int(profile.get("builds_completed")),
+        dumps(profile).decode("utf-8"),
+        time.time(),
+    )
+
+class ProfileStore:
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # autocommit (batches use BEGIN explicitly); used from worker threads, one at a time
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints, never corrupt
+        self._db.executescript(_SCHEMA)
+        log.info("🗃️ Opened %s (%d profiles)", path, self.count())
+
+    # ------------------------------ reads -------------------------------- #
+    def get(self, uid: str):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM profiles WHERE uid = ?", (uid,)).fetchone()
+        return loads(row[0]) if row else None
+
+    def ids(self) -> list:
+        with self._lock:
+            return [uid for (uid,) in self._db.execute("SELECT uid FROM profiles ORDER BY rowid")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def all(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT uid, data FROM profiles").fetchall()
+        return {uid: loads(data) for uid, data in rows}
+
+    def top(self, column: str, limit: int) -> list:
+        """[(uid, profile)] with the highest `column`, served from its index."""
+        if column not in HOT_COLUMNS:
+            raise ValueError(f"{column} is not an indexed profile column")
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT uid, data FROM profiles ORDER BY {column} DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [(uid, loads(data)) for uid, data in rows]
+
+    # ------------------------------ writes ------------------------------- #
+    def put(self, uid: str, profile: dict):
+        row = _row(uid, profile)
+        with self._lock:
+            self._db.execute(_UPSERT, row)
+
+    def put_many(self, profiles: dict):
+        """Upsert {uid: profile} in one transaction."""
+        rows = [_row(uid, p) for uid, p in profiles.items()]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(_UPSERT, rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete(self, uid: str) -> bool:
+        with self._lock:
+            return self._db.execute("DELETE FROM profiles WHERE uid = ?", (uid,)).rowcount > 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
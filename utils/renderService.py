@@ -0,0 +1,172 @@
+# utils/renderService.py — Stash and raid image rendering in a pool of worker processes
+#
+# Pillow work is CPU-bound: on the event loop it stalls every command and the
+# gateway heartbeat, and in threads it fights over the GIL. Renders run in a
+# ProcessPoolExecutor instead:
+#   • at most RENDER_WORKERS jobs run at once, RENDER_QUEUE_SIZE more may wait,
+#     anything beyond that is rejected straight away (RenderBusy)
+#   • each job has a timeout; a timed-out or crashed pool is torn down and rebuilt
+#   • workers are replaced after RENDER_RECYCLE_AFTER jobs to cap memory growth
+# Stash render cache lookups stay in the bot process, so hits never touch the pool.
+
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import stash_image_generator as stash_gen
+import raid_overlay_generator as overlay_gen
+from utils.logPipeline import get_logger
+
+log = get_logger("renderService")
+
+RENDER_WORKERS       = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_QUEUE_SIZE    = int(os.getenv("RENDER_QUEUE_SIZE", "8"))
+RENDER_QUEUE_WAIT    = float(os.getenv("RENDER_QUEUE_WAIT_SECONDS", "20"))
+RENDER_TIMEOUT       = float(os.getenv("RENDER_TIMEOUT_SECONDS", "30"))
+RENDER_RECYCLE_AFTER = int(os.getenv("RENDER_RECYCLE_AFTER", "50"))
+
+class RenderError(Exception):
+    """A render could not be produced."""
+
+class RenderBusy(RenderError):
+    """Too many renders queued — try again shortly."""
+
+class RenderTimeout(RenderError):
+    """A render ran longer than RENDER_TIMEOUT."""
+
+def _init_worker():
+    # Decode the stash layers once per worker instead of once per job
+    stash_gen.get_atlas()
+
+class RenderService:
+    def __init__(self, workers=RENDER_WORKERS, queue_size=RENDER_QUEUE_SIZE, timeout=RENDER_TIMEOUT,
+                 recycle_after=RENDER_RECYCLE_AFTER):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.recycle_after = recycle_after
+        self._executor = None
+        self._slots = asyncio.Semaphore(workers)
+        self._admitted = 0   # jobs running or waiting for a worker
+        self._inflight = {}  # stash render name -> task, so identical renders run once
+        self.stats = {"jobs": 0, "failures": 0, "timeouts": 0, "rejected": 0, "pool_resets": 0, "coalesced": 0}
+
+    # ----------------------------- pool plumbing ----------------------------- #
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                max_tasks_per_child=self.recycle_after,
+            )
+            log.info("🏭 Started %d render worker(s)", self.workers)
+        return self._executor
+
+    def _reset_pool(self, executor, reason: str):
+        if executor is None or self._executor is not executor:
+            return  # already replaced by another failing job
+        self._executor = None
+        self.stats["pool_resets"] += 1
+        log.warning("♻️ Rebuilding worker pool: %s", reason)
+        # A stuck worker never returns on its own — terminate it
+        for proc in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args, timeout=-1):
+        if self._admitted >= self.workers + self.queue_size:
+            self.stats["rejected"] += 1
+            raise RenderBusy("Render queue is full")
+
+        self._admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), RENDER_QUEUE_WAIT)
+            except asyncio.TimeoutError:
+                self.stats["rejected"] += 1
+                raise RenderBusy("Timed out waiting for a render worker")
+            try:
+                return await self._execute(fn, args, timeout)
+            finally:
+                self._slots.release()
+        finally:
+            self._admitted -= 1
+
+    async def _execute(self, fn, args, timeout):
+        executor = None
+        try:
+            executor = self._pool()
+            self.stats["jobs"] += 1
+            future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            return await asyncio.wait_for(future, self.timeout if timeout == -1 else timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self._reset_pool(executor, f"{fn.__name__} timed out")
+            raise RenderTimeout(f"{fn.__name__} took longer than {self.timeout}s")
+        except BrokenProcessPool as e:
+            self.stats["failures"] += 1
+            self._reset_pool(executor, "worker died")
+            raise RenderError(f"Render worker died: {e}")
+
+    # ---------------------------------- API ---------------------------------- #
+    async def stash_image(self, user_id: str, reinforcements: dict,
+                          base_path: str = stash_gen.DEFAULT_LAYERS_DIR, baseImagePath: str = None) -> str:
+        """Async generate_stash_image: cache hit in-process, miss rendered in a worker. None on bad input."""
+        try:
+            base_image = stash_gen.resolve_base_image(base_path, baseImagePath)
+        except FileNotFoundError as e:
+            log.error("❌ Error generating stash image: %s", e)
+            return None
+
+        reinforcements = dict(reinforcements)
+        name = stash_gen.render_cache_name(reinforcements, base_image, base_path)
+        cached = stash_gen.lookup_render(name)
+        if cached:
+            log.debug("⚡ Stash render cache hit for %s: %s", user_id, cached)
+            return cached
+
+        task = self._inflight.get(name)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(
+                self._run(stash_gen.render_stash_file, reinforcements, base_image, base_path, name)
+            )
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        path = await asyncio.shield(task)
+        stash_gen.record_render(name)
+        return path
+
+    async def merge_overlay(self, base_path: str, overlay_path: str, out_path: str) -> str:
+        """Async raid_overlay_generator.merge_overlay."""
+        return await self._run(overlay_gen.merge_overlay, base_path, overlay_path, out_path)
+
+    async def warm(self):
+        """Build the overlay frame files once so fresh workers load them instead of decoding GIFs."""
+        await self._run(overlay_gen.warm_overlay_cache, timeout=None)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def snapshot_stats(self) -> dict:
+        return {**self.stats, "queued": self._admitted, "inflight_stash": len(self._inflight)}
+
+RENDERER = RenderService()
+
+async def render_stash_image(user_id, reinforcements, base_path=stash_gen.DEFAULT_LAYERS_DIR, baseImagePath=None):
+    return await RENDERER.stash_image(user_id, reinforcements, base_path=base_path, baseImagePath=baseImagePath)
+
+async def render_raid_overlay(base_path, overlay_path, out_path):
+    return await RENDERER.merge_overlay(base_path, overlay_path, out_path)
+
+def render_stats() -> dict:
+    return RENDERER.snapshot_stats()
@@ -0,0 +1,305 @@
+# utils/storageBackends.py — Interchangeable stores behind the file cache: HTTP, local filesystem, memory
+#
+#   STORAGE_BACKEND   "http"        the remote persistent storage server (utils/storageClient.py)
+#                     "filesystem"  files under STORAGE_FS_ROOT, written with an atomic rename — dev only
+#                     "memory"      a dict in this process — benchmarks and throwaway runs
+#   Default: http when PERSISTENT_DATA_URL is set. With neither variable set the
+#   bot refuses to start rather than keep player data on the container's disk.
+#
+# Every backend speaks the same protocol; data in and out is the decoded
+# document, versions are opaque strings (ETags over HTTP, content hashes locally):
+#   load(name)                 -> (data, version)     FileNotFoundError when missing
+#   save(name, data, version)  -> new version         VersionConflict if `version` is stale
+#   patch(name, ops, version)  -> new version         PatchUnsupported → caller saves in full
+#   list(prefix)               -> [names]
+#   delete(name)               -> True if it existed
+# Operations a backend cannot do raise NotImplementedError. The remote storage
+# server has no listing endpoint, so HTTP cannot list(): code that needs every
+# name keeps an index file instead (data/profiles/index.json).
+
+import os
+import base64
+import asyncio
+import hashlib
+
+from utils.storageClient import (
+    PERSISTENT_DATA_URL,
+    VersionConflict,
+    PatchUnsupported,
+    CONFLICT_RETRIES,
+    BATCH_CONCURRENCY,
+)
+import utils.storageClient as storageClient
+from utils.jsonPatch import apply_patch, PatchError
+from utils import jsonCodec
+from utils.keyedLocks import KeyedLocks
+from utils.logPipeline import get_logger
+
+log = get_logger("storageBackends")
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "http" if PERSISTENT_DATA_URL else "").lower()
+STORAGE_FS_ROOT = os.getenv("STORAGE_FS_ROOT", "data/storage")
+
+if STORAGE_BACKEND == "http" and not PERSISTENT_DATA_URL:
+    log.warning("⚠️ STORAGE_BACKEND=http but PERSISTENT_DATA_URL is not set — storage calls will fail")
+
+def _encode(data) -> bytes:
+    return jsonCodec.dumps(data)
+
+async def _decode(name: str, body: bytes):
+    """Same rules as the HTTP client: .json → JSON, .bytes → base64 JSON, anything else → text."""
+    if name.endswith(".json"):
+        return await jsonCodec.decode_async(body)
+    if name.endswith(".bytes"):
+        return await jsonCodec.decode_async(base64.b64decode(body))
+    return body.decode("utf-8")
+
+def _version(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=10).hexdigest() + '"'
+
+class StorageBackend:
+    """Base class: the protocol plus generic batch and read-modify-write helpers."""
+
+    kind = "base"
+
+    async def load(self, name: str):
+        raise NotImplementedError
+
+    async def save(self, name: str, data, version=None) -> str:
+        raise NotImplementedError
+
+    async def patch(self, name: str, ops: list, version: str) -> str:
+        raise PatchUnsupported(name)
+
+    async def list(self, prefix: str = "") -> list:
+        raise NotImplementedError(f"{self.kind} storage cannot list files")
+
+    async def delete(self, name: str) -> bool:
+        raise NotImplementedError(f"{self.kind} storage cannot delete files")
+
+    async def close(self):
+        pass
+
+    async def load_many(self, names):
+        """({name: (data, version)}, {name: exception}) — one bad file does not fail the rest."""
+        return await self._each(self.load, list(dict.fromkeys(names)))
+
+    async def save_many(self, files: dict):
+        """({name: new version}, {name: exception}) for unconditional saves."""
+        return await self._each(lambda name: self.save(name, files[name]), list(files))
+
+    async def _each(self, func, names):
+        sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def _one(name):
+            async with sem:
+                return await func(name)
+
+        results = await asyncio.gather(*(_one(n) for n in names), return_exceptions=True)
+        done, errors = {}, {}
+        for name, result in zip(names, results):
+            (errors if isinstance(result, Exception) else done)[name] = result
+        return done, errors
+
+    async def update(self, name: str, mutate, attempts: int = CONFLICT_RETRIES):
+        """Optimistic read-modify-write, re-applying `mutate` on conflict. Returns (data, version)."""
+        for attempt in range(attempts):
+            current, version = await self.load(name)
+            updated = mutate(current)
+            try:
+                return updated, await self.save(name, updated, version)
+            except VersionConflict:
+                log.info("🔁 %s changed underneath us — re-reading (%d/%d)", name, attempt + 1, attempts)
+        raise VersionConflict(name)
+
+# ---------------------------------- HTTP ----------------------------------- #
+
+class HttpBackend(StorageBackend):
+    """The remote storage server. `base_url` defaults to PERSISTENT_DATA_URL."""
+
+    kind = "http"
+
+    def __init__(self, base_url: str = None):
+        self.base_url = base_url
+
+    async def load(self, name):
+        return await storageClient.load_file_versioned(name, self.base_url)
+
+    async def save(self, name, data, version=None):
+        ok, new_version = await storageClient.save_file_versioned(name, data, version, self.base_url)
+        if not ok:
+            raise RuntimeError(f"Save failed for {name}")
+        return new_version
+
+    async def patch(self, name, ops, version):
+        ok, new_version = await storageClient.patch_file(name, ops, version, self.base_url)
+        if not ok:
+            raise RuntimeError(f"Patch failed for {name}")
+        return new_version
+
+    async def delete(self, name):
+        return await storageClient.delete_file(name, self.base_url)
+
+    async def list(self, prefix=""):
+        raise NotImplementedError("the remote storage server cannot list files — keep an index file instead")
+
+    async def load_many(self, names):
+        return await storageClient.load_many(names, self.base_url)
+
+    async def save_many(self, files):
+        return await storageClient.save_many(files, self.base_url)
+
+    async def update(self, name, mutate, attempts=CONFLICT_RETRIES):
+        return await storageClient.update_file(name, mutate, self.base_url, attempts)
+
+    async def close(self):
+        if storageClient.SESSION is not None and not storageClient.SESSION.closed:
+            await storageClient.SESSION.close()
+
+# ------------------------------- filesystem -------------------------------- #
+
+class FilesystemBackend(StorageBackend):
+    """
+    One file per name under `root`. Writes go to a temp file that is fsync'd and
+    renamed over the target, so a crash leaves either the old or the new file,
+    never a torn one. Disk I/O runs in a worker thread. Versions are content
+    hashes, checked under a per-file lock — one bot process per root.
+    """
+
+    kind = "filesystem"
+
+    def __init__(self, root: str = STORAGE_FS_ROOT):
+        self.root = os.path.abspath(root)
+        self._locks = KeyedLocks()
+        os.makedirs(self.root, exist_ok=True)
+        log.info("🗄️ Filesystem storage at %s", self.root)
+
+    def _path(self, name: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, name))
+        if os.path.commonpath([full, self.root]) != self.root:
+            raise ValueError(f"{name!r} is outside the storage root")
+        return full
+
+    def _read(self, name: str) -> bytes:
+        try:
+            with open(self._path(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"❌ Load failed {name}: no such file in {self.root}") from None
+
+    def _write(self, name: str, body: bytes):
+        full = self._path(name)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = f"{full}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, full)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _current_version(self, name: str):
+        try:
+            return _version(self._read(name))
+        except FileNotFoundError:
+            return None
+
+    async def load(self, name):
+        body = await asyncio.to_thread(self._read, name)
+        return await _decode(name, body), _version(body)
+
+    async def save(self, name, data, version=None):
+        body = _encode(data)
+        async with self._locks.get(name):
+            if version is not None and await asyncio.to_thread(self._current_version, name) != version:
+                raise VersionConflict(name)
+            await asyncio.to_thread(self._write, name, body)
+        return _version(body)
+
+    async def patch(self, name, ops, version):
+        async with self._locks.get(name):
+            body = await asyncio.to_thread(self._read, name)
+            if _version(body) != version:
+                raise VersionConflict(name)
+            try:
+                patched = _encode(apply_patch(await _decode(name, body), ops))
+            except PatchError:
+                raise PatchUnsupported(name) from None
+            await asyncio.to_thread(self._write, name, patched)
+        return _version(patched)
+
+    def _walk(self, prefix: str) -> list:
+        names = []
+        for dirpath, _, files in os.walk(self.root):
+            for file in files:
+                if file.endswith(".tmp"):
+                    continue
+                name = os.path.relpath(os.path.join(dirpath, file), self.root).replace(os.sep, "/")
+                if name.startswith(prefix):
+                    names.append(name)
+        return sorted(names)
+
+    async def list(self, prefix=""):
+        return await asyncio.to_thread(self._walk, prefix)
+
+    async def delete(self, name):
+        async with self._locks.get(name):
+            try:
+                await asyncio.to_thread(os.remove, self._path(name))
+                return True
+            except FileNotFoundError:
+                return False
+
+# --------------------------------- memory ---------------------------------- #
+
+class MemoryBackend(StorageBackend):
+    """A dict of encoded bodies: every load decodes a private copy, like a real store would."""
+
+    kind = "memory"
+
+    def __init__(self):
+        self._files = {}  # name -> encoded body
+
+    async def load(self, name):
+        body = self._files.get(name)
+        if body is None:
+            raise FileNotFoundError(f"❌ Load failed {name}: not in memory storage")
+        return await _decode(name, body), _version(body)
+
+    async def save(self, name, data, version=None):
+        if version is not None and (name not in self._files or _version(self._files[name]) != version):
+            raise VersionConflict(name)
+        body = self._files[name] = _encode(data)
+        return _version(body)
+
+    async def patch(self, name, ops, version):
+        current, current_version = await self.load(name)
+        if current_version != version:
+            raise VersionConflict(name)
+        try:
+            patched = apply_patch(current, ops)
+        except PatchError:
+            raise PatchUnsupported(name) from None
+        return await self.save(name, patched)
+
+    async def list(self, prefix=""):
+        return sorted(name for name in self._files if name.startswith(prefix))
+
+    async def delete(self, name):
+        return self._files.pop(name, None) is not None
+
+BACKENDS = {"http": HttpBackend, "filesystem": FilesystemBackend, "memory": MemoryBackend}
+
+def make_backend(kind: str = STORAGE_BACKEND) -> StorageBackend:
+    """The backend named by `kind` (STORAGE_BACKEND by default)."""
+    if not kind:
+        raise RuntimeError("❌ No storage configured: set PERSISTENT_DATA_URL, "
+                           "or STORAGE_BACKEND=filesystem|memory for local runs")
+    try:
+        return BACKENDS[kind]()
+    except KeyError:
+        raise RuntimeError(f"❌ Unknown STORAGE_BACKEND {kind!r} (expected one of: {', '.join(BACKENDS)})") from None
@@ -1,16 +1,61 @@
 # utils/storageClient.py — Remote JSON Loader/Saver for Persistent Storage
 
 import os
+import copy
+import zlib
 import aiohttp
-import json
 import base64
 import asyncio
+import logging
 from typing import Optional
+from collections import OrderedDict
+
+from utils.circuitBreaker import CircuitBreaker, CircuitOpen, OPEN
+from utils.logPipeline import get_logger, payload_preview, SAMPLED
+from utils import jsonCodec
+from utils.itemDictionary import compact
+
+log = get_logger("storageClient")
 
 # 🔗 Base URL to your persistent data endpoint
+# Only needed with STORAGE_BACKEND=http (utils/storageBackends.py); requests fail without it
 PERSISTENT_DATA_URL = os.getenv("PERSISTENT_DATA_URL", "").rstrip("/")
-if not PERSISTENT_DATA_URL:
-    raise RuntimeError("❌ Environment variable PERSISTENT_DATA_URL is not set!")
+
+# 📦 Upload encoding: "auto" gzips once the server advertises it (Accept-Encoding
+# on any response), "on" always gzips, "off" never does.
+UPLOAD_GZIP = os.getenv("STORAGE_UPLOAD_GZIP", "auto").lower()
+UPLOAD_CHUNK_SIZE = int(os.getenv("STORAGE_UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+
+# base_url -> True/False once we know whether it accepts gzip request bodies
+_gzip_support = {}
+
+# base_url -> True/False once we know whether it accepts JSON Patch (RFC 5789 Accept-Patch)
+_patch_support = {}
+JSON_PATCH_TYPE = "application/json-patch+json"
+
+# base_url -> batch endpoint path, or False once we know the server has none
+_batch_support = {}
+BATCH_PATH = "_batch"
+BATCH_MAX_FILES = int(os.getenv("STORAGE_BATCH_MAX_FILES", "100"))
+BATCH_CONCURRENCY = int(os.getenv("STORAGE_BATCH_CONCURRENCY", "8"))  # fallback parallelism
+
+# Encoded JSON size vs bytes actually put on the wire, for /cachestats. Counts
+# are per file; "batches" is how many of the requests carried several at once.
+UPLOAD_STATS = {"saves": 0, "patches": 0, "batches": 0, "json_bytes": 0, "sent_bytes": 0}
+
+# (base_url, filename) -> [task, callers] for GETs currently on the wire
+_inflight_loads = {}
+LOAD_STATS = {"gets": 0, "coalesced": 0, "not_modified": 0, "batches": 0}
+
+# (base_url, filename) -> (ETag, Last-Modified, body size, decoded value) for conditional
+# GETs, LRU by response body bytes. A 304 hands out a copy of the decoded value.
+CONDITIONAL_CACHE_MAX_BYTES = int(os.getenv("STORAGE_CONDITIONAL_CACHE_BYTES", str(32 * 1024 * 1024)))
+_validators = OrderedDict()
+_validator_bytes = 0
+
+# Trips after repeated network failures / 5xx so an outage fails fast instead of
+# every command sitting through three retries with backoff
+BREAKER = CircuitBreaker("storage")
 
 # --------------------------- shared HTTP session --------------------------- #
 # Reuse a single session to reduce connection overhead & memory churn.
@@ -29,7 +74,7 @@ async def _get_session() -> aiohttp.ClientSession:
     if SESSION is None or SESSION.closed:
         connector = aiohttp.TCPConnector(limit=50, enable_cleanup_closed=True)
         SESSION = aiohttp.ClientSession(connector=connector, timeout=_DEFAULT_TIMEOUT)
-        print("🌐 [storageClient] Created shared HTTP session")
+        log.info("🌐 Created shared HTTP session")
     return SESSION
 
 # ----------------------------- core helpers ------------------------------- #
@@ -38,19 +83,85 @@ async def _retry(coro_func, *args, attempts=3, base_delay=0.5, **kwargs):
     """
     Tiny async retry helper with exponential backoff.
     Retries on network-ish exceptions and 5xx responses (handled by caller).
+    Every attempt goes through the circuit breaker: CircuitOpen is raised
+    straight away while it is open, and retries stop once it trips.
     """
     last_exc = None
     for i in range(attempts):
+        BREAKER.before_call()
         try:
-            return await coro_func(*args, **kwargs)
+            result = await coro_func(*args, **kwargs)
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            BREAKER.record_failure()
             last_exc = e
+            if BREAKER.state == OPEN:
+                break
             if i < attempts - 1:
                 delay = base_delay * (2 ** i)
-                print(f"⏳ [storageClient] Retry in {delay:.1f}s due to: {e!r}")
+                log.warning("⏳ Retry in %.1fs due to: %r", delay, e, extra=SAMPLED)
                 await asyncio.sleep(delay)
+        except Exception:
+            BREAKER.record_success()  # the server answered; the caller just didn't like it
+            raise
+        else:
+            BREAKER.record_success()
+            return result
     raise last_exc if last_exc else RuntimeError("Unknown retry failure")
 
+def _base_url(override=None) -> str:
+    base_url = (override or PERSISTENT_DATA_URL).rstrip("/")
+    if not base_url:
+        raise RuntimeError("❌ Environment variable PERSISTENT_DATA_URL is not set!")
+    return base_url
+
+def _note_accept_encoding(base_url, resp):
+    """Remember whether the server advertises gzip bodies (RFC 7694) and JSON Patch (RFC 5789)."""
+    accepted = resp.headers.get("Accept-Encoding")
+    if accepted is not None and base_url not in _gzip_support:
+        _gzip_support[base_url] = "gzip" in accepted.lower()
+    patch_types = resp.headers.get("Accept-Patch")
+    if patch_types is not None and base_url not in _patch_support:
+        _patch_support[base_url] = JSON_PATCH_TYPE in patch_types.lower()
+    batch_path = resp.headers.get("X-Batch-Endpoint")
+    if batch_path is not None and base_url not in _batch_support:
+        _batch_support[base_url] = batch_path.strip("/") or False
+
+def _use_gzip(base_url) -> bool:
+    if UPLOAD_GZIP == "on":
+        return _gzip_support.get(base_url, True)
+    if UPLOAD_GZIP == "auto":
+        return _gzip_support.get(base_url, False)
+    return False
+
+async def _json_body(data, counters: dict, gzip: bool):
+    """
+    Stream `data` as compact JSON in ~UPLOAD_CHUNK_SIZE pieces (chunked transfer).
+    The full document is never held as one string, and the loop gets a turn
+    between chunks so big saves don't stall other commands.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None  # wbits 31 → gzip framing
+
+    async for raw in jsonCodec.encode_chunks(data, UPLOAD_CHUNK_SIZE):
+        counters["json_bytes"] += len(raw)
+        out = compressor.compress(raw) if compressor else raw
+        counters["sent_bytes"] += len(out)
+        if out:
+            yield out
+
+    if compressor:
+        tail = compressor.flush()
+        counters["sent_bytes"] += len(tail)
+        yield tail
+
+class VersionConflict(Exception):
+    """The remote copy changed since it was loaded (HTTP 412 on a conditional save)."""
+
+class PatchUnsupported(Exception):
+    """The storage server cannot take this patch — send the whole document instead."""
+
+# How many times update_file re-reads and re-applies a mutation after a conflict
+CONFLICT_RETRIES = 5
+
 # --------------------------------- API ------------------------------------ #
 
 async def load_file(filename, base_url_override=None):
@@ -62,43 +173,130 @@ async def load_file(filename, base_url_override=None):
     Returns parsed object (for .json/.bytes) or str (for others).
     Raises on failure (preserves previous behavior).
     """
-    base_url = (base_url_override or PERSISTENT_DATA_URL).rstrip("/")
+    data, _ = await load_file_versioned(filename, base_url_override)
+    return data
+
+async def load_file_versioned(filename, base_url_override=None):
+    """
+    Same as load_file but returns (data, version). The version is the
+    response ETag, or None when the storage server does not send one.
+
+    Concurrent loads of the same file share one GET; when more than one
+    caller was waiting, each gets its own deep copy.
+    """
+    base_url = _base_url(base_url_override)
+    key = (base_url, filename)
+    flight = _inflight_loads.get(key)
+    if flight is None:
+        task = asyncio.ensure_future(_load_versioned(base_url, filename))
+        flight = _inflight_loads[key] = [task, 1]
+
+        def _landed(t):
+            if _inflight_loads.get(key, (None,))[0] is t:
+                del _inflight_loads[key]
+
+        # Registered before any waiter's wake-up, so nobody joins a finished flight
+        task.add_done_callback(_landed)
+    else:
+        flight[1] += 1
+        LOAD_STATS["coalesced"] += 1
+        log.debug("🔗 Joined in-flight load: %s", filename)
+
+    data, version = await asyncio.shield(flight[0])
+    return (copy.deepcopy(data) if flight[1] > 1 else data), version
+
+async def _load_versioned(base_url, filename):
     url = f"{base_url}/{filename}"
-    print(f"📥 [storageClient] Loading file from: {url}")
+    LOAD_STATS["gets"] += 1
+    log.debug("📥 Loading file from: %s", url)
 
     session = await _get_session()
+    key = (base_url, filename)
 
     async def _do_get():
-        async with session.get(url) as resp:
+        headers = {"Accept-Encoding": "gzip, deflate"}  # aiohttp inflates the response for us
+        known = _validators.get(key)
+        if known:
+            etag, last_modified, _, _ = known
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with session.get(url, headers=headers) as resp:
+            _note_accept_encoding(base_url, resp)
+            if resp.status == 304 and known:
+                LOAD_STATS["not_modified"] += 1
+                _validators.move_to_end(key)
+                log.debug("♻️ Not modified, using cached copy: %s", filename)
+                return _private_copy(known[3]), known[0]
             if resp.status != 200:
                 # Bubble up for retry logic or caller handling
                 text = await resp.text()
+                # 5xx is transient — retry instead of reporting the file as missing
+                if 500 <= resp.status < 600:
+                    raise aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status, message=text[:200]
+                    )
                 raise FileNotFoundError(f"❌ Load failed {url} (HTTP {resp.status}): {text[:200]}")
             content_type = resp.headers.get("Content-Type", "")
-            print(f"📦 [storageClient] Loaded content type: {content_type}")
-
-            if filename.endswith(".json"):
-                result = await resp.json()
-                print(f"✅ [storageClient] JSON load success: {filename}")
-                return result
-
-            elif filename.endswith(".bytes"):
-                text = await resp.text()
-                decoded = base64.b64decode(text).decode("utf-8")
-                print(f"✅ [storageClient] Base64 load success: {filename}")
-                return json.loads(decoded)
-
-            else:
-                body = await resp.text()
-                print(f"✅ [storageClient] Plaintext load success: {filename}")
-                return body
+            version = resp.headers.get("ETag")
+            log.debug("📦 Loaded content type: %s", content_type)
+            body = await resp.read()
+            result = await _decode_body(filename, body)
+            _remember_validators(key, version, resp.headers.get("Last-Modified"), len(body), result)
+            return result, version
 
     try:
         return await _retry(_do_get)
+    except FileNotFoundError:
+        log.debug("📭 Not on remote storage: %s", filename)
+        raise
     except Exception as e:
-        print(f"⚠️ [storageClient] Error loading {filename}: {e}")
+        log.warning("⚠️ Error loading %s: %s", filename, e, extra=SAMPLED)
         raise
 
+async def _decode_body(filename, body: bytes):
+    """Parse a response body by file type."""
+    if filename.endswith(".json"):
+        result = await jsonCodec.decode_async(body)
+        log.debug("✅ JSON load success: %s", filename)
+        return result
+
+    elif filename.endswith(".bytes"):
+        decoded = base64.b64decode(body).decode("utf-8")
+        log.debug("✅ Base64 load success: %s", filename)
+        return await jsonCodec.decode_async(decoded)
+
+    else:
+        log.debug("✅ Plaintext load success: %s", filename)
+        return body.decode("utf-8")
+
+def _private_copy(value):
+    """A copy the caller may mutate: JSON containers are rebuilt (compact), text is immutable."""
+    return compact(value) if isinstance(value, (dict, list)) else value
+
+def _remember_validators(key, etag, last_modified, size: int, value):
+    """Keep a private copy of the decoded body and its validators so the next load can be a conditional GET."""
+    global _validator_bytes
+    old = _validators.pop(key, None)
+    if old:
+        _validator_bytes -= old[2]
+    if not (etag or last_modified) or size > CONDITIONAL_CACHE_MAX_BYTES // 4:
+        return
+    _validators[key] = (etag, last_modified, size, _private_copy(value))
+    _validator_bytes += size
+    while _validator_bytes > CONDITIONAL_CACHE_MAX_BYTES and _validators:
+        _, evicted = _validators.popitem(last=False)
+        _validator_bytes -= evicted[2]
+
+def _forget_validators(base_url, filename):
+    """Our own write changed the file — never answer a later load from the old body."""
+    global _validator_bytes
+    old = _validators.pop((base_url, filename), None)
+    if old:
+        _validator_bytes -= old[2]
+
 async def save_file(filename, data, base_url_override=None):
     """
     Save a file remotely to persistent storage using HTTP PUT.
@@ -107,24 +305,53 @@ async def save_file(filename, data, base_url_override=None):
 
     Returns True on success, False on failure (preserves previous behavior).
     """
-    base_url = (base_url_override or PERSISTENT_DATA_URL).rstrip("/")
+    ok, _ = await save_file_versioned(filename, data, base_url_override=base_url_override)
+    return ok
+
+async def save_file_versioned(filename, data, version=None, base_url_override=None):
+    """
+    Conditional PUT. With a version (ETag from load_file_versioned) the save
+    only lands if the remote copy is still at that version; otherwise
+    VersionConflict is raised. Without one it is a plain overwrite.
+
+    The body is streamed as compact JSON, gzip-encoded when the server accepts it.
+    Returns (True, new_version) on success, (False, None) on failure.
+    """
+    base_url = _base_url(base_url_override)
     url = f"{base_url}/{filename}"
-    json_data = json.dumps(data, indent=2)
+    _forget_validators(base_url, filename)
 
-    print(f"📤 [storageClient] Save requested: {filename}")
-    print(f"📝 [storageClient] Data preview: {json_data[:300]}...")
+    log.debug("📤 Save requested: %s", filename)
+    if log.isEnabledFor(logging.DEBUG) and (preview := payload_preview(data)):
+        log.debug("🧾 %s preview: %s", filename, preview)
 
     session = await _get_session()
 
     async def _do_put():
-        async with session.put(
-            url,
-            data=json_data,
-            headers={"Content-Type": "application/json"}
-        ) as resp:
-            if resp.status in (200, 201):
-                print(f"✅ [storageClient] Save successful: {filename}")
-                return True
+        gzip = _use_gzip(base_url)
+        headers = {"Content-Type": "application/json"}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        if version:
+            headers["If-Match"] = version
+
+        counters = {"json_bytes": 0, "sent_bytes": 0}
+        async with session.put(url, data=_json_body(data, counters, gzip), headers=headers) as resp:
+            _note_accept_encoding(base_url, resp)
+            if resp.status in (200, 201, 204):
+                UPLOAD_STATS["saves"] += 1
+                UPLOAD_STATS["json_bytes"] += counters["json_bytes"]
+                UPLOAD_STATS["sent_bytes"] += counters["sent_bytes"]
+                log.debug("✅ Save successful: %s (%d bytes sent%s)",
+                          filename, counters["sent_bytes"], ", gzip" if gzip else "")
+                return True, resp.headers.get("ETag")
+            elif resp.status == 415 and gzip:
+                # Server refused the encoding — remember that and resend as plain JSON
+                log.warning("⚠️ %s rejected gzip uploads, falling back to identity", base_url)
+                _gzip_support[base_url] = False
+            elif resp.status == 412:
+                log.info("🔀 Version conflict on save: %s", filename)
+                raise VersionConflict(filename)
             else:
                 response_text = await resp.text()
                 # Raise on 5xx to trigger retry, otherwise just return False
@@ -132,12 +359,286 @@ async def save_file(filename, data, base_url_override=None):
                     raise aiohttp.ClientResponseError(
                         resp.request_info, resp.history, status=resp.status, message=response_text
                     )
-                print(f"⚠️ [storageClient] Save failed for {filename}: HTTP {resp.status}")
-                print(f"🧾 [storageClient] Response: {response_text[:400]}")
-                return False
+                log.warning("⚠️ Save failed for %s: HTTP %d — %s", filename, resp.status, response_text[:400])
+                return False, None
+
+        # Only the 415 branch gets here; the refused response is released before resending
+        return await _do_put()
 
     try:
         return await _retry(_do_put)
+    except VersionConflict:
+        raise
     except Exception as e:
-        print(f"❌ [storageClient] Save error for {filename}: {e}")
-        return False
+        log.error("❌ Save error for %s: %s", filename, e)
+        return False, None
+
+async def patch_file(filename, ops, version, base_url_override=None):
+    """
+    Send an RFC 6902 JSON Patch, conditional on `version` (If-Match).
+
+    Returns (True, new_version) on success, (False, None) on failure. Raises
+    VersionConflict on 412 and PatchUnsupported when the server has no PATCH
+    support or could not apply this patch; the caller then falls back to a PUT.
+    """
+    base_url = _base_url(base_url_override)
+    if _patch_support.get(base_url) is False:
+        raise PatchUnsupported(filename)
+    url = f"{base_url}/{filename}"
+    body = jsonCodec.dumps(ops)
+    _forget_validators(base_url, filename)
+
+    log.debug("🩹 Patch requested: %s (%d op(s), %d bytes)", filename, len(ops), len(body))
+
+    session = await _get_session()
+    headers = {"Content-Type": JSON_PATCH_TYPE, "If-Match": version}
+
+    async def _do_patch():
+        async with session.patch(url, data=body, headers=headers) as resp:
+            _note_accept_encoding(base_url, resp)
+            if resp.status in (200, 204):
+                _patch_support[base_url] = True
+                UPLOAD_STATS["patches"] += 1
+                UPLOAD_STATS["json_bytes"] += len(body)  # sent as-is: counts the same on both sides
+                UPLOAD_STATS["sent_bytes"] += len(body)
+                log.debug("✅ Patch successful: %s", filename)
+                return True, resp.headers.get("ETag")
+            elif resp.status == 412:
+                log.info("🔀 Version conflict on patch: %s", filename)
+                raise VersionConflict(filename)
+            elif resp.status in (405, 415, 501):
+                log.warning("⚠️ %s does not accept JSON Patch (HTTP %d)", base_url, resp.status)
+                _patch_support[base_url] = False
+                raise PatchUnsupported(filename)
+            elif resp.status in (400, 409, 422):
+                # Server could not apply this particular patch — a full PUT will
+                log.info("⚠️ Patch rejected for %s: HTTP %d", filename, resp.status)
+                raise PatchUnsupported(filename)
+            else:
+                response_text = await resp.text()
+                if 500 <= resp.status < 600:
+                    raise aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status, message=response_text
+                    )
+                log.warning("⚠️ Patch failed for %s: HTTP %d", filename, resp.status)
+                return False, None
+
+    try:
+        return await _retry(_do_patch)
+    except (VersionConflict, PatchUnsupported):
+        raise
+    except Exception as e:
+        log.error("❌ Patch error for %s: %s", filename, e)
+        return False, None
+
+async def update_file(filename, mutate, base_url_override=None, attempts=CONFLICT_RETRIES):
+    """
+    Optimistic read-modify-write: load the current version, apply
+    mutate(data) -> new data, and save with If-Match. On a conflict the file
+    is re-read and the mutation re-applied, up to `attempts` times.
+
+    Returns (new_data, new_version). Raises VersionConflict if every attempt
+    lost the race, or FileNotFoundError / network errors from the load.
+    """
+    for attempt in range(attempts):
+        current, version = await load_file_versioned(filename, base_url_override)
+        updated = mutate(current)
+        try:
+            ok, new_version = await save_file_versioned(filename, updated, version, base_url_override)
+        except VersionConflict:
+            log.info("🔁 %s changed underneath us — re-reading (%d/%d)", filename, attempt + 1, attempts)
+            continue
+        if not ok:
+            raise RuntimeError(f"Save failed for {filename}")
+        return updated, new_version
+    raise VersionConflict(filename)
+
+async def delete_file(filename, base_url_override=None) -> bool:
+    """
+    DELETE a file. Returns True if it existed, False if it was already gone.
+    Raises NotImplementedError when the server does not support DELETE.
+    """
+    base_url = _base_url(base_url_override)
+    url = f"{base_url}/{filename}"
+    _forget_validators(base_url, filename)
+    log.debug("🗑️ Delete requested: %s", filename)
+    session = await _get_session()
+
+    async def _do_delete():
+        async with session.delete(url) as resp:
+            _note_accept_encoding(base_url, resp)
+            if resp.status in (200, 202, 204):
+                return True
+            if resp.status == 404:
+                return False
+            if resp.status in (405, 501):
+                raise NotImplementedError(f"{base_url} does not support DELETE (HTTP {resp.status})")
+            text = await resp.text()
+            raise aiohttp.ClientResponseError(
+                resp.request_info, resp.history, status=resp.status, message=text[:200]
+            )
+
+    return await _retry(_do_delete)
+
+# ------------------------------- batching --------------------------------- #
+
+async def _post_batch(base_url, payload: dict) -> dict:
+    """
+    One request to the server's batch endpoint. Returns its {"files": {...}} map,
+    or None if the server turns out not to have one (remembered for next time).
+    """
+    endpoint = _batch_support.get(base_url, BATCH_PATH)
+    if endpoint is False:
+        return None
+    session = await _get_session()
+    body = jsonCodec.dumps(payload)
+
+    async def _do_post():
+        headers = {"Content-Type": "application/json"}
+        async with session.post(f"{base_url}/{endpoint}", data=body, headers=headers) as resp:
+            _note_accept_encoding(base_url, resp)
+            if resp.status in (404, 405, 501):
+                log.warning("⚠️ %s has no batch endpoint (HTTP %d) — using parallel requests", base_url, resp.status)
+                _batch_support[base_url] = False
+                return None
+            if resp.status != 200:
+                text = await resp.text()
+                raise aiohttp.ClientResponseError(
+                    resp.request_info, resp.history, status=resp.status, message=text[:200]
+                )
+            _batch_support[base_url] = endpoint
+            if "put" in payload:  # sent uncompressed: counts the same on both sides
+                UPLOAD_STATS["json_bytes"] += len(body)
+                UPLOAD_STATS["sent_bytes"] += len(body)
+            return jsonCodec.decode(await resp.read()).get("files", {})
+
+    return await _retry(_do_post)
+
+async def _bounded_gather(func, items):
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def _one(item):
+        async with sem:
+            return await func(item)
+
+    return await asyncio.gather(*(_one(item) for item in items), return_exceptions=True)
+
+async def load_many(filenames, base_url_override=None):
+    """
+    Load several files in (ideally) one round trip: the server's batch endpoint
+    when it has one, otherwise up to BATCH_CONCURRENCY parallel GETs.
+
+    Returns (loaded, errors): {filename: (data, version)} and {filename: exception}.
+    A missing file shows up in errors as FileNotFoundError.
+    """
+    base_url = _base_url(base_url_override)
+    names = list(dict.fromkeys(filenames))
+    loaded, errors = {}, {}
+
+    for start in range(0, len(names), BATCH_MAX_FILES):
+        chunk = names[start:start + BATCH_MAX_FILES]
+        request = [
+            {"path": name, "etag": _validators[(base_url, name)][0]} if (base_url, name) in _validators
+            else {"path": name}
+            for name in chunk
+        ]
+        try:
+            files = await _post_batch(base_url, {"get": request})
+        except Exception as e:
+            log.warning("⚠️ Batch load failed, falling back to parallel GETs: %s", e)
+            files = None
+
+        if files is None:
+            results = await _bounded_gather(lambda name: load_file_versioned(name, base_url_override), chunk)
+            for name, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    errors[name] = result
+                else:
+                    loaded[name] = result
+            continue
+
+        LOAD_STATS["gets"] += len(chunk)
+        LOAD_STATS["batches"] += 1
+        log.debug("📥 Batch loaded %d file(s) in one request", len(chunk))
+        for name in chunk:
+            entry = files.get(name) or {"status": 404}
+            key = (base_url, name)
+            try:
+                if entry["status"] == 304 and key in _validators:
+                    LOAD_STATS["not_modified"] += 1
+                    etag, _, _, value = _validators[key]
+                    _validators.move_to_end(key)
+                    loaded[name] = (_private_copy(value), etag)
+                elif entry["status"] == 200:
+                    body = entry["body"].encode("utf-8")
+                    value = await _decode_body(name, body)
+                    loaded[name] = (value, entry.get("etag"))
+                    _remember_validators(key, entry.get("etag"), entry.get("last_modified"), len(body), value)
+                elif entry["status"] == 404:
+                    errors[name] = FileNotFoundError(f"❌ Load failed {base_url}/{name} (HTTP 404)")
+                else:
+                    errors[name] = RuntimeError(f"Load failed {base_url}/{name} (HTTP {entry['status']})")
+            except Exception as e:
+                errors[name] = e
+
+    return loaded, errors
+
+async def save_many(files: dict, base_url_override=None):
+    """
+    Unconditionally save {filename: data} in (ideally) one round trip, like load_many.
+    Returns (saved, errors): {filename: new_version} and {filename: exception}.
+    """
+    base_url = _base_url(base_url_override)
+    names = list(files)
+    saved, errors = {}, {}
+
+    for start in range(0, len(names), BATCH_MAX_FILES):
+        chunk = names[start:start + BATCH_MAX_FILES]
+        for name in chunk:
+            _forget_validators(base_url, name)
+        try:
+            results = await _post_batch(base_url, {"put": {name: files[name] for name in chunk}})
+        except Exception as e:
+            log.warning("⚠️ Batch save failed, falling back to parallel PUTs: %s", e)
+            results = None
+
+        if results is None:
+            outcomes = await _bounded_gather(
+                lambda name: save_file_versioned(name, files[name], base_url_override=base_url_override), chunk
+            )
+            for name, outcome in zip(chunk, outcomes):
+                if isinstance(outcome, Exception):
+                    errors[name] = outcome
+                elif outcome[0]:
+                    saved[name] = outcome[1]
+                else:
+                    errors[name] = RuntimeError(f"Save failed for {name}")
+            continue
+
+        UPLOAD_STATS["saves"] += len(chunk)
+        UPLOAD_STATS["batches"] += 1
+        log.debug("📤 Batch saved %d file(s) in one request", len(chunk))
+        for name in chunk:
+            entry = results.get(name) or {"status": 500}
+            if entry["status"] in (200, 201, 204):
+                saved[name] = entry.get("etag")
+            else:
+                errors[name] = RuntimeError(f"Save failed for {name} (HTTP {entry['status']})")
+
+    return saved, errors
+
+def storage_available() -> bool:
+    """False while the circuit breaker is refusing storage calls."""
+    return not BREAKER.is_open
+
+def breaker_stats() -> dict:
+    return BREAKER.snapshot_stats()
+
+def load_stats() -> dict:
+    """Files fetched (singly or in batches) vs loads that piggybacked on one already in flight."""
+    return dict(LOAD_STATS)
+
+def upload_stats() -> dict:
+    """Save counters: JSON bytes produced vs bytes sent after compression."""
+    sent, raw = UPLOAD_STATS["sent_bytes"], UPLOAD_STATS["json_bytes"]
+    return {**UPLOAD_STATS, "ratio": round(sent / raw, 3) if raw else 0.0}
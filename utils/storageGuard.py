@@ -0,0 +1,35 @@
+# utils/storageGuard.py — What players are told while the storage circuit is open
+#
+# profile_transaction() raises CircuitOpen while storage is down, so a change
+# is refused instead of being made against a stale cached copy. Slash commands
+# get STORAGE_DOWN_MESSAGE from WarlabTree (bot.py); buttons and selects get it
+# from WarlabView.on_error, which the interactive views in cogs/ derive from.
+
+import discord
+
+from utils.circuitBreaker import CircuitOpen
+from utils.logPipeline import get_logger
+
+log = get_logger("storageGuard")
+
+STORAGE_DOWN_MESSAGE = ("⚠️ Warlab storage is temporarily unavailable, so changes are paused. "
+                        "Please try again in a minute — `/stash`, `/rank` and `/leaderboard` still work.")
+
+async def send_storage_down(interaction: discord.Interaction):
+    """Reply with STORAGE_DOWN_MESSAGE, whether or not the interaction was already deferred."""
+    send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+    try:
+        await send(STORAGE_DOWN_MESSAGE, ephemeral=True)
+    except discord.HTTPException:
+        pass
+
+class WarlabView(discord.ui.View):
+    """A View whose component callbacks answer CircuitOpen with STORAGE_DOWN_MESSAGE."""
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
+        if isinstance(error, CircuitOpen):
+            log.warning("🔌 %s for %s hit the open storage circuit", type(item).__name__, interaction.user)
+            await send_storage_down(interaction)
+            return
+        log.error("❌ Error in %s (%s): %r", type(self).__name__, type(item).__name__, error,
+                  exc_info=(type(error), error, error.__traceback__))
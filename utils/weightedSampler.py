@@ -0,0 +1,173 @@
+# utils/weightedSampler.py — Precompiled weighted draws (Vose's alias method)
+#
+# Building the tables is O(n) once; every draw after that is O(1): one random
+# number picks a column, and a biased coin picks its entry or that column's
+# alias. Loot pools built from the catalog hold their samplers on the catalog
+# snapshot (utils/catalog.py), so they are rebuilt only when the catalog is
+# reloaded.
+#
+# Exclusions (e.g. blueprints a player already owns) are bitmasks over entry
+# positions, made with sampler.mask(names). A draw with a mask rejects
+# excluded entries while they carry at most REJECT_SHARE of the weight (a few
+# extra O(1) tries); past that it uses a sampler over the remaining entries.
+# Either decision is made once per mask and kept in a per-sampler LRU.
+#
+# sample_unique(k) returns k distinct entries, distributed as k successive
+# weighted draws that each remove their pick. Picks come from O(1) alias draws
+# while the entries already taken or excluded hold at most REJECT_SHARE of the
+# weight; the rest come from one Efraimidis–Spirakis pass over what is left
+# (each entry gets the key log(u)/weight; the largest keys win). Either way a
+# pull has a bounded cost, unlike draw-and-discard-duplicates loops that slow
+# down (and come up short) as the pool empties.
+
+import heapq
+import random
+from math import log
+from collections import OrderedDict
+
+REJECT_SHARE = 0.5        # above this excluded weight, sample from a restricted table instead
+PLAN_CACHE = 1024         # masks remembered per sampler (LRU) — roughly one per active player
+
+class AliasSampler:
+    """
+    Weighted draws from a fixed list of entries. `names` (optional) labels
+    each entry for mask(); entries with weight 0 are never drawn.
+    """
+
+    __slots__ = ("entries", "weights", "total", "_prob", "_alias", "_bits", "_plans", "_keyed")
+
+    def __init__(self, entries, weights, names=None):
+        self.entries = tuple(entries)
+        self.weights = tuple(float(w) if w > 0 else 0.0 for w in weights)
+        if len(self.weights) != len(self.entries):
+            raise ValueError("entries and weights differ in length")
+        self.total = sum(self.weights)
+        self._prob, self._alias = _vose(self.weights, self.total)
+        self._bits = {}  # name -> bitmask of every entry carrying it (a name may label several)
+        for i, name in enumerate(names if names is not None else ()):
+            self._bits[name] = self._bits.get(name, 0) | 1 << i
+        self._keyed = tuple((i, 1.0 / w) for i, w in enumerate(self.weights) if w)  # (position, 1/weight)
+        self._plans = OrderedDict()  # mask -> self (reject excluded draws) or a sampler over the rest
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return self.total > 0
+
+    # ------------------------------- draws -------------------------------- #
+    def _draw_index(self, rng) -> int:
+        u = rng.random() * len(self._prob)
+        column = int(u)
+        return column if u - column < self._prob[column] else self._alias[column]
+
+    def draw(self, exclude: int = 0, rng=random):
+        """One entry, or None if nothing (outside `exclude`) has any weight."""
+        if not exclude:
+            return self.entries[self._draw_index(rng)] if self.total else None
+        plan, _ = self._plan(exclude)
+        if plan is not self:
+            return plan.draw(rng=rng)
+        return self._reject(exclude, rng)
+
+    def sample(self, k: int, exclude: int = 0, rng=random) -> list:
+        """`k` independent draws (with replacement); empty if nothing can be drawn."""
+        if not exclude:
+            if not self.total:
+                return []
+            entries, pick = self.entries, self._draw_index
+            return [entries[pick(rng)] for _ in range(k)]
+        plan, _ = self._plan(exclude)
+        if plan is not self:
+            return plan.sample(k, rng=rng)
+        return [self._reject(exclude, rng) for _ in range(k)]
+
+    def sample_unique(self, k: int, exclude: int = 0, rng=random) -> list:
+        """
+        Up to `k` distinct entries, weighted without replacement, in draw order
+        (the first is distributed like draw()). Fewer only if fewer than `k`
+        entries outside `exclude` have any weight.
+        """
+        if k <= 0 or not self.total:
+            return []
+        blocked_weight = 0.0
+        if exclude:
+            plan, blocked_weight = self._plan(exclude)
+            if plan is not self:
+                return plan.sample_unique(k, rng=rng)
+        # Rejecting repeats is exact successive sampling; it stays cheap (≤ 2 tries
+        # per pull expected) while blocked entries hold at most REJECT_SHARE of the weight
+        entries, weights, picked = self.entries, self.weights, []
+        limit = REJECT_SHARE * self.total
+        while len(picked) < k and blocked_weight <= limit:
+            i = self._draw_index(rng)
+            if not exclude >> i & 1:
+                exclude |= 1 << i
+                blocked_weight += weights[i]
+                picked.append(entries[i])
+        if len(picked) < k:  # the rest in one pass over what is left
+            rand = rng.random
+            keys = [(log(1.0 - rand()) * inv, i) for i, inv in self._keyed if not exclude >> i & 1]
+            picked += [entries[i] for _, i in heapq.nlargest(k - len(picked), keys)]
+        return picked
+
+    # ---------------------------- exclusions ------------------------------ #
+    def mask(self, names) -> int:
+        """Bitmask excluding the entries labelled with any of `names` (unknown names are ignored)."""
+        bits, known = 0, self._bits
+        for name in names:
+            bits |= known.get(name, 0)
+        return bits
+
+    def _reject(self, exclude: int, rng):
+        while True:  # excluded entries hold at most REJECT_SHARE of the weight: ≤ 2 tries expected
+            i = self._draw_index(rng)
+            if not exclude >> i & 1:
+                return self.entries[i]
+
+    def _plan(self, exclude: int):
+        """
+        (self, excluded weight) when rejecting excluded draws is cheap, else
+        (a sampler over the remaining entries, 0.0).
+        """
+        cached = self._plans.get(exclude)
+        if cached is not None:
+            self._plans.move_to_end(exclude)
+            return cached
+        excluded = sum(w for i, w in enumerate(self.weights) if exclude >> i & 1)
+        if self.total - excluded > 0 and excluded <= REJECT_SHARE * self.total:
+            cached = (self, excluded)
+        else:
+            keep = [i for i in range(len(self.entries)) if not exclude >> i & 1]
+            cached = (AliasSampler([self.entries[i] for i in keep], [self.weights[i] for i in keep]), 0.0)
+        self._plans[exclude] = cached
+        if len(self._plans) > PLAN_CACHE:
+            self._plans.popitem(last=False)
+        return cached
+
+def _vose(weights, total):
+    """Vose's alias tables: (probability of keeping each column, its alias)."""
+    n = len(weights)
+    prob, alias = [0.0] * n, list(range(n))
+    if not n or total <= 0:
+        return prob, alias
+    scaled = [w * n / total for w in weights]
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s], alias[s] = scaled[s], l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    for i in large + small:  # leftovers are 1 up to rounding
+        prob[i] = 1.0
+    return prob, alias
+
+def rarity_sampler(entries, rarity_weights, name_key: str = "item") -> AliasSampler:
+    """A sampler over loot entries ({"item": ..., "rarity": ...}) weighted by their rarity."""
+    entries = tuple(entries)
+    return AliasSampler(
+        entries,
+        [rarity_weights.get(entry["rarity"], 0) for entry in entries],
+        names=[entry[name_key] for entry in entries],
+    )